@@ -0,0 +1,103 @@
+# creation date : 19 October, 2026
+#
+# Description :
+#    Diff based sync of Maya 2020+ timeSliderBookmark nodes with the shot
+#    list. Bookmarks made for shots are tagged with OWNER_ATTR (holding the
+#    shot name), only those are created, edited or deleted, bookmarks of
+#    other tools are left alone. Untagged bookmarks named like a shot (made
+#    by older versions) are adopted instead of being duplicated.
+#
+
+from maya import cmds as MC
+
+OWNER_ATTR = 'hzShotBookmark'
+COLOR_TOLERANCE = 1e-3
+
+
+def _attr(node, attr):
+    return '%s.%s' % (node, attr)
+
+
+def ownedBookmarks():
+    '''
+    {shot name: node} of the bookmarks made for shots.
+    '''
+    owned = {}
+    for node in MC.ls(type='timeSliderBookmark') or []:
+        if MC.attributeQuery(OWNER_ATTR, node=node, exists=True):
+            owned[MC.getAttr(_attr(node, OWNER_ATTR)) or node] = node
+    return owned
+
+
+def tagBookmark(node, shotName):
+    if not MC.attributeQuery(OWNER_ATTR, node=node, exists=True):
+        MC.addAttr(node, longName=OWNER_ATTR, dataType='string')
+    MC.setAttr(_attr(node, OWNER_ATTR), shotName, type='string')
+
+
+def _adoptLegacy(owned, names):
+    # bookmarks left by older versions have no tag, match them by name
+    for node in MC.ls(type='timeSliderBookmark') or []:
+        if node in owned.values() or MC.attributeQuery(OWNER_ATTR, node=node, exists=True):
+            continue
+        name = MC.getAttr(_attr(node, 'name'))
+        if name in names and name not in owned:
+            tagBookmark(node, name)
+            owned[name] = node
+
+
+def _updateBookmark(node, sh):
+    '''
+    Set the attributes that differ from the shot, returns True if anything
+    has been changed.
+    '''
+    changed = False
+    if MC.getAttr(_attr(node, 'name')) != sh['name']:
+        MC.setAttr(_attr(node, 'name'), sh['name'], type='string')
+        changed = True
+    for attr, key in (('timeRangeStart', 'start'), ('timeRangeStop', 'stop')):
+        if MC.getAttr(_attr(node, attr)) != sh[key]:
+            MC.setAttr(_attr(node, attr), sh[key])
+            changed = True
+    color = MC.getAttr(_attr(node, 'color'))[0]
+    if any(abs(a - b) > COLOR_TOLERANCE for a, b in zip(color, sh['color'])):
+        MC.setAttr(_attr(node, 'color'), *sh['color'])
+        changed = True
+    return changed
+
+
+def syncBookmarks(shotsInfo):
+    '''
+    Make the shot bookmarks match shotsInfo with as few edits as possible.
+    Bookmarks are matched by shot name, renamed shots reuse the bookmarks
+    that no shot claims anymore. Returns a dict of created, updated, deleted
+    and unchanged counts.
+    '''
+    from maya.plugin.timeSliderBookmark.timeSliderBookmark import createBookmark # type: ignore
+    report = {'created': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0}
+    names = set(sh['name'] for sh in shotsInfo)
+    owned = ownedBookmarks()
+    _adoptLegacy(owned, names)
+    unclaimed = [node for name, node in sorted(owned.items()) if name not in names]
+    used = set()
+    for sh in shotsInfo:
+        node = owned.get(sh['name'])
+        if node in used:
+            node = None
+        if node is None and unclaimed:
+            node = unclaimed.pop(0)
+        if node is None:
+            node = createBookmark(name=sh['name'], start=sh['start'], stop=sh['stop'], color=sh['color'])
+            report['created'] += 1
+        elif _updateBookmark(node, sh):
+            report['updated'] += 1
+        else:
+            report['unchanged'] += 1
+        used.add(node)
+        if owned.get(sh['name']) != node:
+            tagBookmark(node, sh['name'])
+            owned[sh['name']] = node
+    if unclaimed:
+        MC.delete(unclaimed)
+        report['deleted'] = len(unclaimed)
+    return report
@@ -0,0 +1,85 @@
+# creation date : 19 October, 2026
+#
+# Description :
+#    Scope for heavy scene edits (thousands of key edits, file stages).
+#    While it is open the undo queue follows `undo` ('chunk' records one
+#    undo step, 'off' records nothing, 'keep' leaves it alone), viewport
+#    refresh is suspended, autosave is paused and the evaluation manager
+#    runs in DG mode so the graph is not rebuilt after every edit.
+#    Everything is given back on exit, errors included. Nested scopes
+#    leave the work to the outermost one.
+#
+
+from maya import cmds as MC
+
+UNDO_POLICIES = ('chunk', 'off', 'keep')
+
+
+def _query(func, default=None, **kwargs):
+    # some of these commands are missing or fail in batch mode
+    try:
+        return func(**kwargs)
+    except (RuntimeError, TypeError, AttributeError):
+        return default
+
+
+class HZBulkEdit(object):
+    depth = 0
+
+    def __init__(self, undo='chunk', refresh=True, autosave=True, evaluation='off'):
+        if undo not in UNDO_POLICIES:
+            raise ValueError('undo policy must be one of %s' % ', '.join(UNDO_POLICIES))
+        self.undo = undo
+        self.refresh = refresh
+        self.autosave = autosave
+        self.evaluation = evaluation
+        self._restore = []
+
+    def __enter__(self):
+        HZBulkEdit.depth += 1
+        if HZBulkEdit.depth > 1:
+            return self
+        try:
+            self._setup()
+        except Exception:
+            # __exit__ is not called when __enter__ fails, give back what is done
+            self._unwind()
+            HZBulkEdit.depth -= 1
+            raise
+        return self
+
+    def _setup(self):
+        if self.undo == 'chunk':
+            MC.undoInfo(openChunk=True)
+            self._restore.append(lambda: MC.undoInfo(closeChunk=True))
+        elif self.undo == 'off' and MC.undoInfo(q=True, state=True):
+            # without flush, the queue recorded before the scope stays usable
+            MC.undoInfo(stateWithoutFlush=False)
+            self._restore.append(lambda: MC.undoInfo(stateWithoutFlush=True))
+        # False when there is no viewport to suspend (batch mode)
+        if self.refresh and _query(MC.refresh, False, suspend=True) is None:
+            self._restore.append(lambda: MC.refresh(suspend=False))
+        if self.autosave and _query(MC.autoSave, q=True, enable=True):
+            MC.autoSave(enable=False)
+            self._restore.append(lambda: MC.autoSave(enable=True))
+        if self.evaluation:
+            mode = (_query(MC.evaluationManager, [None], q=True, mode=True) or [None])[0]
+            if mode and mode != self.evaluation:
+                MC.evaluationManager(mode=self.evaluation)
+                self._restore.append(lambda: MC.evaluationManager(mode=mode))
+
+    def _unwind(self):
+        errors = []
+        while self._restore:
+            try:
+                self._restore.pop()()
+            except Exception as e:
+                errors.append(e)
+        return errors
+
+    def __exit__(self, excType, excValue, tb):
+        HZBulkEdit.depth -= 1
+        errors = self._unwind()
+        if errors and excType is None:
+            raise errors[0]
+        return False
@@ -0,0 +1,275 @@
+# creation date : 19 October, 2026
+#
+# Description :
+#    Per shot Alembic caches of the animation camera, for departments that
+#    only need the camera of a shot. The camera and its history are exported
+#    once to a small scene (a baked world space copy when it is parented or
+#    constrained, so no rig comes with it), then headless workers (HZCameraCacheBatch.py)
+#    open it and write CAMERAS/<EP>_<SH>_CAM_<version>.abc with the export
+#    offset applied. A manifest keeps the hash of the camera animation of
+#    every shot by episode and shot, shots whose camera has not changed are
+#    not exported again, a new master version links (or copies) the cache
+#    of the previous one to its new name.
+#
+
+import hashlib, json, math, os, shutil
+from bisect import bisect_left, bisect_right
+from maya import cmds as MC
+
+try:
+    from . import HZMayaAscii as MA, HZShotCore as CO, HZJobRunner as JOB
+except (ImportError, ValueError):
+    import HZMayaAscii as MA, HZShotCore as CO, HZJobRunner as JOB
+
+CAMERAS_DIR = 'CAMERAS'
+MANIFEST_NAME = 'HZCameraCache.json'
+SHAPE_ATTRS = ('focalLength', 'horizontalFilmAperture', 'verticalFilmAperture', 'filmFit', 'lensSqueezeRatio',
+               'nearClipPlane', 'farClipPlane', 'horizontalFilmOffset', 'verticalFilmOffset')
+TANGENT_FLAGS = ('itt', 'ott', 'ia', 'oa', 'iw', 'ow')
+
+
+def findCamera():
+    '''
+    Animation camera of the scene, the one set up with setupAnimCam.
+    '''
+    cams = [node for node in MC.ls('*.HZTickColor', objectsOnly=True, recursive=True) or []
+            if MC.listRelatives(node, shapes=True, type='camera')]
+    return cams[0] if cams else None
+
+
+def cacheDir(sceneFile):
+    return os.path.join(os.path.dirname(sceneFile), CAMERAS_DIR)
+
+
+def cacheFileName(cameraDir, scene_name, sh):
+    shotFile = os.path.basename(CO.shotFileName(cameraDir, scene_name, sh))
+    return os.path.join(cameraDir, os.path.splitext(shotFile)[0].replace('_ANI_', '_CAM_', 1) + '.abc')
+
+
+def cacheKey(abcFile):
+    # EP<nn>_SH<nnn>, the same for every version of the master
+    return os.path.basename(abcFile).split('_CAM_', 1)[0]
+
+
+def loadManifest(cameraDir):
+    path = os.path.join(cameraDir, MANIFEST_NAME)
+    if not os.path.isfile(path):
+        return {}
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except ValueError:
+        return {}
+    # manifests written before were keyed by cache file name
+    for name in [name for name in manifest if name.endswith('.abc')]:
+        manifest.setdefault(cacheKey(name), dict(manifest[name], file=name))
+        del manifest[name]
+    return manifest
+
+
+def saveManifest(cameraDir, manifest):
+    path = os.path.join(cameraDir, MANIFEST_NAME)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    MA.replaceFile(path + '.tmp', path)
+
+
+def readCurves(camera):
+    '''
+    Keys of every anim curve that drives the camera, read once for all shots.
+    '''
+    shape = MC.listRelatives(camera, shapes=True, type='camera')[0]
+    curves = sorted(set(MC.listConnections([camera, shape], source=True, destination=False, type='animCurve') or []))
+    data = {}
+    for curve in curves:
+        keys = {'times': MC.keyframe(curve, q=True, tc=True) or [], 'values': MC.keyframe(curve, q=True, vc=True) or []}
+        for flag in TANGENT_FLAGS:
+            keys[flag] = MC.keyTangent(curve, q=True, **{flag: True}) or []
+        data[curve] = keys
+    return data
+
+
+def shotHash(camera, curves, start, stop, shift):
+    '''
+    Hash of what the camera does in the shot range: the keys in the range and
+    the keys on both sides of it, static camera attributes, the world matrix
+    on every frame (parents, constraints and rigs move it without its own
+    keys) and the time shift.
+    '''
+    sha = hashlib.sha1()
+    sha.update(json.dumps([start, stop, shift]).encode('utf-8'))
+    for curve in sorted(curves):
+        keys = curves[curve]
+        times = keys['times']
+        first = max(0, bisect_left(times, start) - 1)
+        last = min(len(times), bisect_right(times, stop) + 1)
+        sha.update(json.dumps([curve] + [keys[k][first:last] for k in ('times', 'values') + TANGENT_FLAGS]).encode('utf-8'))
+    shape = MC.listRelatives(camera, shapes=True, type='camera')[0]
+    statics = [MC.getAttr('%s.%s' % (shape, attr)) for attr in SHAPE_ATTRS]
+    sha.update(json.dumps(statics).encode('utf-8'))
+    for t in range(int(math.floor(start)), int(math.ceil(stop)) + 1):
+        sha.update(json.dumps([round(v, 6) for v in MC.getAttr('%s.worldMatrix' % camera, time=t)]).encode('utf-8'))
+    return sha.hexdigest()
+
+
+def isSelfContained(camera):
+    '''
+    True when the camera moves by its own keys only: no parent, no
+    constraint, expression or rig driving it. Those would be exported with
+    its history.
+    '''
+    if MC.listRelatives(camera, parent=True):
+        return False
+    shape = MC.listRelatives(camera, shapes=True, type='camera', fullPath=True)[0]
+    sources = MC.listConnections([camera, shape], source=True, destination=False, skipConversionNodes=True) or []
+    return all(MC.nodeType(node).startswith('animCurve') or MC.nodeType(node) == 'imagePlane' for node in sources)
+
+
+def bakeCamera(camera, start, stop):
+    '''
+    World space copy of the camera with a key on every frame from start to
+    stop, lens attributes included. Returns its long name, the caller deletes
+    it.
+    '''
+    shape = MC.listRelatives(camera, shapes=True, type='camera', fullPath=True)[0]
+    baked = MC.duplicate(camera, returnRootsOnly=True, inputConnections=False,
+                         name=camera.split('|')[-1].split(':')[-1] + '_baked')[0]
+    baked = MC.ls(baked, long=True)[0]
+    # rigs or locators under the camera stay behind
+    for child in MC.listRelatives(baked, children=True, fullPath=True) or []:
+        if MC.nodeType(child) != 'camera': MC.delete(child)
+    for attr in ('translate', 'rotate', 'scale'):
+        for axis in 'XYZ':
+            MC.setAttr('%s.%s%s' % (baked, attr, axis), lock=False)
+    if MC.listRelatives(baked, parent=True):
+        baked = MC.ls(MC.parent(baked, world=True)[0], long=True)[0]
+    bakedShape = MC.listRelatives(baked, shapes=True, type='camera', fullPath=True)[0]
+    links = [MC.parentConstraint(camera, baked, maintainOffset=False)[0]]
+    for node, copy, attrs in ((shape, bakedShape, SHAPE_ATTRS), (camera, baked, ('FL', ))):
+        for attr in attrs:
+            if MC.attributeQuery(attr, node=node, exists=True) and MC.listConnections('%s.%s' % (node, attr), source=True, destination=False):
+                MC.connectAttr('%s.%s' % (node, attr), '%s.%s' % (copy, attr), force=True)
+    MC.bakeResults([baked, bakedShape], time=(start, stop), simulation=True, sampleBy=1, preserveOutsideKeys=False,
+                   disableImplicitControl=True, sparseAnimCurveBake=False, removeBakedAttributeFromLayer=False)
+    MC.delete([link for link in links if MC.objExists(link)])
+    return baked
+
+
+def reuseCache(cameraDir, entry, abcFile):
+    '''
+    Give the cache of the manifest entry the name abcFile, a hard link when
+    the file system has them, a copy otherwise. Returns False when the
+    cache is gone.
+    '''
+    source = os.path.join(cameraDir, entry.get('file') or '')
+    if not entry.get('file') or not os.path.isfile(source):
+        return False
+    if os.path.abspath(source) == os.path.abspath(abcFile):
+        return True
+    tmpFile = os.path.splitext(abcFile)[0] + '_tmp.abc'
+    if os.path.isfile(tmpFile): os.remove(tmpFile)
+    try:
+        os.link(source, tmpFile)
+    except (AttributeError, OSError):
+        shutil.copy2(source, tmpFile)
+    MA.replaceFile(tmpFile, abcFile)
+    return True
+
+
+def prepareJobs(sceneFile, shotsInfo, shifts=None, camera=None, force=False):
+    '''
+    Hash the camera of every shot and export the camera scene if any shot
+    has changed. Unchanged caches of an earlier master version are given
+    the new name instead. Returns a dict to pass to submitJobs, or None when
+    every cache is up to date. `shifts` are the export time shifts of the
+    shots.
+    '''
+    camera = camera or findCamera()
+    if not camera:
+        MC.warning('no animation camera found for the camera caches')
+        return None
+    camera = MC.ls(camera, long=True)[0]
+    cameraDir = cacheDir(sceneFile)
+    manifest = loadManifest(cameraDir)
+    curves = readCurves(camera)
+    scene_name = os.path.basename(sceneFile)
+    jobs = []
+    reused = False
+    for idx, sh in enumerate(shotsInfo):
+        shift = shifts[idx] if shifts else 0
+        abcFile = cacheFileName(cameraDir, scene_name, sh)
+        digest = shotHash(camera, curves, sh['start'], sh['stop'], shift)
+        entry = manifest.get(cacheKey(abcFile), {})
+        if not force and entry.get('hash') == digest:
+            if os.path.isfile(abcFile) and entry.get('file') == os.path.basename(abcFile):
+                continue
+            if reuseCache(cameraDir, entry, abcFile):
+                entry['file'] = os.path.basename(abcFile)
+                reused = True
+                print('%s LINKED' % entry['file'])
+                continue
+        jobs.append({'name': sh['name'], 'file': abcFile, 'start': sh['start'] + shift, 'stop': sh['stop'] + shift,
+                     'shift': shift, 'hash': digest})
+    if reused:
+        saveManifest(cameraDir, manifest)
+    if not jobs:
+        return None
+    if not os.path.isdir(cameraDir): os.mkdir(cameraDir)
+    # workers open this small scene instead of the whole episode
+    cameraScene = os.path.join(cameraDir, '%s_CAMERA.ma' % os.path.splitext(scene_name)[0])
+    selection = MC.ls(sl=True)
+    exported = camera
+    try:
+        if not isSelfContained(camera):
+            # the history of a constrained camera is its rig, a baked copy is exported instead
+            exported = bakeCamera(camera, min(sh['start'] for sh in shotsInfo) - 1, max(sh['stop'] for sh in shotsInfo) + 1)
+        MC.select(exported, r=True)
+        MC.file(cameraScene, exportSelected=True, type='mayaAscii', force=True, constructionHistory=True,
+                channels=True, constraints=False, expressions=False, shader=False, preserveReferences=False)
+    finally:
+        if exported != camera and MC.objExists(exported): MC.delete(exported)
+        if selection: MC.select(selection, r=True)
+        else: MC.select(cl=True)
+    prepared = {'scene': cameraScene, 'camera': camera, 'dir': cameraDir, 'jobs': jobs}
+    if exported != camera:
+        # the baked copy is at the root of the camera scene, it is given the camera name back there
+        prepared.update(camera='|' + exported.split('|')[-1], name=camera.split('|')[-1].split(':')[-1])
+    return prepared
+
+
+def submitJobs(runner, prepared, onDone=None):
+    '''
+    Add one mayapy job per stale camera cache to a HZJobRunner, the manifest
+    is updated as jobs succeed.
+    '''
+    script = os.path.join(os.path.dirname(__file__), 'HZCameraCacheBatch.py')
+    manifest = loadManifest(prepared['dir'])
+    count = 0
+    for job in prepared['jobs']:
+        entry = manifest.get(cacheKey(job['file']), {})
+        upToDate = entry.get('hash') == job['hash'] and entry.get('file') == os.path.basename(job['file'])
+        if upToDate and os.path.isfile(job['file']):
+            continue
+        command = [JOB.mayapyPath(), script, prepared['scene'], job['file'], prepared['camera'],
+                   str(job['start']), str(job['stop']), '--shift', str(job['shift'])]
+        if prepared.get('name'):
+            command += ['--name', prepared['name']]
+        runner.submit(os.path.basename(job['file']), command, data=job,
+                      onDone=lambda hzJob: _cached(prepared['dir'], hzJob, onDone))
+        count += 1
+    return count
+
+
+def _cached(cameraDir, hzJob, onDone):
+    job = hzJob.data
+    if hzJob.state == 'done':
+        # jobs end on the main thread one at a time, the manifest is read again for each
+        manifest = loadManifest(cameraDir)
+        manifest[cacheKey(job['file'])] = {'hash': job['hash'], 'name': job['name'], 'file': os.path.basename(job['file']),
+                                           'start': job['start'], 'stop': job['stop']}
+        saveManifest(cameraDir, manifest)
+        print('%s DONE' % os.path.basename(job['file']))
+    else:
+        print('%s <<< camera cache: %s' % (hzJob.error or hzJob.state, job['file']))
+    if onDone is not None:
+        onDone(hzJob)
@@ -0,0 +1,52 @@
+# creation date : 19 October, 2026
+#
+# Description :
+#    This script is part of HZShotManager exporter.
+#    Writes the Alembic cache of the camera for one shot: the camera scene
+#    made by HZCameraCache is opened, keys are shifted by the shot offset and
+#    the shot range is exported with AbcExport, under the name of the camera
+#    of the master when a baked copy has been exported.
+#
+
+import sys, os, argparse
+import maya.standalone as std
+std.initialize(name='python')
+import maya.cmds as cmds
+import HZMayaAscii as MA
+import HZBulkEdit as BE
+import HZJobRunner as JOB
+
+parser = argparse.ArgumentParser()
+parser.add_argument('cameraScene')
+parser.add_argument('abcFile')
+parser.add_argument('camera', help='long name of the camera transform')
+parser.add_argument('start', type=float, help='first frame, shift included')
+parser.add_argument('stop', type=float, help='last frame, shift included')
+parser.add_argument('--shift', type=int, default=0, help='frames added to every key')
+parser.add_argument('--name', help='name of the camera in the cache')
+args = parser.parse_args()
+
+def cacheCamera(cameraScene, abcFile, camera, start, stop, shift=0, name=None):
+    try:
+        cmds.loadPlugin('AbcExport', quiet=True)
+        cmds.file(cameraScene, open=True, force=True, options='v=0;', ignoreVersion=1, prompt=False, typ='mayaAscii')
+        JOB.emit(stage='opened', progress=0.3)
+        if name and camera.split('|')[-1] != name:
+            camera = cmds.ls(cmds.rename(camera, name), long=True)[0]
+        allanimCurvesinScene = cmds.ls(type=['animCurveTL','animCurveTA','animCurveTU'])
+        if shift and allanimCurvesinScene:
+            with BE.HZBulkEdit(undo='off'):
+                cmds.keyframe(e=1, time=(), relative=1, timeChange=shift, *allanimCurvesinScene)
+        JOB.emit(stage='shifted', progress=0.5)
+        # written aside and moved, readers never see a half written cache
+        tmpFile = os.path.splitext(abcFile)[0] + '_tmp.abc'
+        cmds.AbcExport(j='-frameRange %g %g -root %s -worldSpace -eulerFilter -dataFormat ogawa '
+                         '-attr FL -file "%s"' % (start, stop, camera, tmpFile.replace('\\', '/')))
+        MA.replaceFile(tmpFile, abcFile)
+        sys.stdout.write(os.path.basename(abcFile))
+        return abcFile
+    except Exception as e:
+        sys.stderr.write(str(e))
+        sys.exit(-1)
+
+cacheCamera(args.cameraScene, args.abcFile, args.camera, args.start, args.stop, args.shift, args.name)
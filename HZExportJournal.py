@@ -0,0 +1,161 @@
+# creation date : 19 October, 2026
+#
+# Description :
+#    Journal of a shot export, written next to the SHOTS folder while
+#    exportShots runs. Every shot records the last stage it has passed
+#    (saved, cleaned, rewritten) and the mtime and size of its output file,
+#    so an interrupted export can be resumed from the first incomplete shot.
+#    Only shots that reach the final state of the export are hashed: the
+#    file is read once more, when nothing will write it anymore.
+#    Exports that do not make shot files (clean only) start from the shot
+#    files already on disk, those are 'saved', missing ones are left out.
+#
+
+import io, json, os, hashlib, time
+
+try:
+    from . import HZMayaAscii as MA
+except (ImportError, ValueError):
+    import HZMayaAscii as MA
+
+STATES = ('pending', 'saved', 'cleaned', 'rewritten')
+
+
+def journalPath(sceneFile):
+    scene_path, scene_name = os.path.split(sceneFile)
+    return os.path.join(scene_path, "%s_EXPORT.json" % os.path.splitext(scene_name)[0])
+
+
+def fileHash(path, blockSize=1 << 20):
+    sha = hashlib.sha1()
+    with io.open(path, 'rb') as f:
+        while True:
+            block = f.read(blockSize)
+            if not block: break
+            sha.update(block)
+    return sha.hexdigest()
+
+
+class HZExportJournal(object):
+    VERSION = 1
+
+    def __init__(self, path, data=None):
+        self.path = path
+        self.data = data or {}
+
+    @classmethod
+    def load(cls, path):
+        if not os.path.isfile(path):
+            return None
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except ValueError:
+            return None
+        if data.get('version') != cls.VERSION:
+            return None
+        return cls(path, data)
+
+    @classmethod
+    def create(cls, path, master, backup, settings, shotsInfo, shotFiles):
+        journal = cls(path, {'version': cls.VERSION, 'master': master, 'backup': backup, 'settings': settings,
+                             'created': time.time(), 'complete': False,
+                             'shots': [{'name': sh['name'], 'file': fl, 'state': 'pending', 'hash': None, 'stamp': None}
+                                       for sh, fl in zip(shotsInfo, shotFiles)]})
+        if not settings.get('make', True):
+            for shot in journal.shots:
+                journal._existing(shot)
+        journal.save()
+        return journal
+
+    def _existing(self, shot):
+        # without the make step, the shot files on disk are the saved ones
+        if os.path.isfile(shot['file']):
+            shot.update(state='saved', hash=None, stamp=list(MA.fileStamp(shot['file'])), missing=False)
+        else:
+            shot.update(state='pending', hash=None, stamp=None, missing=True)
+
+    @property
+    def shots(self):
+        return self.data['shots']
+
+    @property
+    def settings(self):
+        return self.data['settings']
+
+    @property
+    def complete(self):
+        return self.data.get('complete', False)
+
+    def save(self):
+        self.data['updated'] = time.time()
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.data, f, indent=2, sort_keys=True)
+        MA.replaceFile(tmp, self.path)
+
+    def reached(self, idx, state):
+        return STATES.index(self.shots[idx]['state']) >= STATES.index(state)
+
+    def mark(self, idx, state, **fields):
+        shot = self.shots[idx]
+        shot['state'] = state
+        exists = os.path.isfile(shot['file'])
+        shot['stamp'] = list(MA.fileStamp(shot['file'])) if exists else None
+        if 'hash' not in fields:
+            shot['hash'] = fileHash(shot['file']) if exists and state == self.finalState() else None
+        shot['error'] = None
+        shot.update(fields)
+        self.save()
+
+    def fail(self, idx, error):
+        self.shots[idx]['error'] = error
+        self.save()
+
+    def finish(self):
+        self.data['complete'] = True
+        self.save()
+
+    def verify(self):
+        '''
+        Check the outputs on disk, shots whose file is missing or has changed
+        since it was journaled go back to pending. Returns the index of the
+        first incomplete shot.
+        '''
+        make = self.settings.get('make', True)
+        for shot in self.shots:
+            if shot['state'] == 'pending' and make:
+                continue
+            if not self.unchanged(shot):
+                if make:
+                    shot.update(state='pending', hash=None, stamp=None)
+                else:
+                    self._existing(shot)
+        self.save()
+        return self.firstIncomplete(self.finalState())
+
+    def unchanged(self, shot):
+        '''
+        True if the file of a shot is still the one journaled: same content
+        for finished shots, same mtime and size for the others.
+        '''
+        if not os.path.isfile(shot['file']):
+            return False
+        if shot.get('hash'):
+            return fileHash(shot['file']) == shot['hash']
+        return shot.get('stamp') is not None and list(MA.fileStamp(shot['file'])) == shot['stamp']
+
+    def finalState(self):
+        settings = self.settings
+        if settings.get('clean') or settings.get('prune'):
+            return 'rewritten'
+        # an export without the make step (set keys only) has nothing to do per shot
+        return 'saved' if settings.get('make', True) else 'pending'
+
+    def firstIncomplete(self, state):
+        for idx, shot in enumerate(self.shots):
+            if shot.get('missing'):
+                continue
+            if not self.reached(idx, state):
+                return idx
+        return None
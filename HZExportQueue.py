@@ -0,0 +1,374 @@
+# creation date : 19 October, 2026
+#
+# Description :
+#    Export queue on shared storage, no server needed. A queue is a folder
+#    with one json file per job in pending/, claimed/, done/ and failed/.
+#    Workers claim a job by renaming it from pending/ to claimed/ (atomic on
+#    one file system) and keep a lease file up to date while they run it.
+#    Jobs whose lease has expired go back to pending/, failed jobs are
+#    retried until they run out of attempts.
+#    Every job is a list of steps (make, clean, rewrite), finished steps are
+#    recorded so a retried job goes on from the step that failed.
+#
+#    usage: python HZExportQueue.py work //server/queue --workers 4
+#           python HZExportQueue.py status //server/queue
+#           python HZExportQueue.py retry //server/queue
+#
+
+import argparse, json, os, socket, subprocess, sys, threading, time, uuid
+
+try:
+    from . import HZMayaAscii as MA, HZMayaBinary as MB, HZJobRunner as JOB, HZExportJournal as JR
+except (ImportError, ValueError):
+    import HZMayaAscii as MA, HZMayaBinary as MB, HZJobRunner as JOB, HZExportJournal as JR
+
+STATES = ('pending', 'claimed', 'done', 'failed')
+LEASE_SECONDS = 120
+RETRY_DELAY = 30
+OUTPUT_TAIL = 40
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _readJson(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+
+
+def workerName():
+    return '%s-%d' % (socket.gethostname(), os.getpid())
+
+
+class HZExportQueue(object):
+    '''
+    Lock file queue in `root`, safe to share between machines as long as
+    they see the same paths and have roughly synced clocks.
+    '''
+    def __init__(self, root, lease=LEASE_SECONDS, retryDelay=RETRY_DELAY):
+        self.root = root
+        self.lease = lease
+        self.retryDelay = retryDelay
+        self._noLease = {}
+        for folder in STATES + ('tmp', ):
+            path = os.path.join(root, folder)
+            if not os.path.isdir(path):
+                try: os.makedirs(path)
+                except OSError: pass
+
+    def _path(self, state, jobId, ext='.json'):
+        return os.path.join(self.root, state, jobId + ext)
+
+    def _write(self, path, data):
+        # written aside then moved, readers never see half a file
+        tmp = os.path.join(self.root, 'tmp', '%s.%s' % (os.path.basename(path), uuid.uuid4().hex))
+        with open(tmp, 'w') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        MA.replaceFile(tmp, path)
+
+    def _move(self, job, src, dst):
+        self._write(self._path(dst, job['id']), job)
+        try: os.remove(self._path(src, job['id']))
+        except OSError: pass
+
+    def enqueue(self, label, steps, batch=None, data=None, maxAttempts=3):
+        jobId = '%013d-%s' % (int(time.time() * 1000), uuid.uuid4().hex[:8])
+        job = {'id': jobId, 'label': label, 'steps': steps, 'batch': batch, 'data': data or {},
+               'attempts': 0, 'maxAttempts': maxAttempts, 'notBefore': 0, 'completed': [],
+               'created': time.time(), 'errors': [], 'result': None}
+        self._write(self._path('pending', jobId), job)
+        return job
+
+    def jobs(self, state, batch=None):
+        folder = os.path.join(self.root, state)
+        result = []
+        for name in sorted(os.listdir(folder)):
+            if not name.endswith('.json'): continue
+            job = _readJson(os.path.join(folder, name))
+            if job is not None and (batch is None or job.get('batch') == batch):
+                result.append(job)
+        return result
+
+    def claim(self, worker):
+        '''
+        Take the oldest pending job that is due, returns None if there is none.
+        '''
+        now = time.time()
+        for name in sorted(os.listdir(os.path.join(self.root, 'pending'))):
+            if not name.endswith('.json'): continue
+            jobId = name[:-5]
+            job = _readJson(self._path('pending', jobId))
+            if job is None or job.get('notBefore', 0) > now:
+                continue
+            try:
+                os.rename(self._path('pending', jobId), self._path('claimed', jobId))
+            except OSError:
+                # another worker has been faster
+                continue
+            self._writeLease(jobId, worker)
+            job = _readJson(self._path('claimed', jobId)) or job
+            job['attempts'] += 1
+            job['worker'] = worker
+            job['claimed'] = time.time()
+            self._write(self._path('claimed', jobId), job)
+            return job
+        return None
+
+    def _writeLease(self, jobId, worker):
+        self._write(self._path('claimed', jobId, '.lease'), {'worker': worker, 'expires': time.time() + self.lease})
+
+    def owns(self, job, worker):
+        lease = _readJson(self._path('claimed', job['id'], '.lease'))
+        return bool(lease) and lease.get('worker') == worker and os.path.isfile(self._path('claimed', job['id']))
+
+    def heartbeat(self, job, worker):
+        '''
+        Extend the lease, returns False if the job is not ours anymore.
+        '''
+        if not self.owns(job, worker):
+            return False
+        self._writeLease(job['id'], worker)
+        return True
+
+    def update(self, job, worker):
+        # record finished steps while the job runs
+        if self.owns(job, worker):
+            self._write(self._path('claimed', job['id']), job)
+
+    def _release(self, job):
+        try: os.remove(self._path('claimed', job['id'], '.lease'))
+        except OSError: pass
+
+    def complete(self, job, worker, result=None):
+        if not self.owns(job, worker):
+            return False
+        job['result'] = result
+        job['finished'] = time.time()
+        self._move(job, 'claimed', 'done')
+        self._release(job)
+        return True
+
+    def fail(self, job, worker, error):
+        if worker is not None and not self.owns(job, worker):
+            return False
+        job['errors'].append({'worker': worker, 'time': time.time(), 'error': error})
+        if job['attempts'] < job['maxAttempts']:
+            job['notBefore'] = time.time() + self.retryDelay * 2 ** (job['attempts'] - 1)
+            self._move(job, 'claimed', 'pending')
+        else:
+            job['finished'] = time.time()
+            self._move(job, 'claimed', 'failed')
+        self._release(job)
+        return True
+
+    def reap(self):
+        '''
+        Give back the jobs whose worker has stopped sending heartbeats.
+        '''
+        now = time.time()
+        folder = os.path.join(self.root, 'claimed')
+        for name in os.listdir(folder):
+            if not name.endswith('.json'): continue
+            jobId = name[:-5]
+            lease = _readJson(self._path('claimed', jobId, '.lease'))
+            if lease is None:
+                # a claim can be between its rename and its lease, wait a whole lease before taking it back
+                if now - self._noLease.setdefault(jobId, now) < self.lease: continue
+            elif lease.get('expires', 0) > now:
+                continue
+            self._noLease.pop(jobId, None)
+            job = _readJson(self._path('claimed', jobId))
+            if job is not None:
+                self.fail(job, None, 'lease of %s expired' % (lease or {}).get('worker'))
+
+    def retryFailed(self, batch=None):
+        jobs = self.jobs('failed', batch)
+        for job in jobs:
+            job.update(attempts=0, notBefore=0)
+            self._move(job, 'failed', 'pending')
+        return len(jobs)
+
+    def status(self, batch=None):
+        return dict((state, len(self.jobs(state, batch))) for state in STATES)
+
+
+class HZQueueWorker(object):
+    '''
+    Runs queued jobs until the queue is empty (or forever with `idleExit`
+    set to None). Steps with a `script` run in a mayapy process, the
+    `rewrite` step fixes the references of the shot file in process.
+    '''
+    def __init__(self, queue, name=None, mayapy=None, poll=5.0):
+        self.queue = queue
+        self.name = name or workerName()
+        self.mayapy = mayapy or os.environ.get('HZ_MAYAPY') or JOB.mayapyPath()
+        self.poll = poll
+        self.process = None
+        self.lost = threading.Event()
+
+    def run(self, idleExit=None):
+        idleSince = time.time()
+        while True:
+            self.queue.reap()
+            job = self.queue.claim(self.name)
+            if job is None:
+                # jobs waiting for a retry keep the worker alive
+                waiting = os.listdir(os.path.join(self.queue.root, 'pending'))
+                if idleExit is not None and not waiting and time.time() - idleSince >= idleExit:
+                    return
+                time.sleep(self.poll)
+                continue
+            self.runJob(job)
+            idleSince = time.time()
+
+    def _heartbeat(self, job, stop):
+        while not stop.wait(self.queue.lease / 4.0):
+            if not self.queue.heartbeat(job, self.name):
+                self.lost.set()
+                if self.process is not None and self.process.poll() is None:
+                    try: self.process.terminate()
+                    except OSError: pass
+                return
+
+    def runJob(self, job):
+        self.lost.clear()
+        stop = threading.Event()
+        beat = threading.Thread(target=self._heartbeat, args=(job, stop))
+        beat.daemon = True
+        beat.start()
+        started = time.time()
+        steps = []
+        try:
+            for step in job['steps']:
+                if step['name'] in job['completed']:
+                    continue
+                stepStarted = time.time()
+                self.runStep(step)
+                steps.append({'name': step['name'], 'seconds': round(time.time() - stepStarted, 2)})
+                job['completed'].append(step['name'])
+                self.queue.update(job, self.name)
+        except Exception as e:
+            if not self.lost.is_set():
+                self.queue.fail(job, self.name, str(e))
+            return False
+        finally:
+            stop.set()
+        shotFile = job['data'].get('file')
+        result = {'worker': self.name, 'seconds': round(time.time() - started, 2), 'steps': steps,
+                  'hash': JR.fileHash(shotFile) if shotFile and os.path.isfile(shotFile) else None}
+        return self.queue.complete(job, self.name, result)
+
+    def runStep(self, step):
+        if step.get('call') == 'rewrite':
+            fl = step['args'][0]
+            (MB if fl.lower().endswith('.mb') else MA).fixDeferredReferences(fl)
+            return
+        command = [self.mayapy if step.get('mayapy', True) else sys.executable,
+                   os.path.join(SCRIPTS_DIR, step['script'])] + list(step.get('args', []))
+        self.process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                        creationflags=JOB.CREATE_NO_WINDOW if os.name == 'nt' else 0)
+        output = []
+        for raw in iter(self.process.stdout.readline, b''):
+            line = raw.decode('utf-8', 'replace').rstrip()
+            if line and JOB.parseEvent(line) is None:
+                output = (output + [line])[-OUTPUT_TAIL:]
+        self.process.stdout.close()
+        returncode = self.process.wait()
+        self.process = None
+        if self.lost.is_set():
+            raise RuntimeError('lease lost')
+        if returncode != 0:
+            raise RuntimeError('%s failed (%s):\n%s' % (step['name'], returncode, '\n'.join(output)))
+
+
+def shotSteps(master, shotFile, flShInfo, shift, cleanArgs=None):
+    '''
+    Steps of one shot job: make the file from the shot master, clean it
+    with the batch cleaner if `cleanArgs` is given, then fix its references.
+    '''
+    steps = [{'name': 'make', 'script': 'HZShotExporterMakeFileBatch.py',
+              'args': [master, shotFile, json.dumps(flShInfo), '--shift', str(shift)]}]
+    if cleanArgs is not None:
+        steps.append({'name': 'clean', 'script': 'HZShotExporterCleanFilesBatch.py', 'args': [shotFile] + list(cleanArgs)})
+    steps.append({'name': 'rewrite', 'call': 'rewrite', 'args': [shotFile]})
+    return steps
+
+
+def activeShots(queue, batch):
+    # shot indices that are queued or running, they must not be queued twice
+    return set(job['data'].get('idx') for state in ('pending', 'claimed') for job in queue.jobs(state, batch))
+
+
+def syncJournal(journal):
+    '''
+    Mark the shots of an export journal whose queued job is done.
+    Returns the number of jobs still pending or running.
+    '''
+    queue = HZExportQueue(journal.settings['queue'])
+    batch = journal.data.get('batch')
+    for job in queue.jobs('done', batch):
+        idx = job['data'].get('idx')
+        if idx is not None and not journal.reached(idx, 'rewritten'):
+            result = job['result'] or {}
+            # the worker hashed the file it wrote, it is not read again here
+            fields = {'hash': result['hash']} if result.get('hash') else {}
+            journal.mark(idx, 'rewritten', worker=result.get('worker'), **fields)
+    for job in queue.jobs('failed', batch):
+        idx = job['data'].get('idx')
+        if idx is not None and not journal.reached(idx, 'rewritten'):
+            journal.fail(idx, job['errors'][-1]['error'] if job['errors'] else 'failed')
+    return len(activeShots(queue, batch))
+
+
+def spawnWorkers(root, count, args):
+    # local worker processes, each one is a full worker with its own name
+    processes = []
+    for i in range(count):
+        command = [sys.executable, os.path.abspath(__file__), 'work', root, '--workers', '1',
+                   '--name', '%s-%d' % (workerName(), i)] + args
+        processes.append(subprocess.Popen(command))
+    return [p.wait() for p in processes]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Shot export queue on shared storage.')
+    commands = parser.add_subparsers(dest='command')
+    work = commands.add_parser('work', help='run queued jobs')
+    work.add_argument('root')
+    work.add_argument('-j', '--workers', type=int, default=1, help='local worker processes')
+    work.add_argument('--name', help='worker name, host-pid by default')
+    work.add_argument('--mayapy', help='mayapy executable, HZ_MAYAPY or the one next to python by default')
+    work.add_argument('--idle-exit', type=float, default=None, help='stop after this many seconds without jobs')
+    work.add_argument('--poll', type=float, default=5.0)
+    work.add_argument('--lease', type=float, default=LEASE_SECONDS, help='seconds before a silent worker loses its job')
+    work.add_argument('--retry-delay', type=float, default=RETRY_DELAY, help='seconds before a failed job is retried')
+    status = commands.add_parser('status', help='count jobs per state')
+    status.add_argument('root')
+    status.add_argument('--batch')
+    retry = commands.add_parser('retry', help='queue failed jobs again')
+    retry.add_argument('root')
+    retry.add_argument('--batch')
+    args = parser.parse_args(argv)
+
+    if args.command == 'work':
+        if args.workers > 1:
+            extra = ['--poll', str(args.poll), '--lease', str(args.lease), '--retry-delay', str(args.retry_delay)]
+            if args.mayapy: extra += ['--mayapy', args.mayapy]
+            if args.idle_exit is not None: extra += ['--idle-exit', str(args.idle_exit)]
+            return max(spawnWorkers(args.root, args.workers, extra) or [0])
+        queue = HZExportQueue(args.root, args.lease, args.retry_delay)
+        HZQueueWorker(queue, args.name, args.mayapy, args.poll).run(args.idle_exit)
+    elif args.command == 'status':
+        counts = HZExportQueue(args.root).status(args.batch)
+        print(' '.join('%s: %d' % (state, counts[state]) for state in STATES))
+    elif args.command == 'retry':
+        print('%d job(s) queued again' % HZExportQueue(args.root).retryFailed(args.batch))
+    else:
+        parser.print_help()
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
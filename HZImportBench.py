@@ -0,0 +1,86 @@
+# creation date : 19 October, 2026
+#
+# Description :
+#    Import time of the shot manager modules. Every module is imported in a
+#    fresh interpreter a few times and the median is reported, with the
+#    number of modules it loads and the UI toolkits among them, HZShotCore
+#    should load no UI toolkit. Run it with mayapy (--python) to measure the
+#    modules with the Maya python. The mayapy batch scripts are not measured:
+#    they start maya.standalone at import, which is most of their startup,
+#    and never imported the shot manager.
+#
+#    usage: python HZImportBench.py
+#           python HZImportBench.py HZShotCore HZShotManager --python "C:/Program Files/Autodesk/Maya2022/bin/mayapy.exe"
+#
+
+import argparse, json, os, subprocess, sys
+
+MODULES = ('HZShotCore', 'HZMayaAscii', 'HZShotIndex', 'HZShotValidator', 'HZExportQueue', 'HZShotManager')
+UI_TOOLKITS = ('PySide2', 'PySide6', 'shiboken2', 'shiboken6', 'maya.OpenMayaUI', 'tkinter', 'Tkinter', 'webbrowser')
+
+_PROBE = '''
+import sys, time, json
+before = set(sys.modules)
+started = time.time()
+import %s
+seconds = time.time() - started
+loaded = sorted(set(sys.modules) - before)
+sys.stdout.write(json.dumps({'seconds': seconds, 'loaded': loaded}))
+'''
+
+
+def importTime(module, python=None):
+    '''
+    {'seconds', 'loaded'} of one import of module in a new interpreter, None
+    when it can not be imported there.
+    '''
+    proc = subprocess.Popen([python or sys.executable, '-c', _PROBE % module], stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE, cwd=os.path.dirname(os.path.abspath(__file__)))
+    out, err = proc.communicate()
+    if proc.returncode != 0:
+        return None
+    return json.loads(out.decode('utf-8').strip().splitlines()[-1])
+
+
+def benchmark(modules=MODULES, repeat=5, python=None):
+    '''
+    Median import time of every module, with the modules and UI toolkits it
+    loads. Modules that fail to import (no Maya here) are reported as such.
+    '''
+    results = []
+    for module in modules:
+        runs = [importTime(module, python) for _ in range(repeat)]
+        runs = [run for run in runs if run is not None]
+        if not runs:
+            results.append({'module': module, 'seconds': None})
+            continue
+        times = sorted(run['seconds'] for run in runs)
+        loaded = runs[-1]['loaded']
+        results.append({'module': module, 'seconds': times[len(times) // 2], 'loaded': len(loaded),
+                        'ui': [name for name in loaded if name in UI_TOOLKITS]})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Import time of the shot manager modules.')
+    parser.add_argument('modules', nargs='*', default=list(MODULES))
+    parser.add_argument('-n', '--repeat', type=int, default=5, help='imports per module, the median is reported')
+    parser.add_argument('--python', help='interpreter to measure with, ex: mayapy')
+    parser.add_argument('--json', action='store_true', help='print the results as json')
+    args = parser.parse_args(argv)
+
+    results = benchmark(args.modules, max(1, args.repeat), args.python)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    for result in results:
+        if result['seconds'] is None:
+            print('%-20s unavailable' % result['module'])
+            continue
+        print('%-20s %8.1f ms %5d modules%s' % (result['module'], result['seconds'] * 1000, result['loaded'],
+                                               '  UI: ' + ', '.join(result['ui']) if result['ui'] else ''))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,92 @@
+# creation date : 19 October, 2026
+#
+# Description :
+#    Non modal progress panel for HZJobRunner jobs.
+#    Shows every job with its stage and progress, the overall progress with
+#    an ETA and a Cancel button. The runner is polled by a Qt timer on Maya's
+#    main thread, so artists can keep working while jobs run in background.
+#
+
+from maya import cmds as MC
+from PySide2 import QtCore
+
+
+class HZJobPanel(object):
+    WINDOW_NAME = 'HZJobPanelWindow'
+    # keep running panels alive, Maya UI callbacks hold no strong reference
+    current = None
+
+    def __init__(self, runner, title='Jobs', onFinish=None, interval=200):
+        self.runner = runner
+        self.title = title
+        self.onFinish = onFinish
+        self.interval = interval
+        self.rows = {}
+        self.timer = None
+        self.finished = False
+
+    def show(self):
+        if MC.window(self.WINDOW_NAME, exists=True): MC.deleteUI(self.WINDOW_NAME)
+        window = MC.window(self.WINDOW_NAME, title=self.title, widthHeight=(420, 320), sizeable=1)
+        form = MC.formLayout()
+        self.lbl_total = MC.text(l='Starting...', al='left', font='boldLabelFont')
+        self.bar_total = MC.progressBar(maxValue=1000)
+        scroll = MC.scrollLayout(childResizable=True)
+        MC.columnLayout(adj=1, rowSpacing=2)
+        for job in self.runner.jobs:
+            MC.rowLayout(numberOfColumns=3, columnWidth3=(180, 90, 110), adjustableColumn=1,
+                         columnAttach=[(1, 'left', 2), (2, 'left', 2), (3, 'both', 2)])
+            MC.text(l=job.label, al='left')
+            stage = MC.text(l=job.state, al='left')
+            bar = MC.progressBar(maxValue=100, h=12)
+            MC.setParent(u=1)
+            self.rows[job.idx] = (stage, bar)
+        MC.setParent(form)
+        self.btn_cancel = MC.button(l='Cancel', c=self.cancel, h=25)
+        MC.formLayout(form, edit=True,
+                      attachForm=[(self.lbl_total, 'top', 5), (self.lbl_total, 'left', 5), (self.lbl_total, 'right', 5),
+                                  (self.bar_total, 'left', 5), (self.bar_total, 'right', 5),
+                                  (scroll, 'left', 5), (scroll, 'right', 5),
+                                  (self.btn_cancel, 'left', 5), (self.btn_cancel, 'right', 5), (self.btn_cancel, 'bottom', 5)],
+                      attachControl=[(self.bar_total, 'top', 5, self.lbl_total), (scroll, 'top', 5, self.bar_total),
+                                     (scroll, 'bottom', 5, self.btn_cancel)])
+        MC.showWindow(window)
+        HZJobPanel.current = self
+        if self.runner.started is None:
+            self.runner.start()
+        self.timer = QtCore.QTimer()
+        self.timer.timeout.connect(self.update)
+        self.timer.start(self.interval)
+
+    def cancel(self, *args):
+        if self.finished:
+            if MC.window(self.WINDOW_NAME, exists=True): MC.deleteUI(self.WINDOW_NAME)
+            return
+        self.runner.cancel()
+        MC.button(self.btn_cancel, e=1, l='Cancelling...', en=0)
+
+    def update(self):
+        handled = self.runner.poll()
+        exists = MC.window(self.WINDOW_NAME, exists=True)
+        if exists:
+            for job in set(job for job, _ in handled):
+                stage, bar = self.rows[job.idx]
+                MC.text(stage, e=1, l=job.stage if not job.isFinished else job.state)
+                MC.progressBar(bar, e=1, progress=int(job.progress * 100))
+            finished = len([job for job in self.runner.jobs if job.isFinished])
+            eta = self.runner.eta()
+            MC.text(self.lbl_total, e=1, l='%d / %d jobs finished%s' % (
+                finished, len(self.runner.jobs), '' if eta is None else ' - ETA %d:%02d' % divmod(int(eta), 60)))
+            MC.progressBar(self.bar_total, e=1, progress=int(self.runner.progress() * 1000))
+        if not self.runner.done:
+            return
+        self.timer.stop()
+        self.finished = True
+        if HZJobPanel.current is self:
+            HZJobPanel.current = None
+        if exists:
+            failed = len([job for job in self.runner.jobs if job.state != 'done'])
+            MC.text(self.lbl_total, e=1, l='Finished, %d job(s) failed or cancelled.' % failed if failed else 'Finished.')
+            MC.button(self.btn_cancel, e=1, l='Close', en=1)
+        if self.onFinish is not None:
+            self.onFinish(self.runner)
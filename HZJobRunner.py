@@ -0,0 +1,282 @@
+# creation date : 19 October, 2026
+#
+# Description :
+#    Background runner for the subprocess stages of the shot exporter.
+#    Jobs are external commands (mostly mayapy batch scripts) run by a pool
+#    of worker threads. Workers read the job output line by line, lines that
+#    start with PROGRESS_PREFIX are structured progress events written by the
+#    batch scripts with `emit`. Events are queued and handed to the main
+#    thread by `poll`, so a UI can show them without blocking Maya.
+#    A runner started with `stream` takes jobs while it runs, until `close`:
+#    a producer hands each job over as soon as its input is ready and
+#    `submit` waits while `maxPending` jobs are still waiting for a worker,
+#    calling `check` (HZProgress.check) so the wait can be cancelled.
+#    Without a UI to poll from, `wait` can drive a HZProgress stage with the
+#    overall progress of the jobs, a cancel there cancels the jobs.
+#
+
+import json, os, subprocess, sys, threading, time
+
+try:
+    import Queue as queue
+except ImportError:
+    import queue
+
+PROGRESS_PREFIX = 'HZPROGRESS '
+FINISHED_STATES = ('done', 'failed', 'cancelled')
+CREATE_NO_WINDOW = 0x08000000
+
+
+def emit(**event):
+    '''
+    Write a progress event from a batch script, ex: emit(stage='open', progress=0.1)
+    '''
+    sys.stdout.write('\n%s%s\n' % (PROGRESS_PREFIX, json.dumps(event)))
+    sys.stdout.flush()
+
+
+def parseEvent(line):
+    if not line.startswith(PROGRESS_PREFIX):
+        return None
+    try:
+        return json.loads(line[len(PROGRESS_PREFIX):])
+    except ValueError:
+        return None
+
+
+def mayapyPath():
+    return os.path.join(os.path.split(sys.executable)[0], 'mayapy.exe' if os.name == 'nt' else 'mayapy')
+
+
+class HZJob(object):
+    def __init__(self, idx, label, command, postprocess=None, onDone=None, data=None):
+        self.idx = idx
+        self.label = label
+        self.command = command
+        self.postprocess = postprocess
+        self.onDone = onDone
+        self.data = data
+        self.state = 'queued'
+        self.stage = ''
+        self.progress = 0.0
+        self.output = []
+        self.error = None
+        self.returncode = None
+        self.started = None
+        self.finished = None
+        self.process = None
+
+    def __repr__(self):
+        return "HZJob(%r, %r)" % (self.label, self.state)
+
+    @property
+    def isFinished(self):
+        return self.state in FINISHED_STATES
+
+
+class HZJobRunner(object):
+    '''
+    Run jobs with at most `maxWorkers` processes at the same time.
+    Every state change or progress event of a job is queued as a (job, event)
+    tuple, `poll` has to be called from the main thread to apply them and to
+    run the `onDone` callbacks. `postprocess` callables run in the worker
+    thread once the command has succeeded.
+    '''
+    def __init__(self, maxWorkers=1, maxPending=None, check=None):
+        self.maxWorkers = max(1, int(maxWorkers or 1))
+        self.maxPending = maxPending
+        self.check = check
+        self.jobs = []
+        self.started = None
+        self._pending = queue.Queue()
+        self._events = queue.Queue()
+        self._cancelled = threading.Event()
+        # held by cancel and around Popen, a job taken before a cancel does not start after it
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._closed.set()
+        self._threads = []
+        self._reported = 0
+
+    def submit(self, label, command, postprocess=None, onDone=None, data=None, interval=0.2):
+        '''
+        Add a job. On a streaming runner it waits, polling, while maxPending
+        jobs are still queued, so the producer never gets far ahead of the
+        workers. `check` is called while it waits, what it raises (a
+        cancelled progress) stops the wait.
+        '''
+        if self.maxPending and self.started is not None and not self._closed.is_set():
+            while self._pending.qsize() >= self.maxPending and not self._cancelled.is_set():
+                if self.check is not None:
+                    self.check()
+                self.poll()
+                time.sleep(interval)
+        job = HZJob(len(self.jobs), label, command, postprocess, onDone, data)
+        self.jobs.append(job)
+        if self._cancelled.is_set():
+            self._finish(job, 'cancelled')
+        else:
+            self._pending.put(job)
+        return job
+
+    def start(self):
+        if self.started is not None:
+            return
+        self.started = time.time()
+        workers = self.maxWorkers if not self._closed.is_set() else min(self.maxWorkers, len(self.jobs))
+        for _ in range(workers):
+            thread = threading.Thread(target=self._work)
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def stream(self):
+        '''
+        Start the workers now, jobs can be submitted until `close` is called.
+        '''
+        self._closed.clear()
+        self.start()
+        return self
+
+    def close(self):
+        # no more jobs, workers stop once the queue is empty
+        self._closed.set()
+
+    def cancel(self):
+        with self._lock:
+            self._cancelled.set()
+            self._closed.set()
+            for job in self.jobs:
+                if job.process is not None and job.process.poll() is None:
+                    try: job.process.terminate()
+                    except OSError: pass
+        while True:
+            try: job = self._pending.get_nowait()
+            except queue.Empty: break
+            self._finish(job, 'cancelled')
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    @property
+    def done(self):
+        return self._closed.is_set() and all(job.isFinished for job in self.jobs)
+
+    def _work(self):
+        while not self._cancelled.is_set():
+            try: job = self._pending.get(timeout=0.1) if not self._closed.is_set() else self._pending.get_nowait()
+            except queue.Empty:
+                if self._closed.is_set(): return
+                continue
+            self._run(job)
+
+    def _finish(self, job, state, error=None):
+        # job states only change in poll, so the main thread sees them in order
+        job.error = error
+        job.finished = time.time()
+        self._events.put((job, {'stage': state, 'final': True}))
+
+    def _run(self, job):
+        job.started = time.time()
+        self._events.put((job, {'stage': 'start', 'progress': 0.0}))
+        with self._lock:
+            if self._cancelled.is_set():
+                return self._finish(job, 'cancelled')
+            try:
+                job.process = subprocess.Popen(job.command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                               creationflags=CREATE_NO_WINDOW if os.name == 'nt' else 0)
+            except OSError as e:
+                return self._finish(job, 'failed', str(e))
+        for raw in iter(job.process.stdout.readline, b''):
+            line = raw.decode('utf-8', 'replace').rstrip()
+            event = parseEvent(line)
+            if event is not None:
+                self._events.put((job, event))
+            elif line:
+                job.output.append(line)
+        job.process.stdout.close()
+        job.returncode = job.process.wait()
+        if self._cancelled.is_set():
+            return self._finish(job, 'cancelled')
+        if job.returncode != 0:
+            return self._finish(job, 'failed', '\n'.join(job.output))
+        if job.postprocess is not None:
+            try:
+                job.postprocess(job)
+            except Exception as e:
+                return self._finish(job, 'failed', str(e))
+        self._finish(job, 'done')
+
+    def poll(self):
+        '''
+        Apply queued events, must be called from the main thread.
+        Returns the list of handled (job, event) tuples.
+        '''
+        handled = []
+        while True:
+            try: job, event = self._events.get_nowait()
+            except queue.Empty: break
+            if 'progress' in event:
+                job.progress = float(event['progress'])
+            if event.get('stage'):
+                job.stage = event['stage']
+            if event.get('stage') == 'start':
+                job.state = 'running'
+            if event.get('final'):
+                job.state = event['stage']
+                if job.state == 'done': job.progress = 1.0
+                if job.onDone is not None: job.onDone(job)
+            handled.append((job, event))
+        return handled
+
+    def inOrder(self):
+        '''
+        Finished jobs whose earlier jobs have all finished and that have not
+        been returned yet, results come out in submission order.
+        '''
+        ready = []
+        while self._reported < len(self.jobs) and self.jobs[self._reported].isFinished:
+            ready.append(self.jobs[self._reported])
+            self._reported += 1
+        return ready
+
+    def progress(self):
+        if not self.jobs:
+            return 1.0
+        return sum(1.0 if job.isFinished else job.progress for job in self.jobs) / len(self.jobs)
+
+    def eta(self):
+        # seconds left, guessed from the progress made so far
+        progress = self.progress()
+        if not self.started or progress <= 0.0:
+            return None
+        elapsed = time.time() - self.started
+        return elapsed * (1.0 - progress) / progress
+
+    def wait(self, interval=0.2, progress=None):
+        '''
+        Blocking run for batch mode, where there is no UI to poll from.
+        `progress` is a HZProgress stage advanced with the jobs, its check()
+        is called on every poll: when it raises (HZCancelled) the jobs are
+        cancelled and waited for before the error goes on.
+        '''
+        if self.started is None:
+            self.start()
+        try:
+            while not self.done:
+                self.poll()
+                if progress is not None:
+                    progress.done = self.progress() * progress.total
+                    progress.progress.check()
+                time.sleep(interval)
+        except BaseException:
+            self.cancel()
+            while not self.done:
+                self.poll()
+                time.sleep(interval)
+            raise
+        finally:
+            self.poll()
+            if progress is not None:
+                progress.done = self.progress() * progress.total
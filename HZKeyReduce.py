@@ -0,0 +1,182 @@
+# creation date : 19 October, 2026
+#
+# Description :
+#    Remove keys that do not change the evaluated animation, mostly the hold
+#    keys setKeyShots adds at every shot start and stop. A key is redundant
+#    when the curve is constant around it or when it lies on the straight
+#    line between its neighbours with linear tangents. The tests run on the
+#    whole key arrays of a curve at once (numpy when it is available), the
+#    keys found are removed with one cutKey per curve.
+#    Keys on shot boundaries are kept, unless the curve holds one value over
+#    the whole shot and another key of the shot is kept, so a shot file
+#    cleaned to its own range still starts and ends on the right pose.
+#    The HZTickColor curve of the animation camera is never reduced, its
+#    keys are the shot boundaries HZShotRecover rebuilds the shots from.
+#
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    from maya import cmds as MC
+except ImportError:
+    MC = None
+
+try:
+    from . import HZProgress as PG
+except (ImportError, ValueError):
+    import HZProgress as PG
+
+ANIMCURVE_TYPES = ['animCurveTL', 'animCurveTA', 'animCurveTU']
+# tangents that keep a segment straight whatever the other keys are
+LINEAR_TANGENTS = ('linear', )
+# tangents that keep a segment flat between keys of the same value
+HOLD_TANGENTS = ('linear', 'flat', 'step')
+TOLERANCE = 1e-4
+MARKER_ATTR = 'HZTickColor'
+
+
+def _interior(times, values, inTangents, outTangents, tolerance):
+    '''
+    (collinear, constant) flags of the keys 1..n-2, tested against their
+    direct neighbours.
+    '''
+    linIn = [t in LINEAR_TANGENTS for t in inTangents]
+    linOut = [t in LINEAR_TANGENTS for t in outTangents]
+    holdIn = [t in HOLD_TANGENTS for t in inTangents]
+    holdOut = [t in HOLD_TANGENTS for t in outTangents]
+    if numpy is not None:
+        t = numpy.asarray(times, dtype=float)
+        v = numpy.asarray(values, dtype=float)
+        linIn, linOut = numpy.asarray(linIn), numpy.asarray(linOut)
+        holdIn, holdOut = numpy.asarray(holdIn), numpy.asarray(holdOut)
+        t0, t1, t2 = t[:-2], t[1:-1], t[2:]
+        v0, v1, v2 = v[:-2], v[1:-1], v[2:]
+        predicted = v0 + (v2 - v0) * (t1 - t0) / (t2 - t0)
+        collinear = (numpy.abs(predicted - v1) <= tolerance) & linOut[:-2] & linIn[1:-1] & linOut[1:-1] & linIn[2:]
+        constant = ((numpy.abs(v1 - v0) <= tolerance) & (numpy.abs(v2 - v1) <= tolerance) &
+                    holdOut[:-2] & holdIn[1:-1] & holdOut[1:-1] & holdIn[2:])
+        return collinear.tolist(), constant.tolist()
+    collinear, constant = [], []
+    for i in range(1, len(times) - 1):
+        t0, t1, t2 = times[i - 1], times[i], times[i + 1]
+        v0, v1, v2 = values[i - 1], values[i], values[i + 1]
+        predicted = v0 + (v2 - v0) * (t1 - t0) / (t2 - t0)
+        collinear.append(abs(predicted - v1) <= tolerance and linOut[i - 1] and linIn[i] and linOut[i] and linIn[i + 1])
+        constant.append(abs(v1 - v0) <= tolerance and abs(v2 - v1) <= tolerance and
+                        holdOut[i - 1] and holdIn[i] and holdOut[i] and holdIn[i + 1])
+    return collinear, constant
+
+
+def _fitsLine(times, values, first, last, tolerance):
+    # keys between first and last can all go if they stay on the first-last line
+    t0, v0, t1, v1 = times[first], values[first], times[last], values[last]
+    return all(abs(v0 + (v1 - v0) * (times[i] - t0) / (t1 - t0) - values[i]) <= tolerance
+               for i in range(first + 1, last))
+
+
+def redundantKeys(times, values, inTangents, outTangents, shots=(), tolerance=TOLERANCE):
+    '''
+    Indices of the keys that can be removed without changing the curve.
+    `shots` are (start, stop) ranges whose boundary keys have to be kept.
+    '''
+    if len(times) < 3:
+        return []
+    collinear, constant = _interior(times, values, inTangents, outTangents, tolerance)
+    candidates = [i + 1 for i, (a, b) in enumerate(zip(collinear, constant)) if a or b]
+    if not candidates:
+        return []
+    boundaries = {}
+    for start, stop in shots:
+        boundaries.setdefault(start, []).append((start, stop))
+        boundaries.setdefault(stop, []).append((start, stop))
+    removable = set()
+    for i in candidates:
+        for start, stop in boundaries.get(times[i], ()):
+            if not _holdsOverShot(times, values, start, stop, tolerance):
+                break
+        else:
+            removable.add(i)
+    # runs of neighbours have to fit one line, else every other key is kept
+    result = []
+    run = []
+    for i in sorted(removable) + [None]:
+        if run and (i is None or i != run[-1] + 1):
+            if len(run) == 1 or _fitsLine(times, values, run[0] - 1, run[-1] + 1, tolerance):
+                result.extend(run)
+            else:
+                result.extend(run[::2])
+            run = []
+        if i is not None:
+            run.append(i)
+    return _keepOnePerShot(times, result, shots)
+
+
+def _holdsOverShot(times, values, start, stop, tolerance):
+    inside = [values[i] for i, t in enumerate(times) if start <= t <= stop]
+    return bool(inside) and max(inside) - min(inside) <= tolerance
+
+
+def _keepOnePerShot(times, removed, shots):
+    removedSet = set(removed)
+    for start, stop in shots:
+        inside = [i for i, t in enumerate(times) if start <= t <= stop]
+        if inside and all(i in removedSet for i in inside):
+            removedSet.discard(inside[0])
+    return sorted(removedSet)
+
+
+def _ranges(indices):
+    # contiguous index ranges, cutKey takes them all at once
+    ranges = []
+    for i in indices:
+        if ranges and ranges[-1][1] == i - 1:
+            ranges[-1][1] = i
+        else:
+            ranges.append([i, i])
+    return [tuple(r) for r in ranges]
+
+
+def reduceKeys(curves=None, shotsInfo=None, tolerance=TOLERANCE, progress=None):
+    '''
+    Remove redundant keys of the curves, returns a report dict with the key
+    counts before and after, None if it has been cancelled.
+    '''
+    if curves is None:
+        curves = MC.ls(type=ANIMCURVE_TYPES) or []
+    if progress is None:
+        # on its own, a cancel gives back the keys removed so far
+        try:
+            from . import HZBulkEdit as BE
+        except (ImportError, ValueError):
+            import HZBulkEdit as BE
+        report = None
+        with BE.HZBulkEdit(undo='chunk'), PG.HZProgress('Reduce Keys') as progress:
+            report = reduceKeys(curves, shotsInfo, tolerance, progress)
+        if progress.cancelled: MC.undo()
+        return report
+    shots = [(sh['start'], sh['stop']) for sh in shotsInfo or []]
+    plugs = MC.ls('*.%s' % MARKER_ATTR, recursive=True)
+    markers = set(MC.listConnections(plugs, source=True, destination=False, type='animCurve') or []) if plugs else set()
+    report = {'curves': 0, 'before': 0, 'removed': 0}
+    with progress.current().stage('Reduce Keys', total=len(curves)) as st:
+        for curve in curves:
+            progress.check()
+            st.step()
+            if curve in markers or MC.referenceQuery(curve, isNodeReferenced=True):
+                continue
+            times = MC.keyframe(curve, q=True, tc=True) or []
+            report['before'] += len(times)
+            if len(times) < 3:
+                continue
+            values = MC.keyframe(curve, q=True, vc=True)
+            inTangents = MC.keyTangent(curve, q=True, itt=True)
+            outTangents = MC.keyTangent(curve, q=True, ott=True)
+            removed = redundantKeys(times, values, inTangents, outTangents, shots, tolerance)
+            if removed:
+                MC.cutKey(curve, index=_ranges(removed), clear=True)
+                report['curves'] += 1
+                report['removed'] += len(removed)
+    return report
@@ -0,0 +1,599 @@
+# creation date : 19 October, 2026
+#
+# Description :
+#    Maya free reader for mayaAscii (.ma) scene files.
+#    Only the statements that are needed are parsed, the header (everything
+#    before the first createNode) holds the reference tree, the requires and
+#    the fileInfo entries, so most questions can be answered without reading
+#    the whole scene.
+#
+
+import io, os, re, json, mmap
+
+HEADER_END = ('createNode', )
+ANIMCURVE_TYPES = ('animCurveTL', 'animCurveTA', 'animCurveTU')
+# shot data, see HZShotData
+SHOTS_LEGACY_KEY = 'HZShotsInfoJson'
+SHOTS_SCHEMA_KEY = 'HZShotsDataSchema'
+SHOTS_SCHEMA_ATTR = 'hzShotsSchema'
+SHOTS_FIELDS = {'shotName': 'name', 'shotStart': 'start', 'shotStop': 'stop', 'shotColor': 'color'}
+
+_tokenRegex = re.compile(r'"((?:[^"\\]|\\.)*)"|([^\s;]+)')
+_escapeRegex = re.compile(r'\\(.)')
+_escapes = {'n': '\n', 't': '\t', 'r': '\r'}
+PLAYBACK_NODE = b'sceneConfigurationScriptNode'
+# bytes after the node name its playbackOptions string is looked for in
+PLAYBACK_WINDOW = 4096
+_playbackRegex = re.compile(br'playbackOptions\s+-min\s+(-?[\d.]+)\s+-max\s+(-?[\d.]+)')
+_deferredRegex = re.compile(r'-dr\s+"?[01]"?\s+')
+_shotPlugRegex = re.compile(r'^\.shots\[(\d+)\]\.(\w+?)([RGB])?$')
+
+# flags of the `file` command that take one value in .ma headers
+_fileValueFlags = ('-rdi', '-ns', '-rfn', '-dr', '-op', '-typ', '-rpr', '-shd', '-gr', '-dns')
+
+
+def unescape(text):
+    return _escapeRegex.sub(lambda m: _escapes.get(m.group(1), m.group(1)), text)
+
+
+def escape(text):
+    return text.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def splitStatement(statement):
+    '''
+    Split one mel statement into its words, quoted strings are returned
+    unescaped and without their quotes.
+    '''
+    return [w or unescape(q) for q, w in _tokenRegex.findall(statement)]
+
+
+def _quoteState(line, inQuote):
+    # returns if the line ends inside a quoted string
+    if '"' not in line:
+        return inQuote
+    escaped = False
+    for ch in line:
+        if escaped:
+            escaped = False
+        elif ch == '\\':
+            escaped = inQuote
+        elif ch == '"':
+            inQuote = not inQuote
+    return inQuote
+
+
+def iterStatements(path, stopAt=None, offset=0):
+    '''
+    Stream the statements of a mayaAscii file.
+    Yields (offset, statement) tuples, offset is the byte offset of the first
+    line of the statement. Text is decoded as latin-1 so it can be written back
+    without any loss. Comment lines are yielded as their own statements.
+    if `stopAt` is given, reading stops before the first statement starting
+    with one of those words. `offset` has to be the start of a statement.
+    '''
+    with io.open(path, 'rb') as f:
+        f.seek(offset)
+        buf = []
+        start = offset
+        inQuote = False
+        for raw in f:
+            line = raw.decode('latin-1')
+            lineOffset = offset
+            offset += len(raw)
+            if not buf:
+                stripped = line.lstrip()
+                if not stripped:
+                    continue
+                if stripped.startswith('//'):
+                    yield lineOffset, line.rstrip('\r\n')
+                    continue
+                if stopAt and stripped.split(None, 1)[0] in stopAt:
+                    return
+                start = lineOffset
+            buf.append(line)
+            inQuote = _quoteState(line, inQuote)
+            if not inQuote and line.rstrip().endswith(';'):
+                yield start, ''.join(buf).rstrip('\r\n')
+                buf = []
+        if buf:
+            yield start, ''.join(buf).rstrip('\r\n')
+
+
+def iterHeader(path):
+    return iterStatements(path, stopAt=HEADER_END)
+
+
+def headerCodec(path):
+    for _, st in iterHeader(path):
+        if st.startswith('//Codeset:'):
+            codeset = st.split(':', 1)[1].strip().upper().replace('-', '')
+            return 'utf-8' if codeset in ('UTF8', '65001') else 'cp%s' % codeset if codeset.isdigit() else 'latin-1'
+        if not st.startswith('//'):
+            break
+    return 'latin-1'
+
+
+def readFileInfo(path):
+    '''
+    fileInfo entries of the header as a dict, values are unescaped.
+    '''
+    info = {}
+    for _, st in iterHeader(path):
+        if st.startswith('fileInfo'):
+            words = splitStatement(st)
+            if len(words) >= 3:
+                info[words[1]] = words[2]
+    return info
+
+
+def searchFile(path, func):
+    '''
+    Call func with a read only mmap of the file, the whole scene is searched
+    at C speed without decoding it. Returns None for empty files.
+    '''
+    with io.open(path, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size:
+            return None
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return func(mm)
+        finally:
+            mm.close()
+
+
+def _shotsNodeOffset(mm):
+    pos = mm.find(('"%s"' % SHOTS_SCHEMA_ATTR).encode('ascii'))
+    if pos < 0:
+        return None
+    start = mm.rfind(b'createNode network', 0, pos)
+    return start if start >= 0 else None
+
+
+def readShotsNode(path):
+    '''
+    Shots stored on the shot data network node (see HZShotData). The node is
+    found with a byte search, only its own statements are parsed.
+    '''
+    offset = searchFile(path, _shotsNodeOffset)
+    if offset is None:
+        return []
+    shots = {}
+    current = None
+    isShotsNode = False
+    for _, st in iterStatements(path, offset=offset):
+        if st.startswith('createNode'):
+            if isShotsNode:
+                break
+            words = splitStatement(st)
+            current = words[1] if len(words) > 1 else None
+            continue
+        if current != 'network':
+            continue
+        st = st.strip()
+        if st.startswith('addAttr') and SHOTS_SCHEMA_ATTR in st:
+            isShotsNode = True
+        elif st.startswith('setAttr') and '.shots[' in st:
+            words = splitStatement(st)[1:]
+            plugs = [w for w in words if w.startswith('.shots[')]
+            if not plugs: continue
+            found = _shotPlugRegex.match(plugs[0])
+            if not found or found.group(2) not in SHOTS_FIELDS: continue
+            values = words[words.index(plugs[0]) + 1:]
+            if '-type' in values:
+                typeIdx = values.index('-type')
+                del values[typeIdx:typeIdx + 2]
+            shot = shots.setdefault(int(found.group(1)), {'name': '', 'start': 0, 'stop': 0, 'color': [0.0, 0.0, 0.0]})
+            key = SHOTS_FIELDS[found.group(2)]
+            if key == 'name':
+                shot[key] = values[0] if values else ''
+            elif key == 'color':
+                if found.group(3):
+                    shot[key]['RGB'.index(found.group(3))] = float(values[0])
+                else:
+                    shot[key] = [float(v) for v in values[:3]]
+            else:
+                shot[key] = int(float(values[0]))
+    if not isShotsNode:
+        return []
+    return [shots[idx] for idx in sorted(shots)]
+
+
+def readShotsInfo(path, info=None):
+    '''
+    Shot list of a .ma file from either the shot data node or the older
+    HZShotsInfoJson fileInfo.
+    '''
+    if info is None:
+        info = readFileInfo(path)
+    if SHOTS_SCHEMA_KEY in info:
+        return readShotsNode(path)
+    if SHOTS_LEGACY_KEY in info:
+        try:
+            return json.loads(info[SHOTS_LEGACY_KEY])
+        except ValueError:
+            return []
+    return []
+
+
+def decodeToken(token, codec):
+    # tokens are latin-1 decoded bytes, return them in the scene codeset
+    try:
+        return token.encode('latin-1').decode(codec)
+    except (UnicodeError, LookupError):
+        return token
+
+
+def parseFileCommand(statement):
+    '''
+    Parse a `file -r` / `file -rdi` header statement into a dict of its flags,
+    the referenced path is stored under `path`.
+    '''
+    words = splitStatement(statement)
+    if not words or words[0] != 'file':
+        return None
+    flags = {}
+    idx = 1
+    last = len(words) - 1
+    while idx < last:
+        word = words[idx]
+        if word in _fileValueFlags or (word.startswith('-') and idx + 1 < last and not words[idx + 1].startswith('-')):
+            flags[word] = words[idx + 1]
+            idx += 2
+        else:
+            flags[word] = True
+            idx += 1
+    flags['path'] = words[last]
+    return flags
+
+
+class HZReference(object):
+    def __init__(self, refNode, namespace, path, depth=1, deferred=False, fileType=None, options=None):
+        self.refNode = refNode
+        self.namespace = namespace
+        self.path = path
+        self.depth = depth
+        self.deferred = deferred
+        self.fileType = fileType
+        self.options = options
+        self.parent = None
+        self.children = []
+
+    def __repr__(self):
+        return "HZReference(%r, %r)" % (self.refNode, self.path)
+
+    @property
+    def fullNamespace(self):
+        names = []
+        ref = self
+        while ref is not None:
+            if ref.namespace and ref.namespace != ':':
+                names.append(ref.namespace.strip(':'))
+            ref = ref.parent
+        return ':'.join(reversed(names))
+
+    def ancestors(self):
+        ref = self.parent
+        while ref is not None:
+            yield ref
+            ref = ref.parent
+
+
+class HZReferenceGraph(object):
+    '''
+    Reference tree of a scene as it is written to the header of a .ma file.
+    `file -rdi <depth>` lines describe every reference (nested ones too) in
+    depth first order, `file -r` lines hold the load state of top references.
+    '''
+    def __init__(self, references=None):
+        self.references = references or []
+        self.byNode = dict((r.refNode, r) for r in self.references)
+
+    def __iter__(self):
+        return iter(self.references)
+
+    def __len__(self):
+        return len(self.references)
+
+    def get(self, refNode):
+        return self.byNode.get(refNode)
+
+    def roots(self):
+        return [r for r in self.references if r.parent is None]
+
+    def nestedRefNodes(self):
+        # reference nodes with child references, parents come first
+        return [r.refNode for r in self.references if r.children]
+
+    def paths(self):
+        seen = []
+        for r in self.references:
+            if r.path not in seen:
+                seen.append(r.path)
+        return seen
+
+    @classmethod
+    def fromStatements(cls, statements, codec='latin-1'):
+        references = []
+        byNode = {}
+        stack = []
+        for st in statements:
+            if not st.startswith('file '):
+                continue
+            flags = parseFileCommand(st)
+            if not flags:
+                continue
+            refNode = flags.get('-rfn')
+            deferred = str(flags.get('-dr', '0')) == '1'
+            if '-rdi' in flags:
+                depth = int(flags['-rdi'])
+                ref = HZReference(refNode, decodeToken(flags.get('-ns', ''), codec), decodeToken(flags['path'], codec),
+                                  depth, deferred, flags.get('-typ'), flags.get('-op'))
+                del stack[depth - 1:]
+                if stack:
+                    ref.parent = stack[-1]
+                    stack[-1].children.append(ref)
+                stack.append(ref)
+                references.append(ref)
+                if refNode: byNode[refNode] = ref
+            elif '-r' in flags or '-reference' in flags:
+                ref = byNode.get(refNode)
+                if ref is None:
+                    ref = HZReference(refNode, decodeToken(flags.get('-ns', ''), codec), decodeToken(flags['path'], codec),
+                                      1, deferred, flags.get('-typ'), flags.get('-op'))
+                    references.append(ref)
+                    if refNode: byNode[refNode] = ref
+                else:
+                    ref.deferred = deferred
+        return cls(references)
+
+
+_graphCache = {}
+
+
+def fileStamp(path):
+    st = os.stat(path)
+    return (st.st_mtime, st.st_size)
+
+
+def readReferenceGraph(path):
+    '''
+    Reference graph of a .ma file built from its header only.
+    Results are cached per file and refreshed when mtime or size change.
+    '''
+    path = os.path.abspath(path)
+    stamp = fileStamp(path)
+    cached = _graphCache.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    codec = headerCodec(path)
+    graph = HZReferenceGraph.fromStatements((st for _, st in iterHeader(path)), codec)
+    _graphCache[path] = (stamp, graph)
+    return graph
+
+
+def replaceFile(src, dst):
+    # os.replace is missing in python 2
+    try:
+        os.replace(src, dst)
+    except AttributeError:
+        if os.path.exists(dst): os.remove(dst)
+        os.rename(src, dst)
+
+
+def rewriteHeader(path, func):
+    '''
+    Rewrite header statements of a .ma file in place. `func` gets every header
+    statement and returns the new text (or None to keep it), the body of the
+    scene is copied as it is. Returns True if the file has been changed.
+    '''
+    header = []
+    end = None
+    for offset, st in iterStatements(path):
+        if not st.startswith('//') and st.split(None, 1)[0] in HEADER_END:
+            end = offset
+            break
+        header.append((offset, st))
+    with io.open(path, 'rb') as f:
+        text = (f.read(end) if end is not None else f.read()).decode('latin-1')
+    pieces = []
+    pos = 0
+    for offset, st in header:
+        new = func(st)
+        if new is None or new == st:
+            continue
+        pieces.append(text[pos:offset])
+        pieces.append(new)
+        pos = offset + len(st)
+    if not pieces:
+        return False
+    pieces.append(text[pos:])
+    tmp = path + '.tmp'
+    with io.open(path, 'rb') as src, io.open(tmp, 'wb') as dst:
+        dst.write(''.join(pieces).encode('latin-1'))
+        if end is not None:
+            src.seek(end)
+            while True:
+                block = src.read(1 << 20)
+                if not block: break
+                dst.write(block)
+    replaceFile(tmp, path)
+    _graphCache.pop(os.path.abspath(path), None)
+    return True
+
+
+def setDeferred(statement, deferred):
+    '''
+    Set the `-dr` (deferred, unloaded) flag of a `file` header statement.
+    '''
+    statement = _deferredRegex.sub('', statement, count=1)
+    if deferred:
+        statement = statement.replace('-rfn ', '-dr 1 -rfn ', 1)
+    return statement
+
+
+def setReferencePath(statement, path):
+    '''
+    Set the referenced path of a `file` header statement, it is the last word.
+    '''
+    body = statement.rstrip().rstrip(';').rstrip()
+    start = body.rfind(' "')
+    return '%s "%s";' % (body[:start], escape(path))
+
+
+def fixDeferredReferences(path):
+    '''
+    Remove `-dr 1` from the `file -rdi` lines, so nested references are
+    loaded again when the shot file is opened.
+    '''
+    def fix(st):
+        return setDeferred(st, False) if st.startswith('file -rdi') else None
+    return rewriteHeader(path, fix)
+
+
+def loadStateFix(states):
+    '''
+    Header fix (see rewriteHeader) that sets the load state of references,
+    `states` maps reference nodes to their deferred state.
+    '''
+    def fix(st):
+        if not st.startswith('file '):
+            return None
+        flags = parseFileCommand(st)
+        if not flags or flags.get('-rfn') not in states:
+            return None
+        return setDeferred(st, states[flags['-rfn']])
+    return fix
+
+
+def chainFixes(*fixes):
+    '''
+    One header fix made of several, applied in turn to every statement, so
+    they all cost a single rewrite of the file.
+    '''
+    def fix(st):
+        new = st
+        for func in fixes:
+            changed = func(new)
+            if changed is not None:
+                new = changed
+        return new if new != st else None
+    return fix
+
+
+def setReferenceLoadState(path, states):
+    '''
+    Write back the load state of references without opening the scene.
+    `states` maps reference nodes to their deferred state.
+    '''
+    return rewriteHeader(path, loadStateFix(states))
+
+
+def readPlaybackRange(path):
+    '''
+    Playback range stored by the sceneConfigurationScriptNode, (min, max)
+    or None if the scene has no such script node.
+    '''
+    def search(mm):
+        # the node is found with a plain byte search, only its own statements go through the regex
+        pos = mm.find(b'"%s"' % PLAYBACK_NODE)
+        if pos < 0:
+            return None
+        found = _playbackRegex.search(mm, pos, pos + PLAYBACK_WINDOW)
+        return found.groups() if found else None
+    found = searchFile(path, search)
+    if found:
+        return float(found[0]), float(found[1])
+    return None
+
+
+def _nodeName(plug):
+    return plug.split('.', 1)[0].lstrip('|').split('|')[-1]
+
+
+def scanAnimCurves(path, curveTypes=ANIMCURVE_TYPES):
+    '''
+    Stream the whole scene and collect key times of the anim curves stored in
+    it together with the node level connections of the scene.
+    Returns (curves, connections), curves maps curve names to their key times
+    and connections maps source nodes to the set of their destination nodes.
+    '''
+    curves = {}
+    connections = {}
+    current = None
+    for _, st in iterStatements(path):
+        if st.startswith('createNode'):
+            words = splitStatement(st)
+            current = None
+            if len(words) > 1 and words[1] in curveTypes and '-n' in words:
+                current = words[words.index('-n') + 1]
+                curves[current] = []
+        elif current is not None and '.ktv' in st and st.lstrip().startswith('setAttr'):
+            words = splitStatement(st)
+            for idx, word in enumerate(words):
+                if word.startswith('.ktv'):
+                    curves[current].extend(float(t) for t in words[idx + 1::2])
+                    break
+        elif st.startswith('connectAttr'):
+            words = [w for w in splitStatement(st)[1:] if not w.startswith('-')]
+            if len(words) >= 2:
+                connections.setdefault(_nodeName(words[0]), set()).add(_nodeName(words[1]))
+    return curves, connections
+
+
+def _referenceOfNode(node, graph, namespaces):
+    ref = graph.get(node)
+    if ref is not None:
+        return ref
+    if ':' in node:
+        ns = node.rsplit(':', 1)[0]
+        while ns:
+            if ns in namespaces:
+                return namespaces[ns]
+            ns = ns.rsplit(':', 1)[0] if ':' in ns else ''
+    return None
+
+
+def findAnimatedReferences(path, start=None, stop=None, maxHops=4):
+    '''
+    Reference nodes that own or are driven by anim curves with keys outside
+    of the start/stop range (the scene playback range by default). Curves are
+    followed downstream through the non referenced nodes of the scene (anim
+    layers, pair blends, unit conversions) up to the reference placeholders,
+    at most `maxHops` connections away.
+    Parents of those references are returned too, parents come first.
+    '''
+    if start is None or stop is None:
+        playback = readPlaybackRange(path)
+        if playback is None:
+            return None
+        start, stop = playback
+    graph = readReferenceGraph(path)
+    namespaces = dict((r.fullNamespace, r) for r in graph)
+    curves, connections = scanAnimCurves(path)
+    found = set()
+    for curve, times in curves.items():
+        if not any(t < start or t > stop for t in times):
+            continue
+        ref = _referenceOfNode(curve, graph, namespaces)
+        if ref is not None:
+            found.add(ref)
+            continue
+        visited = set([curve])
+        pending = [(curve, 0)]
+        while pending:
+            node, hops = pending.pop()
+            if hops >= maxHops:
+                continue
+            for dst in connections.get(node, ()):
+                if dst in visited:
+                    continue
+                visited.add(dst)
+                ref = _referenceOfNode(dst, graph, namespaces)
+                if ref is not None:
+                    found.add(ref)
+                else:
+                    pending.append((dst, hops + 1))
+    for ref in list(found):
+        found.update(ref.ancestors())
+    return [r.refNode for r in graph if r in found]
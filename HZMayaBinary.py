@@ -0,0 +1,266 @@
+# creation date : 19 October, 2026
+#
+# Description :
+#    Maya free reader/patcher for mayaBinary (.mb) scene files.
+#    .mb files are IFF files, a `FOR4` (32 bit) or `FOR8` (64 bit) form of
+#    type `Maya` holding chunks and groups of chunks (FORM, LIST, CAT). The
+#    reference records (FREF, FRDI) are found at any depth of that tree,
+#    their data is the argument list of the `file` command as NUL terminated
+#    strings (same words as the .ma header lines), so they can be patched
+#    here and the sizes of the chunk and of every group around it written
+#    back without opening Maya. fileInfo records (FINF) are key and value
+#    strings the same way.
+#
+
+import io, json, os, struct
+
+try:
+    from . import HZMayaAscii as MA
+except (ImportError, ValueError):
+    import HZMayaAscii as MA
+
+REFERENCE_TAGS = (b'FREF', b'FRDI')
+INFO_TAG = b'FINF'
+# chunks whose data is read with the tree
+DATA_TAGS = REFERENCE_TAGS + (INFO_TAG, )
+GROUP_TAGS = (b'FOR4', b'LIS4', b'CAT4', b'FOR8', b'LIS8', b'CAT8')
+
+
+class HZIffFormat(object):
+    def __init__(self, align, sizeFormat):
+        self.align = align
+        self.sizeFormat = sizeFormat
+        self.sizeBytes = struct.calcsize(sizeFormat)
+        # tags are padded to the alignment in 64 bit files
+        self.tagPad = align - 4
+
+    @property
+    def headerSize(self):
+        return 4 + self.tagPad + self.sizeBytes
+
+    def padded(self, size):
+        return (size + self.align - 1) // self.align * self.align
+
+    def readHeader(self, f):
+        tag = f.read(4)
+        if len(tag) < 4:
+            return None, 0
+        f.read(self.tagPad)
+        size = struct.unpack(self.sizeFormat, f.read(self.sizeBytes))[0]
+        return tag, size
+
+    def header(self, tag, size):
+        return tag + b'\0' * self.tagPad + struct.pack(self.sizeFormat, size)
+
+
+FORMATS = {b'FOR4': HZIffFormat(4, '>I'), b'FOR8': HZIffFormat(8, '>Q')}
+
+
+class HZChunk(object):
+    '''
+    Chunk of a Maya form, data is only read for reference and fileInfo records. Groups
+    (FORM, LIST, CAT) have a formType and their chunks in `children`.
+    '''
+    def __init__(self, tag, offset, size, total, data=None, formType=None, children=None):
+        self.tag = tag
+        self.offset = offset
+        self.size = size
+        self.total = total
+        self.data = data
+        self.formType = formType
+        self.children = children
+
+    def words(self):
+        return [w.decode('latin-1') for w in self.data.split(b'\0')[:-1]] if self.data else []
+
+
+def _readGroup(f, fmt, end):
+    chunks = []
+    while f.tell() + fmt.headerSize <= end:
+        offset = f.tell()
+        tag, size = fmt.readHeader(f)
+        if tag is None:
+            break
+        total = fmt.headerSize + fmt.padded(size)
+        if tag in GROUP_TAGS:
+            formType = f.read(4)
+            f.read(fmt.tagPad)
+            chunk = HZChunk(tag, offset, size, total, formType=formType,
+                            children=_readGroup(f, fmt, offset + fmt.headerSize + size))
+        else:
+            chunk = HZChunk(tag, offset, size, total, f.read(size) if tag in DATA_TAGS else None)
+        chunks.append(chunk)
+        f.seek(offset + total)
+    return chunks
+
+
+def readChunks(path):
+    '''
+    Returns (format, formType, chunks) of the root form of a mayaBinary file,
+    groups hold their own chunks.
+    '''
+    with io.open(path, 'rb') as f:
+        fmt = FORMATS.get(f.read(4))
+        if fmt is None:
+            raise ValueError("%s is not a mayaBinary file" % path)
+        f.seek(0)
+        tag, rootSize = fmt.readHeader(f)
+        formType = f.read(4)
+        f.read(fmt.tagPad)
+        chunks = _readGroup(f, fmt, fmt.headerSize + rootSize)
+    return fmt, formType, chunks
+
+
+def walkChunks(chunks):
+    # every chunk of the tree, in file order
+    for chunk in chunks:
+        yield chunk
+        if chunk.children is not None:
+            for child in walkChunks(chunk.children):
+                yield child
+
+
+def referenceChunks(chunks):
+    return [chunk for chunk in walkChunks(chunks) if chunk.tag in REFERENCE_TAGS]
+
+
+def _statement(words):
+    # build the `file` command of a reference record so the ascii parser can read it
+    return 'file ' + ' '.join(w if w.startswith('-') else '"%s"' % MA.escape(w) for w in words) + ';'
+
+
+def _words(statement):
+    return MA.splitStatement(statement)[1:]
+
+
+def isComplete(path):
+    '''
+    False when the file is shorter than its root form says, a save that has
+    not ended.
+    '''
+    with io.open(path, 'rb') as f:
+        fmt = FORMATS.get(f.read(4))
+        if fmt is None:
+            return False
+        f.seek(0)
+        header = f.read(fmt.headerSize)
+    if len(header) < fmt.headerSize:
+        return False
+    rootSize = struct.unpack(fmt.sizeFormat, header[4 + fmt.tagPad:])[0]
+    if os.path.getsize(path) < fmt.headerSize + rootSize:
+        return False
+    _, _, chunks = readChunks(path)
+    return not chunks or chunks[-1].offset + chunks[-1].total <= fmt.headerSize + fmt.padded(rootSize)
+
+
+def readFileInfo(path):
+    _, _, chunks = readChunks(path)
+    info = {}
+    for chunk in walkChunks(chunks):
+        if chunk.tag == INFO_TAG:
+            words = chunk.words()
+            if len(words) >= 2:
+                info[words[0]] = words[1]
+    return info
+
+
+def readShotsInfo(path):
+    '''
+    Shot list of the HZShotsInfoJson fileInfo, None when the file has none
+    (the shots on the data node can not be read from a .mb file).
+    '''
+    info = readFileInfo(path)
+    if MA.SHOTS_LEGACY_KEY not in info:
+        return None
+    try:
+        return json.loads(info[MA.SHOTS_LEGACY_KEY])
+    except ValueError:
+        return None
+
+
+def readReferenceGraph(path):
+    _, _, chunks = readChunks(path)
+    statements = [_statement(c.words()) for c in referenceChunks(chunks)]
+    return MA.HZReferenceGraph.fromStatements(statements)
+
+
+def _contentSize(fmt, chunk, changed):
+    # size written in the header of a chunk, groups grow with their changed chunks
+    if chunk.children is None:
+        return len(changed[chunk.offset]) if chunk.offset in changed else chunk.size
+    return 4 + fmt.tagPad + sum(fmt.headerSize + fmt.padded(_contentSize(fmt, child, changed)) for child in chunk.children)
+
+
+def _copy(src, dst, offset, count):
+    src.seek(offset)
+    while count:
+        block = src.read(min(count, 1 << 20))
+        if not block: break
+        dst.write(block)
+        count -= len(block)
+
+
+def _writeChunks(src, dst, fmt, chunks, changed, dirty):
+    for chunk in chunks:
+        if chunk.offset not in dirty:
+            _copy(src, dst, chunk.offset, chunk.total)
+        elif chunk.children is not None:
+            dst.write(fmt.header(chunk.tag, _contentSize(fmt, chunk, changed)) + chunk.formType + b'\0' * fmt.tagPad)
+            _writeChunks(src, dst, fmt, chunk.children, changed, dirty)
+        else:
+            data = changed[chunk.offset]
+            dst.write(fmt.header(chunk.tag, len(data)) + data + b'\0' * (fmt.padded(len(data)) - len(data)))
+
+
+def _dirtyGroups(chunks, changed, dirty):
+    # offsets of the changed chunks and of every group that holds one
+    found = False
+    for chunk in chunks:
+        if chunk.offset in changed or (chunk.children is not None and _dirtyGroups(chunk.children, changed, dirty)):
+            dirty.add(chunk.offset)
+            found = True
+    return found
+
+
+def rewriteReferences(path, func):
+    '''
+    Rewrite the reference records of a .mb file in place. `func` gets the
+    `file` statement of every record and returns the new statement (or None
+    to keep it). Chunk sizes and the size of the root form are recomputed,
+    every other chunk is copied as it is. Returns True if the file has been
+    changed.
+    '''
+    fmt, formType, chunks = readChunks(path)
+    changed = {}
+    for chunk in referenceChunks(chunks):
+        statement = _statement(chunk.words())
+        new = func(statement)
+        if new is None or new == statement:
+            continue
+        changed[chunk.offset] = b''.join(w.encode('latin-1') + b'\0' for w in _words(new))
+    if not changed:
+        return False
+    dirty = set()
+    _dirtyGroups(chunks, changed, dirty)
+    rootSize = 4 + fmt.tagPad + sum(fmt.headerSize + fmt.padded(_contentSize(fmt, chunk, changed)) for chunk in chunks)
+    tmp = path + '.tmp'
+    with io.open(path, 'rb') as src, io.open(tmp, 'wb') as dst:
+        rootTag = src.read(4)
+        dst.write(fmt.header(rootTag, rootSize) + formType + b'\0' * fmt.tagPad)
+        _writeChunks(src, dst, fmt, chunks, changed, dirty)
+    MA.replaceFile(tmp, path)
+    return True
+
+
+def fixDeferredReferences(path):
+    '''
+    Binary version of the `-dr 1` clean up of `file -rdi` lines, so nested
+    references are loaded again when the shot file is opened.
+    '''
+    def fix(st):
+        return MA.setDeferred(st, False) if '-rdi' in _words(st) else None
+    return rewriteReferences(path, fix)
+
+
+def setReferenceLoadState(path, states):
+    return rewriteReferences(path, MA.loadStateFix(states))
@@ -0,0 +1,179 @@
+# creation date : 19 October, 2026
+#
+# Description :
+#    One progress and cancellation API for the long operations of the shot
+#    manager. A progress is split in weighted stages that can be nested,
+#    their advance rolls up into one bar. The UI (Maya progressWindow, or
+#    HZJobRunner progress events in batch mode) is only updated every
+#    `interval` seconds, so many small steps do not spend their time in UI
+#    calls. Cancellation is cooperative: code calls `check()` where it is
+#    safe to stop, and rollbacks registered since the last `commit()` run
+#    when the operation is cancelled.
+#
+#    with HZProgress('Export Shots', total=2) as pr:
+#        with pr.stage('Set Keyframes', weight=1, total=len(shots)) as st:
+#            for sh in shots:
+#                pr.check()
+#                ...
+#                st.step()
+#
+
+import sys, time
+
+try:
+    from maya import cmds as MC
+except ImportError:
+    MC = None
+
+try:
+    from . import HZJobRunner as JOB
+except (ImportError, ValueError):
+    import HZJobRunner as JOB
+
+
+class HZCancelled(Exception):
+    pass
+
+
+class HZCancelToken(object):
+    '''
+    Cooperative cancellation flag, can be shared with other threads.
+    '''
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def check(self):
+        if self.cancelled:
+            raise HZCancelled()
+
+
+def isHeadless():
+    return MC is None or MC.about(batch=True)
+
+
+class HZStage(object):
+    def __init__(self, progress, parent, name, weight, total):
+        self.progress = progress
+        self.parent = parent
+        self.name = name
+        self.weight = float(weight)
+        self.total = float(total or 1)
+        self.done = 0.0
+
+    def __enter__(self):
+        self.progress._stages.append(self)
+        self.progress.status = ''
+        self.progress.update(force=True)
+        return self
+
+    def __exit__(self, excType, excValue, tb):
+        self.progress._stages.remove(self)
+        if excType is None and self.parent is not None:
+            self.parent.done = min(self.parent.total, self.parent.done + self.weight)
+            self.progress.update()
+
+    def step(self, amount=1, status=None):
+        self.done = min(self.total, self.done + amount)
+        self.progress.update(status)
+
+    def stage(self, name, weight=1, total=None):
+        return HZStage(self.progress, self, name, weight, total)
+
+    def fraction(self):
+        # own advance plus the part of the running child stage
+        done = self.done
+        stages = self.progress._stages
+        idx = stages.index(self) if self in stages else -1
+        if 0 <= idx < len(stages) - 1:
+            child = stages[idx + 1]
+            done += child.weight * child.fraction()
+        return min(1.0, done / self.total)
+
+
+class HZProgress(HZStage):
+    '''
+    Root stage, owns the progress display and the cancel token.
+    '''
+    def __init__(self, title, total=None, interval=0.1, interruptable=True, token=None, headless=None):
+        HZStage.__init__(self, self, None, title, 1, total)
+        self.title = title
+        self.headless = isHeadless() if headless is None else headless
+        # batch logs do not need more than one line a second
+        self.interval = max(interval, 1.0) if self.headless else interval
+        self.interruptable = interruptable
+        self.token = token or HZCancelToken()
+        self.status = ''
+        self._stages = []
+        self._rollbacks = []
+        self._last = 0.0
+        self._window = False
+
+    def __enter__(self):
+        if not self.headless:
+            MC.progressWindow(title=self.title, progress=0, maxValue=1000, status=self.title,
+                              isInterruptable=self.interruptable)
+            self._window = True
+        return HZStage.__enter__(self)
+
+    def __exit__(self, excType, excValue, tb):
+        HZStage.__exit__(self, excType, excValue, tb)
+        if self._window:
+            MC.progressWindow(endProgress=1)
+            self._window = False
+        if excType is not None and issubclass(excType, HZCancelled):
+            self.rollback()
+            sys.stdout.write('%s cancelled.\n' % self.title)
+            return True
+        if excType is None and self.headless:
+            JOB.emit(stage=self.title, progress=1.0)
+        return False
+
+    @property
+    def cancelled(self):
+        return self.token.cancelled
+
+    def current(self):
+        return self._stages[-1] if self._stages else self
+
+    def update(self, status=None, force=False):
+        if status is not None:
+            self.status = status
+        now = time.time()
+        if not force and now - self._last < self.interval:
+            return
+        self._last = now
+        fraction = self.fraction()
+        label = self.status or self.current().name
+        if self.headless:
+            JOB.emit(stage=label, progress=round(fraction, 3))
+            return
+        if not self._window:
+            return
+        MC.progressWindow(edit=True, progress=int(fraction * 1000), status='%s: %d%%' % (label, fraction * 100))
+        if self.interruptable and MC.progressWindow(query=True, isCancelled=True):
+            self.token.cancel()
+
+    def check(self):
+        '''
+        Safe point to stop at, raises HZCancelled if the user has cancelled.
+        '''
+        self.update()
+        self.token.check()
+
+    def onCancel(self, func, *args):
+        '''
+        Register an undo action for the work done since the last commit.
+        '''
+        self._rollbacks.append((func, args))
+
+    def commit(self):
+        # what has been done so far is kept even if the operation is cancelled later
+        self._rollbacks = []
+
+    def rollback(self):
+        while self._rollbacks:
+            func, args = self._rollbacks.pop()
+            func(*args)
@@ -0,0 +1,221 @@
+# creation date : 19 October, 2026
+#
+# Description :
+#    Local disk cache of referenced files for batch workers. Rigs and sets
+#    live on the network share and every shot opens the same ones, a worker
+#    copies each of them once to the cache and loads the local copy after.
+#    Copies are checked against the source mtime and size (and their sha1
+#    with `verify`), the cache is kept under `maxSize` by removing the least
+#    recently used files.
+#    While `remap()` is active, references are redirected to the cached
+#    copies by a Maya callback before they load. Saved scenes would keep the
+#    cached paths, `restorePaths` puts the original paths back in the header
+#    (`pathFix` gives the header fix, to chain with other header fixes).
+#
+#    The cache folder is HZ_REF_CACHE (~/HZRefCache by default, 'off' turns
+#    it off), its size HZ_REF_CACHE_GB gigabytes.
+#
+
+import hashlib, io, json, os, time
+
+try:
+    from . import HZMayaAscii as MA, HZMayaBinary as MB
+except (ImportError, ValueError):
+    import HZMayaAscii as MA, HZMayaBinary as MB
+
+DEFAULT_ROOT = os.path.join(os.path.expanduser('~'), 'HZRefCache')
+DEFAULT_SIZE_GB = 20
+META_NAME = 'meta.json'
+
+
+def _normPath(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+class HZRefCache(object):
+    def __init__(self, root=DEFAULT_ROOT, maxSize=DEFAULT_SIZE_GB << 30, verify=False):
+        self.root = root
+        self.files = os.path.join(root, 'files')
+        self.maxSize = maxSize
+        self.verify = verify
+        self._verified = set()
+        self._callback = None
+        if not os.path.isdir(self.files): os.makedirs(self.files)
+
+    @classmethod
+    def fromEnv(cls):
+        '''
+        Cache set up from the environment, None when it is turned off.
+        '''
+        root = os.environ.get('HZ_REF_CACHE', DEFAULT_ROOT)
+        if not root or root.lower() == 'off':
+            return None
+        return cls(root, int(float(os.environ.get('HZ_REF_CACHE_GB', DEFAULT_SIZE_GB)) * (1 << 30)))
+
+    def _entry(self, src):
+        return os.path.join(self.files, hashlib.sha1(_normPath(src).encode('utf-8')).hexdigest()[:16])
+
+    def _readMeta(self, entry):
+        try:
+            with open(os.path.join(entry, META_NAME)) as f:
+                return json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+
+    def contains(self, path):
+        return _normPath(path).startswith(_normPath(self.files) + os.sep)
+
+    def source(self, path):
+        '''
+        Original path of a cached copy, other paths are returned as they are.
+        '''
+        if not self.contains(path):
+            return path
+        meta = self._readMeta(os.path.dirname(path))
+        return meta['src'] if meta else path
+
+    def get(self, src):
+        '''
+        Path of the local copy of src, copied or refreshed when needed. src is
+        returned when it can not be cached.
+        '''
+        try:
+            st = os.stat(src)
+        except OSError:
+            return src
+        if st.st_size > self.maxSize:
+            return src
+        entry = self._entry(src)
+        meta = self._readMeta(entry)
+        cached = os.path.join(entry, os.path.basename(src))
+        if (meta is None or meta['mtime'] != st.st_mtime or meta['size'] != st.st_size
+                or not os.path.isfile(cached) or not self._check(cached, meta)):
+            try:
+                meta = self._copy(src, entry, cached, st)
+            except (IOError, OSError):
+                return src
+            self.evict(keep=(entry, ))
+        else:
+            # the meta file time is the last use of the entry
+            os.utime(os.path.join(entry, META_NAME), None)
+        return cached
+
+    def _check(self, cached, meta):
+        if not self.verify or cached in self._verified:
+            return True
+        sha = hashlib.sha1()
+        with io.open(cached, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                sha.update(block)
+        if sha.hexdigest() != meta['sha1']:
+            return False
+        self._verified.add(cached)
+        return True
+
+    def _copy(self, src, entry, cached, st):
+        if not os.path.isdir(entry): os.makedirs(entry)
+        tmp = '%s.%d.tmp' % (cached, os.getpid())
+        sha = hashlib.sha1()
+        with io.open(src, 'rb') as fsrc, io.open(tmp, 'wb') as fdst:
+            for block in iter(lambda: fsrc.read(1 << 20), b''):
+                sha.update(block)
+                fdst.write(block)
+        # other workers may use the copy, both files are replaced in one move each
+        MA.replaceFile(tmp, cached)
+        meta = {'src': os.path.abspath(src), 'mtime': st.st_mtime, 'size': st.st_size, 'sha1': sha.hexdigest(),
+                'copied': time.time()}
+        with open(tmp, 'w') as f:
+            json.dump(meta, f)
+        MA.replaceFile(tmp, os.path.join(entry, META_NAME))
+        self._verified.add(cached)
+        return meta
+
+    def entries(self):
+        '''
+        (last use, size, entry folder) of every cached file.
+        '''
+        result = []
+        for name in os.listdir(self.files):
+            entry = os.path.join(self.files, name)
+            metaPath = os.path.join(entry, META_NAME)
+            meta = self._readMeta(entry)
+            if meta is None:
+                continue
+            result.append((os.path.getmtime(metaPath), meta['size'], entry))
+        return result
+
+    def evict(self, keep=()):
+        '''
+        Remove least recently used files until the cache fits in maxSize,
+        returns the number of removed entries.
+        '''
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, entry in entries:
+            if total <= self.maxSize:
+                break
+            if entry in keep:
+                continue
+            try:
+                for name in os.listdir(entry):
+                    os.remove(os.path.join(entry, name))
+                os.rmdir(entry)
+            except OSError:
+                # still open by another worker on Windows, it goes next time
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def _beforeLoad(self, fileObject, clientData=None):
+        path = fileObject.resolvedFullName() or fileObject.rawFullName()
+        cached = self.get(self.source(path))
+        if cached != path:
+            fileObject.setRawFullName(cached.replace('\\', '/'))
+        return True
+
+    def remap(self):
+        '''
+        Load references from the cache until `unmap` is called.
+        '''
+        from maya.api import OpenMaya as OM2
+        if self._callback is None:
+            self._callback = OM2.MSceneMessage.addCheckFileCallback(OM2.MSceneMessage.kBeforeLoadReferenceCheck,
+                                                                   self._beforeLoad)
+        return self
+
+    def unmap(self):
+        from maya.api import OpenMaya as OM2
+        if self._callback is not None:
+            OM2.MMessage.removeCallback(self._callback)
+            self._callback = None
+
+    def __enter__(self):
+        return self.remap()
+
+    def __exit__(self, excType, excValue, tb):
+        self.unmap()
+        return False
+
+    def pathFix(self, graph):
+        '''
+        Header fix that puts back the original reference paths of `graph`
+        (the reference graph read before the scene was opened).
+        '''
+        originals = dict((ref.refNode, ref.path) for ref in graph)
+        def fix(st):
+            flags = MA.parseFileCommand(st)
+            if not flags or flags.get('-rfn') not in originals or not self.contains(flags['path']):
+                return None
+            return MA.setReferencePath(st, originals[flags['-rfn']])
+        return fix
+
+    def restorePaths(self, path, graph):
+        '''
+        Put back the original reference paths of `graph` in the header of a
+        saved scene.
+        '''
+        if path.lower().endswith('.mb'):
+            return MB.rewriteReferences(path, self.pathFix(graph))
+        return MA.rewriteHeader(path, self.pathFix(graph))
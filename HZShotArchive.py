@@ -0,0 +1,397 @@
+# creation date : 19 October, 2026
+#
+# Description :
+#    Deduplicated archive of shot file versions. Files are cut in content
+#    defined chunks and every distinct chunk is stored once, zlib compressed,
+#    in objects/<sha1[:2]>/<sha1[2:]>. A json manifest per archived file lists
+#    its chunks, so any version is rebuilt byte for byte on demand. Shots of
+#    one episode and versions of one shot share headers, references and most
+#    node definitions, those are stored only once.
+#    Chunk boundaries are taken at line ends whose crc32 matches a mask, so
+#    an edit only changes the chunks around it. Binary files have long lines,
+#    those are cut at CHUNK_MAX.
+#    Adding a file and deleting unused chunks hold the store lock file, so a
+#    prune never deletes a chunk an add found already stored.
+#
+#    usage: python HZShotArchive.py add P:/show/EP012/SHOTS
+#           python HZShotArchive.py add --remove --keep-latest P:/show/EP012/SHOTS
+#           python HZShotArchive.py --store P:/show/EP012/SHOTS/ARCHIVE restore EP012_SH010_ANI_v002.ma
+#           python HZShotArchive.py prune --keep 3 --days 90   (from P:/show/EP012 or its SHOTS folder)
+#           python HZShotArchive.py report
+#
+
+import argparse, contextlib, errno, hashlib, io, json, os, re, sys, time, zlib
+
+try:
+    from . import HZMayaAscii as MA
+except (ImportError, ValueError):
+    import HZMayaAscii as MA
+
+ARCHIVE_DIR = 'ARCHIVE'
+CHUNK_MIN = 16 << 10
+CHUNK_MAX = 1 << 20
+# one line end in 1024 is a boundary, about 50KB chunks for mayaAscii lines
+BOUNDARY_MASK = 0x3ff
+COMPRESSION = 6
+# a lock file left by a crashed process is taken over once it is that old
+LOCK_STALE = 600
+LOCK_TIMEOUT = 3600
+
+_versionRegex = re.compile(r"_+v(\d+)(?=\.m[ab]$)", re.I)
+
+
+def archiveDir(shotsDir):
+    return os.path.join(shotsDir, ARCHIVE_DIR)
+
+
+def defaultStore(folder=None):
+    '''
+    Archive of the SHOTS folder `folder` (the current one by default) is or
+    holds, None when there is none.
+    '''
+    folder = os.path.abspath(folder or os.getcwd())
+    for shotsDir in (folder, os.path.join(folder, 'SHOTS')):
+        if os.path.isdir(archiveDir(shotsDir)):
+            return archiveDir(shotsDir)
+    return None
+
+
+def iterChunks(path):
+    '''
+    Stream the content defined chunks of a file.
+    '''
+    with io.open(path, 'rb') as f:
+        buf = []
+        size = 0
+        for line in f:
+            while size + len(line) > CHUNK_MAX:
+                cut = CHUNK_MAX - size
+                buf.append(line[:cut])
+                yield b''.join(buf)
+                buf, size, line = [], 0, line[cut:]
+            buf.append(line)
+            size += len(line)
+            if size >= CHUNK_MIN and zlib.crc32(line) & BOUNDARY_MASK == BOUNDARY_MASK:
+                yield b''.join(buf)
+                buf, size = [], 0
+        if buf:
+            yield b''.join(buf)
+
+
+def versionKey(name):
+    '''
+    (shot, version) of a file name, versions of one shot share the same shot.
+    '''
+    found = _versionRegex.search(name)
+    if not found:
+        return name, 0
+    return name[:found.start()] + name[found.end():], int(found.group(1))
+
+
+def _writeAtomic(path, data):
+    tmp = '%s.%d.tmp' % (path, os.getpid())
+    with io.open(tmp, 'wb') as f:
+        f.write(data)
+    MA.replaceFile(tmp, path)
+
+
+class HZShotArchive(object):
+    def __init__(self, root):
+        self.root = root
+        self.objects = os.path.join(root, 'objects')
+        self.manifests = os.path.join(root, 'manifests')
+        for folder in (self.objects, self.manifests):
+            if not os.path.isdir(folder): os.makedirs(folder)
+
+    def _objectPath(self, digest):
+        return os.path.join(self.objects, digest[:2], digest[2:])
+
+    def _manifestPath(self, name):
+        return os.path.join(self.manifests, name + '.json')
+
+    @contextlib.contextmanager
+    def locked(self, timeout=LOCK_TIMEOUT):
+        '''
+        Hold the store lock file, waits for other processes to release it.
+        '''
+        path = os.path.join(self.root, 'lock')
+        started = time.time()
+        while True:
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except OSError as e:
+                if e.errno != errno.EEXIST:
+                    raise
+            try:
+                if time.time() - os.path.getmtime(path) > LOCK_STALE:
+                    os.remove(path)
+                    continue
+            except OSError:
+                continue
+            if time.time() - started > timeout:
+                raise IOError('the archive %s is locked by another process' % self.root)
+            time.sleep(0.2)
+        try:
+            os.write(fd, ('%d\n' % os.getpid()).encode('ascii'))
+            os.close(fd)
+            yield path
+        finally:
+            try: os.remove(path)
+            except OSError: pass
+
+    def names(self):
+        return sorted(fl[:-5] for fl in os.listdir(self.manifests) if fl.endswith('.json'))
+
+    def manifest(self, name):
+        path = self._manifestPath(name)
+        if not os.path.isfile(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def isArchived(self, path):
+        manifest = self.manifest(os.path.basename(path))
+        if manifest is None:
+            return False
+        st = os.stat(path)
+        return manifest['size'] == st.st_size and manifest['mtime'] == st.st_mtime
+
+    def add(self, path):
+        '''
+        Archive one file, returns its manifest and the bytes of new chunks.
+        '''
+        with self.locked() as lock:
+            return self._add(path, lock)
+
+    def _add(self, path, lock):
+        sha = hashlib.sha1()
+        chunks = []
+        added = 0
+        for chunk in iterChunks(path):
+            sha.update(chunk)
+            digest = hashlib.sha1(chunk).hexdigest()
+            chunks.append([digest, len(chunk)])
+            obj = self._objectPath(digest)
+            if os.path.isfile(obj):
+                continue
+            if not os.path.isdir(os.path.dirname(obj)): os.makedirs(os.path.dirname(obj))
+            _writeAtomic(obj, zlib.compress(chunk, COMPRESSION))
+            added += len(chunk)
+            # long adds keep the lock from looking stale
+            os.utime(lock, None)
+        st = os.stat(path)
+        manifest = {'name': os.path.basename(path), 'source': os.path.abspath(path), 'size': st.st_size,
+                    'mtime': st.st_mtime, 'sha1': sha.hexdigest(), 'archived': time.time(), 'chunks': chunks}
+        _writeAtomic(self._manifestPath(manifest['name']), json.dumps(manifest, indent=1).encode('utf-8'))
+        return manifest, added
+
+    def restore(self, name, dest=None):
+        '''
+        Rebuild an archived file, at its original path by default.
+        '''
+        manifest = self.manifest(name)
+        if manifest is None:
+            raise IOError('%s is not in the archive %s' % (name, self.root))
+        dest = dest or manifest['source']
+        if os.path.isdir(dest):
+            dest = os.path.join(dest, name)
+        sha = hashlib.sha1()
+        tmp = '%s.%d.tmp' % (dest, os.getpid())
+        with io.open(tmp, 'wb') as f:
+            for digest, size in manifest['chunks']:
+                with io.open(self._objectPath(digest), 'rb') as obj:
+                    chunk = zlib.decompress(obj.read())
+                sha.update(chunk)
+                f.write(chunk)
+        if sha.hexdigest() != manifest['sha1']:
+            os.remove(tmp)
+            raise IOError('%s is corrupted in the archive %s' % (name, self.root))
+        MA.replaceFile(tmp, dest)
+        os.utime(dest, (manifest['mtime'], manifest['mtime']))
+        return dest
+
+    def remove(self, name):
+        path = self._manifestPath(name)
+        if os.path.isfile(path): os.remove(path)
+
+    def prune(self, keep=None, days=None):
+        '''
+        Forget old versions: only the `keep` latest versions of every shot and
+        the versions archived in the last `days` are kept, the latest version
+        of a shot always is. Chunks nobody uses anymore are deleted.
+        Returns (removed names, deleted chunk count, deleted bytes).
+        '''
+        shots = {}
+        for name in self.names():
+            shot, version = versionKey(name)
+            shots.setdefault(shot, []).append((version, name))
+        limit = time.time() - days * 86400 if days is not None else None
+        removed = []
+        for versions in shots.values():
+            versions.sort(reverse=True)
+            for rank, (version, name) in enumerate(versions):
+                if rank == 0 or (keep is None and limit is None):
+                    continue
+                if keep is not None and rank < keep:
+                    continue
+                if limit is not None and self.manifest(name)['archived'] >= limit:
+                    continue
+                self.remove(name)
+                removed.append(name)
+        count, size = self.collect()
+        return removed, count, size
+
+    def collect(self):
+        '''
+        Delete the chunks no manifest refers to, returns (count, bytes).
+        '''
+        with self.locked():
+            return self._collect()
+
+    def _collect(self):
+        used = set()
+        for name in self.names():
+            used.update(digest for digest, size in self.manifest(name)['chunks'])
+        count = size = 0
+        for prefix in os.listdir(self.objects):
+            folder = os.path.join(self.objects, prefix)
+            for rest in os.listdir(folder):
+                if prefix + rest in used or rest.endswith('.tmp'):
+                    continue
+                path = os.path.join(folder, rest)
+                size += os.path.getsize(path)
+                os.remove(path)
+                count += 1
+        return count, size
+
+    def report(self):
+        '''
+        Sizes of the archived files, of their distinct chunks and on disk.
+        'dedup' is what sharing chunks saves (files / distinct chunks),
+        'compression' what zlib saves (distinct chunks / disk) and 'ratio'
+        both (files / disk).
+        '''
+        files = logical = 0
+        chunks = {}
+        for name in self.names():
+            manifest = self.manifest(name)
+            files += 1
+            logical += manifest['size']
+            chunks.update((digest, size) for digest, size in manifest['chunks'])
+        stored = 0
+        for prefix in os.listdir(self.objects):
+            folder = os.path.join(self.objects, prefix)
+            stored += sum(os.path.getsize(os.path.join(folder, rest)) for rest in os.listdir(folder))
+        unique = sum(chunks.values())
+        return {'files': files, 'logical': logical, 'unique': unique, 'chunks': len(chunks),
+                'stored': stored, 'dedup': float(logical) / unique if unique else 0.0,
+                'compression': float(unique) / stored if stored else 0.0,
+                'ratio': float(logical) / stored if stored else 0.0}
+
+
+def sceneFiles(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, fl) for fl in sorted(os.listdir(path))
+                         if fl.lower().endswith(('.ma', '.mb')))
+        else:
+            files.append(path)
+    return files
+
+
+def latestVersions(paths):
+    '''
+    Paths of the latest version of every shot among `paths`.
+    '''
+    latest = {}
+    for path in paths:
+        shot, version = versionKey(os.path.basename(path))
+        key = (os.path.dirname(os.path.abspath(path)), shot)
+        if key not in latest or version > latest[key][0]:
+            latest[key] = (version, path)
+    return set(path for version, path in latest.values())
+
+
+def _size(count):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if count < 1024 or unit == 'GB':
+            return '%.1f%s' % (count, unit)
+        count /= 1024.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Deduplicated archive of shot file versions.')
+    parser.add_argument('--store', help='archive folder, SHOTS/%s of the files added or of the current folder '
+                                        'by default' % ARCHIVE_DIR)
+    commands = parser.add_subparsers(dest='command')
+    add = commands.add_parser('add', help='archive shot files or SHOTS folders')
+    add.add_argument('paths', nargs='+')
+    add.add_argument('--remove', action='store_true', help='delete the files once they are archived and checked')
+    add.add_argument('--keep-latest', action='store_true', help='with --remove, keep the latest version of every shot')
+    restore = commands.add_parser('restore', help='rebuild archived files')
+    restore.add_argument('names', nargs='+')
+    restore.add_argument('-o', '--output', help='folder to rebuild in, the original folder by default')
+    prune = commands.add_parser('prune', help='forget old versions')
+    prune.add_argument('--keep', type=int, help='versions kept for every shot')
+    prune.add_argument('--days', type=float, help='versions archived in the last days are kept')
+    commands.add_parser('list', help='archived files')
+    commands.add_parser('report', help='deduplication ratio')
+    args = parser.parse_args(argv)
+
+    if args.command is None:
+        parser.print_help()
+        return 1
+    store = args.store
+    if store is None and args.command == 'add':
+        first = args.paths[0]
+        store = archiveDir(first if os.path.isdir(first) else os.path.dirname(os.path.abspath(first)))
+    elif store is None:
+        store = defaultStore()
+        if store is None:
+            sys.stderr.write('no SHOTS/%s in %s, --store is needed for %s\n' % (ARCHIVE_DIR, os.getcwd(), args.command))
+            return 1
+    archive = HZShotArchive(store)
+    if args.command == 'add':
+        started = time.time()
+        total = added = freed = 0
+        files = sceneFiles(args.paths)
+        kept = latestVersions(files) if args.keep_latest else set()
+        for path in files:
+            if archive.isArchived(path):
+                manifest = archive.manifest(os.path.basename(path))
+            else:
+                manifest, new = archive.add(path)
+                total += manifest['size']
+                added += new
+                print('%s %s, %s new' % (manifest['name'], _size(manifest['size']), _size(new)))
+            if args.remove and path not in kept:
+                # the file only goes once it can be rebuilt from the archive
+                check = archive.restore(manifest['name'], os.path.join(archive.root, 'check.tmp'))
+                os.remove(check)
+                os.remove(path)
+                freed += manifest['size']
+        print('%s archived, %s new data, %s removed in %.1fs' % (_size(total), _size(added), _size(freed),
+                                                                time.time() - started))
+    elif args.command == 'restore':
+        for name in args.names:
+            print(archive.restore(name, args.output))
+    elif args.command == 'prune':
+        removed, count, size = archive.prune(args.keep, args.days)
+        for name in removed:
+            print('removed %s' % name)
+        print('%d version(s) removed, %d chunk(s) deleted, %s freed' % (len(removed), count, _size(size)))
+    elif args.command == 'list':
+        for name in archive.names():
+            print(name)
+    elif args.command == 'report':
+        rep = archive.report()
+        print('%d files, %s in files, %s in %d distinct chunks, %s on disk' % (
+            rep['files'], _size(rep['logical']), _size(rep['unique']), rep['chunks'], _size(rep['stored'])))
+        print('deduplication %.1fx, compression %.1fx, total %.1fx' % (rep['dedup'], rep['compression'], rep['ratio']))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
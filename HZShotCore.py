@@ -0,0 +1,141 @@
+# creation date : 19 October, 2026
+#
+# Description :
+#    Core shot logic of the shot manager, in plain Python: shot ranges from
+#    frame lengths, export time shifts, shot file names and data, range
+#    checks. It imports neither Maya nor a UI toolkit, so batch workers and
+#    command line tools can use it on machines without a display.
+#    `lazyImport` gives modules that are only imported when first used, the
+#    shot manager loads its Maya and UI layers with it.
+#
+
+import importlib, os, re
+
+_masterRegex = re.compile(r"^(EP\d+)\D.*(_v\d+)\D*.*$")
+_lengthRegex = re.compile(r"\s\d\d\d?\s")
+
+# bookmark colors, given to shots in turn
+SHOT_COLORS = ("ff4000", "ffbf00", "40ff00", "00bfff", "0040ff", "4000ff", "bf00ff", "ff0040")
+
+
+class HZLazyModule(object):
+    '''
+    Stand-in for a module, the module is imported on first attribute access.
+    '''
+    def __init__(self, name, package=None):
+        self.__dict__['_name'] = name
+        self.__dict__['_package'] = package
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            name, package = self.__dict__['_name'], self.__dict__['_package']
+            module = importlib.import_module('%s.%s' % (package, name) if package else name)
+            self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        return '<lazy module %r%s>' % (self.__dict__['_name'], '' if self.__dict__['_module'] is None else ' (loaded)')
+
+
+def lazyImport(name, package=None):
+    return HZLazyModule(name, package or None)
+
+
+def hex2rgb(hex):
+    if not hex: return [0,0,0]
+    hex = hex.upper().split("#")[-1]
+    lh = len(hex)
+    if lh==3:  hex = iter(''.join([str(x) * 2 for x in hex]))
+    elif lh<3:
+        hex = iter((hex * 6)[:6])
+    else: hex = iter(hex.ljust(6,'F')[:6])
+    return [round(float(int("%s%s"%(a,b),16))/255, 2) for a,b in zip(hex,hex)]
+
+
+def extractNumbers(tex):
+    '''
+    Shot lengths pasted from the scene list, numbers of 2 or 3 digits.
+    '''
+    tex = tex.replace('.0 ', ' ')
+    return [int(f) for f in _lengthRegex.findall(tex)]
+
+
+def shotFrames(frameLens, startOffset=0):
+    '''
+    (start, stop) of consecutive shots of the given lengths.
+    '''
+    frames = []
+    for length in frameLens:
+        start = frames[-1][1] + 1 if frames else startOffset + 1
+        frames.append((start, start + length - 1))
+    return frames
+
+
+def shotName(idx, startShotNum=1):
+    return "SH0T_%03d" % ((idx+startShotNum)*10,)
+
+
+def shotColor(idx):
+    return hex2rgb(SHOT_COLORS[idx % len(SHOT_COLORS)])
+
+
+def shotTimeShifts(shotsInfo, startOffset):
+    # accumulated time change that brings every shot to startOffset+1, shots are exported in order
+    shifts = []
+    for idx, sh in enumerate(shotsInfo):
+        if idx==0: shifts.append(startOffset+1-sh['start'])
+        else: shifts.append(shifts[-1] + (shotsInfo[idx-1]['start']-shotsInfo[idx-1]['stop'])-1)
+    return shifts
+
+
+def shotFileInfo(sh, startOffset=None):
+    '''
+    Shot data as it is stored in its shot file, moved to startOffset+1 unless
+    startOffset is None.
+    '''
+    if startOffset is None:
+        return {'name':sh['name'], 'color':sh['color'], 'start':sh['start'], 'stop':sh['stop']}
+    return {'name':sh['name'], 'color':sh['color'], 'start':startOffset+1, 'stop':startOffset+1+(sh['stop']-sh['start'])}
+
+
+def masterParts(scene_name):
+    '''
+    (episode, version) of a master scene name, as EP012 and _v003, None when
+    the name is not a master name.
+    '''
+    name_matches = _masterRegex.search(scene_name)
+    return name_matches.groups() if name_matches else None
+
+
+def shotFileName(shotsDir, scene_name, sh, shotExt='ma'):
+    '''
+    Path of the file a shot of the master `scene_name` is exported to.
+    '''
+    epName, verName = masterParts(scene_name) or ("EP000", "v001")
+    shName = "SH" + (str(sh['name']).split('_')[1])
+    return os.path.abspath(os.path.join(shotsDir, "%s_%s_ANI_%s.%s" % (epName, shName, verName, shotExt)))
+
+
+def shotIssues(shots):
+    '''
+    {row: (level, message)} of the shots with a wrong range, that overlap an
+    earlier shot or leave a gap after it, shots are compared in time order.
+    '''
+    issues = {}
+    last = None
+    for row in sorted(range(len(shots)), key=lambda r: (shots[r]['start'], shots[r]['stop'])):
+        sh = shots[row]
+        if sh['stop'] < sh['start']:
+            issues[row] = ('error', 'Stop frame is before start frame')
+        elif last is not None and sh['start'] <= last['stop']:
+            issues[row] = ('error', 'Overlaps %s (%d-%d)' % (last['name'], last['start'], last['stop']))
+        elif last is not None and sh['start'] > last['stop'] + 1:
+            issues[row] = ('warning', 'Gap of %d frame(s) after %s' % (sh['start'] - last['stop'] - 1, last['name']))
+        if last is None or sh['stop'] > last['stop']:
+            last = sh
+    return issues
@@ -0,0 +1,180 @@
+# creation date : 19 October, 2026
+#
+# Description :
+#    Shot data storage on a dedicated network node.
+#    Every shot is one element of the `shots` compound multi attribute of the
+#    node (shotName, shotStart, shotStop, shotColor), so one shot can be read
+#    or edited alone and every edit goes through Maya's undo queue. The
+#    fileInfo `HZShotsDataSchema` tells readers (HZMayaAscii.readShotsInfo
+#    too) that the data lives on the node. Scenes that still have the old
+#    `HZShotsInfoJson` fileInfo are read from it and migrated on next save.
+#    The `HZShotsInfoJson` fileInfo is still written for the tools and older
+#    builds that read it, unless KEEP_LEGACY is turned off. It is written
+#    once per scene save from a before save callback (registerLegacySync),
+#    not with every edit.
+#
+
+import json
+from maya import cmds as MC
+
+NODE_NAME = 'HZShotsData'
+SCHEMA_ATTR = 'hzShotsSchema'
+SCHEMA_KEY = 'HZShotsDataSchema'
+SCHEMA_VERSION = 1
+LEGACY_KEY = 'HZShotsInfoJson'
+# keep writing the old fileInfo next to the node, dropping it is an opt-in
+KEEP_LEGACY = True
+
+_saveCallback = None
+
+# shot dict key -> child attribute of `shots`
+FIELDS = (('name', 'shotName'), ('start', 'shotStart'), ('stop', 'shotStop'), ('color', 'shotColor'))
+
+
+def findNode():
+    '''
+    Shot data node of the scene, in any namespace (imported scenes). Nodes of
+    referenced scenes are the shots of another file and are never used.
+    '''
+    nodes = [node for node in MC.ls('*.%s' % SCHEMA_ATTR, objectsOnly=True, type='network', recursive=True) or []
+             if not MC.referenceQuery(node, isNodeReferenced=True)]
+    # the root namespace node first
+    nodes.sort(key=lambda node: (node.count(':'), node))
+    return nodes[0] if nodes else None
+
+
+def createNode():
+    node = MC.createNode('network', name=NODE_NAME, skipSelect=True)
+    MC.addAttr(node, longName=SCHEMA_ATTR, shortName=SCHEMA_ATTR, attributeType='long', dv=SCHEMA_VERSION)
+    MC.addAttr(node, longName='shots', shortName='shots', attributeType='compound', numberOfChildren=4, multi=True)
+    MC.addAttr(node, longName='shotName', shortName='shotName', dataType='string', parent='shots')
+    MC.addAttr(node, longName='shotStart', shortName='shotStart', attributeType='long', parent='shots')
+    MC.addAttr(node, longName='shotStop', shortName='shotStop', attributeType='long', parent='shots')
+    MC.addAttr(node, longName='shotColor', shortName='shotColor', attributeType='float3', usedAsColor=True, parent='shots')
+    for ch in 'RGB':
+        MC.addAttr(node, longName='shotColor' + ch, shortName='shotColor' + ch, attributeType='float', parent='shotColor')
+    MC.setAttr('%s.%s' % (node, SCHEMA_ATTR), SCHEMA_VERSION)
+    return node
+
+
+def _plug(node, idx, attr):
+    return '%s.shots[%d].%s' % (node, idx, attr)
+
+
+def _getField(node, idx, key, attr):
+    value = MC.getAttr(_plug(node, idx, attr))
+    if key == 'color':
+        return [round(c, 4) for c in value[0]]
+    if key == 'name':
+        return value or ''
+    return value
+
+
+def _setField(node, idx, key, attr, value):
+    if key == 'name':
+        MC.setAttr(_plug(node, idx, attr), value, type='string')
+    elif key == 'color':
+        MC.setAttr(_plug(node, idx, attr), *value, type='float3')
+    else:
+        MC.setAttr(_plug(node, idx, attr), int(value))
+
+
+def shotCount(node=None):
+    node = node or findNode()
+    return len(MC.getAttr('%s.shots' % node, multiIndices=True) or []) if node else 0
+
+
+def readShot(idx, node=None):
+    node = node or findNode()
+    return dict((key, _getField(node, idx, key, attr)) for key, attr in FIELDS)
+
+
+def readShots(legacyKey=LEGACY_KEY):
+    node = findNode()
+    if node is None:
+        data = MC.fileInfo(legacyKey, query=True)
+        return json.loads(data[0].replace('\\"', '"')) if data else []
+    return [readShot(idx, node) for idx in MC.getAttr('%s.shots' % node, multiIndices=True) or []]
+
+
+def readRanges(indices, node=None):
+    '''
+    Name, start and stop of the shots at `indices`, colors are not read.
+    '''
+    node = node or findNode()
+    return [dict((key, _getField(node, idx, key, attr)) for key, attr in FIELDS if key != 'color') for idx in indices]
+
+
+def updateShot(idx, node=None, **fields):
+    '''
+    Set only the given fields of one shot, ex: updateShot(3, stop=120)
+    '''
+    node = node or findNode() or createNode()
+    for key, attr in FIELDS:
+        if key in fields:
+            _setField(node, idx, key, attr, fields[key])
+
+
+def removeShot(idx, node=None):
+    node = node or findNode()
+    MC.removeMultiInstance('%s.shots[%d]' % (node, idx), b=True)
+
+
+def syncLegacy(legacyKey=LEGACY_KEY, node=None, keepLegacy=None):
+    '''
+    Write the shots of the node to the old fileInfo json, or remove it when
+    keepLegacy is off.
+    '''
+    keepLegacy = KEEP_LEGACY if keepLegacy is None else keepLegacy
+    node = node or findNode()
+    if keepLegacy and node is not None:
+        shots = [readShot(idx, node) for idx in MC.getAttr('%s.shots' % node, multiIndices=True) or []]
+        MC.fileInfo(legacyKey, json.dumps(shots, ensure_ascii=True))
+    elif not keepLegacy and MC.fileInfo(legacyKey, query=True):
+        MC.fileInfo(remove=legacyKey)
+
+
+def _beforeSave(clientData=None):
+    try:
+        syncLegacy(clientData or LEGACY_KEY)
+    except Exception as e:
+        # a failed mirror must not stop the save
+        MC.warning('HZShotsData => %s fileInfo not written: %s' % (clientData, e))
+
+
+def registerLegacySync(legacyKey=LEGACY_KEY):
+    '''
+    Mirror the shots of the node to the old fileInfo before every scene save.
+    '''
+    global _saveCallback
+    from maya.api import OpenMaya as OM2
+    if _saveCallback is None:
+        _saveCallback = OM2.MSceneMessage.addCallback(OM2.MSceneMessage.kBeforeSave, _beforeSave, legacyKey)
+    return _saveCallback
+
+
+def unregisterLegacySync():
+    global _saveCallback
+    from maya.api import OpenMaya as OM2
+    if _saveCallback is not None:
+        OM2.MMessage.removeCallback(_saveCallback)
+        _saveCallback = None
+
+
+def writeShots(shots, legacyKey=LEGACY_KEY):
+    '''
+    Store the whole shot list, only fields that differ from the node are set.
+    The old fileInfo json is left to the save (see registerLegacySync).
+    '''
+    node = findNode() or createNode()
+    indices = MC.getAttr('%s.shots' % node, multiIndices=True) or []
+    for idx in indices:
+        if idx >= len(shots):
+            removeShot(idx, node)
+    for idx, sh in enumerate(shots):
+        current = readShot(idx, node) if idx in indices else {}
+        changed = dict((k, v) for k, v in sh.items() if current.get(k) != v)
+        if changed:
+            updateShot(idx, node, **changed)
+    MC.fileInfo(SCHEMA_KEY, str(SCHEMA_VERSION))
+    return node
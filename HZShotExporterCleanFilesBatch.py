@@ -7,35 +7,73 @@
 #    This script create is part of HZshotExporter.py
 # 
 
-import sys, os
+import sys, os, argparse
 import maya.standalone as std
 std.initialize(name='python')
 import maya.cmds as cmds
 import maya.utils as utils
+import HZMayaAscii as MA, HZMayaBinary as MB
+import HZShotPrune as PR
+import HZBulkEdit as BE
+import HZRefCache as RC
+import HZJobRunner as JOB
 
-finame = sys.argv[1]
-withrefs = sys.argv[2]
+parser = argparse.ArgumentParser()
+parser.add_argument('filename')
+parser.add_argument('refs', nargs='?', default=None, help='comma separated reference nodes to load')
+parser.add_argument('--no-clean', dest='clean', action='store_false', help='keep keys out of playback range')
+parser.add_argument('--prune', action='store_true', help='prune curves that are irrelevant to the shot range')
+args = parser.parse_args()
 
-def cleanOutofPlayBacks(filename, loadRefs):
+def cleanOutofPlayBacks(filename, loadRefs, clean=True, prune=False):
     try:
-        cmds.file(filename, open=True, force=True, options='v=0;', ignoreVersion=1, 
-                    prompt=False, loadReferenceDepth='none', reserveNamespaces=1, typ='mayaAscii')  
-        if loadRefs:
-            refs = loadRefs.split(',')
-            for r in refs:
-                cmds.file(loadReference=r, loadReferenceDepth='topOnly')
-        scene_name = os.path.basename(filename)
-        start = cmds.playbackOptions(query=True, min=True)
-        end = cmds.playbackOptions(query=True, max=True)
-        allanimCurvesinScene = cmds.ls(type=['animCurveTL','animCurveTA','animCurveTU'])
-        cmds.cutKey(clear=1, time=(-100000,start-1), *allanimCurvesinScene) 
-        cmds.cutKey(clear=1, time=(end+1,100000), *allanimCurvesinScene) 
-        utils.processIdleEvents()
-        cmds.file(s=1, f=True) 
+        isBinary = filename.lower().endswith('.mb')
+        sceneIO = MB if isBinary else MA
+        graph = sceneIO.readReferenceGraph(filename)
+        if loadRefs is None: loadRefs = ','.join(graph.nestedRefNodes())
+        # rigs and sets are loaded from the local cache, not from the network share
+        cache = RC.HZRefCache.fromEnv()
+        try:
+            if cache is not None: cache.remap()
+            cmds.file(filename, open=True, force=True, options='v=0;', ignoreVersion=1, prompt=False, loadReferenceDepth='none', 
+                        reserveNamespaces=1, typ='mayaBinary' if isBinary else 'mayaAscii')  
+            JOB.emit(stage='opened', progress=0.2)
+            scene_name = os.path.basename(filename)
+            start = cmds.playbackOptions(query=True, min=True)
+            end = cmds.playbackOptions(query=True, max=True)
+            if not isBinary:
+                # only load references that have keys to trim, static ones stay unloaded
+                animatedRefs = MA.findAnimatedReferences(filename, start, end)
+                if animatedRefs is not None: loadRefs = ','.join(animatedRefs)
+            if loadRefs:
+                refs = loadRefs.split(',')
+                for r in refs:
+                    cmds.file(loadReference=r, loadReferenceDepth='topOnly')
+            JOB.emit(stage='references', progress=0.4)
+            allanimCurvesinScene = cmds.ls(type=['animCurveTL','animCurveTA','animCurveTU'])
+            with BE.HZBulkEdit(undo='off'):
+                if clean and allanimCurvesinScene:
+                    cmds.cutKey(clear=1, time=(-100000,start-1), *allanimCurvesinScene) 
+                    cmds.cutKey(clear=1, time=(end+1,100000), *allanimCurvesinScene) 
+                    JOB.emit(stage='cleaned', progress=0.6)
+                if prune:
+                    PR.writeReport(filename, PR.pruneAnimation(start, end))
+                    JOB.emit(stage='pruned', progress=0.7)
+            utils.processIdleEvents()
+            JOB.emit(stage='saving', progress=0.75)
+            cmds.file(s=1, f=True) 
+        finally:
+            if cache is not None: cache.unmap()
+        # references are saved unloaded and cached ones with their cache path, both are
+        # put back in one rewrite of the header
+        fixes = [MA.loadStateFix(dict((r.refNode, r.deferred) for r in graph))]
+        if cache is not None: fixes.insert(0, cache.pathFix(graph))
+        rewrite = MB.rewriteReferences if isBinary else MA.rewriteHeader
+        rewrite(filename, MA.chainFixes(*fixes))
         sys.stdout.write(scene_name)
         return scene_name
     except Exception as e:
         sys.stderr.write(str(e))
         sys.exit(-1)
 
-cleanOutofPlayBacks(finame, withrefs)
\ No newline at end of file
+cleanOutofPlayBacks(args.filename, args.refs, args.clean, args.prune)
\ No newline at end of file
@@ -0,0 +1,57 @@
+# creation date : 19 October, 2026
+#
+# Description :
+#    This script is part of HZShotManager exporter.
+#    Makes one shot file from the keyed shot master: keys are shifted by the
+#    shot offset, the playback range and the shot data are set, then the
+#    scene is saved as the shot file. Used by the export queue workers.
+#
+
+import sys, os, json, argparse
+import maya.standalone as std
+std.initialize(name='python')
+import maya.cmds as cmds
+import HZMayaAscii as MA, HZMayaBinary as MB
+import HZShotData as SD
+import HZBookmarks as BM
+import HZBulkEdit as BE
+import HZJobRunner as JOB
+
+parser = argparse.ArgumentParser()
+parser.add_argument('master', help='keyed shot master scene (.ma)')
+parser.add_argument('shotFile')
+parser.add_argument('shot', help='json of the shot as it is stored in the shot file')
+parser.add_argument('--shift', type=int, default=0, help='frames added to every key')
+args = parser.parse_args()
+
+def makeShotFile(master, shotFile, sh, shift=0):
+    try:
+        isBinary = shotFile.lower().endswith('.mb')
+        graph = MA.readReferenceGraph(master)
+        cmds.file(master, open=True, force=True, options='v=0;', ignoreVersion=1, prompt=False, loadReferenceDepth='none',
+                    reserveNamespaces=1, typ='mayaAscii')
+        JOB.emit(stage='opened', progress=0.3)
+        allanimCurvesinScene = cmds.ls(type=['animCurveTL','animCurveTA','animCurveTU'])
+        with BE.HZBulkEdit(undo='off'):
+            if shift and allanimCurvesinScene:
+                cmds.keyframe(e=1, time=(), relative=1, timeChange=shift, *allanimCurvesinScene)
+            cmds.playbackOptions(min=sh['start'], max=sh['stop'], ast=sh['start'], aet=sh['stop'])
+            SD.writeShots([sh])
+            # the master bookmarks of every shot are left to the shot of this file
+            if int(cmds.about(version=True)) >= 2020:
+                cmds.loadPlugin('timeSliderBookmark', quiet=True)
+                BM.syncBookmarks([sh])
+        JOB.emit(stage='shifted', progress=0.6)
+        # no save callback in batch, the one shot is mirrored to the old fileInfo here
+        SD.syncLegacy()
+        cmds.file(rename=shotFile)
+        cmds.file(save=True, force=True, type='mayaBinary' if isBinary else 'mayaAscii')
+        # references are saved unloaded, give them back the state they have in the master
+        (MB if isBinary else MA).setReferenceLoadState(shotFile, dict((r.refNode, r.deferred) for r in graph))
+        sys.stdout.write(os.path.basename(shotFile))
+        return shotFile
+    except Exception as e:
+        sys.stderr.write(str(e))
+        sys.exit(-1)
+
+makeShotFile(args.master, args.shotFile, json.loads(args.shot), args.shift)
@@ -0,0 +1,311 @@
+# creation date : 19 October, 2026
+#
+# Description :
+#    Project wide index of episode masters and shot files, built from the
+#    scene files without Maya. For every .ma file only the header (fileInfo),
+#    the shot data node and the playbackOptions line are read, see
+#    HZMayaAscii. Results are kept in a local SQLite database and a file is
+#    parsed again only when its mtime or size has changed.
+#    Files are parsed in worker processes from the command line (mayapy or
+#    any python). Inside Maya they are parsed in turn: multiprocessing would
+#    start every worker as a new maya.exe.
+#
+#    usage: python HZShotIndex.py update P:/show
+#           python HZShotIndex.py at 1050 --episode EP012
+#           python HZShotIndex.py frames
+#           python HZShotIndex.py stale
+#           python HZShotIndex.py markers --episode EP012
+#
+
+import argparse, json, os, re, sqlite3, sys, time
+
+try:
+    from . import HZMayaAscii as MA, HZShotCore as CO
+except (ImportError, ValueError):
+    import HZMayaAscii as MA, HZShotCore as CO
+
+DEFAULT_DB = os.path.join(os.path.expanduser('~'), 'HZShotIndex.db')
+TIMELINE_MARKER = 'timeline-marker'
+SHOTS_DIR = 'SHOTS'
+SCHEMA_VERSION = 1
+
+_versionRegex = re.compile(r"v(\d+)", re.I)
+_shotFileRegex = re.compile(r"^(EP\d+)_(SH\d+)_ANI_+(v\d+)\.m[ab]$", re.I)
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY, kind TEXT, episode TEXT, version TEXT,
+    mtime REAL, size INTEGER, indexed REAL, rangeStart REAL, rangeStop REAL, error TEXT);
+CREATE TABLE IF NOT EXISTS shots (
+    file TEXT, idx INTEGER, name TEXT, start INTEGER, stop INTEGER, color TEXT, shotFile TEXT);
+CREATE TABLE IF NOT EXISTS markers (
+    file TEXT, frame INTEGER, comment TEXT, color TEXT);
+CREATE INDEX IF NOT EXISTS shotsByFile ON shots (file);
+CREATE INDEX IF NOT EXISTS shotsByFrame ON shots (start, stop);
+CREATE INDEX IF NOT EXISTS shotsByShotFile ON shots (shotFile);
+CREATE INDEX IF NOT EXISTS markersByFile ON markers (file);
+'''
+
+
+def normPath(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+# kept here for the scripts that used it from the index
+shotFileName = CO.shotFileName
+
+
+def classify(path):
+    '''
+    (kind, episode, version) of a scene file from its name and folder.
+    '''
+    folder, name = os.path.split(path)
+    found = _shotFileRegex.match(name)
+    if found and os.path.basename(folder).upper() == SHOTS_DIR:
+        return 'shot', found.group(1).upper(), found.group(3).lower()
+    found = CO.masterParts(name)
+    if found:
+        return 'master', found[0].upper(), found[1].lstrip('_').lower()
+    return 'scene', None, None
+
+
+def readScene(path):
+    '''
+    Everything the index stores about one .ma file, as plain data so it can
+    be computed in a worker process.
+    '''
+    kind, episode, version = classify(path)
+    record = {'path': path, 'kind': kind, 'episode': episode, 'version': version,
+              'range': None, 'shots': [], 'markers': [], 'error': None}
+    if not path.lower().endswith('.ma'):
+        # binary shot files are only tracked by their mtime
+        return record
+    try:
+        info = MA.readFileInfo(path)
+        shots = MA.readShotsInfo(path, info)
+        record['range'] = MA.readPlaybackRange(path)
+        markers = json.loads(info[TIMELINE_MARKER]) if TIMELINE_MARKER in info else {}
+    except (IOError, OSError, ValueError) as e:
+        record['error'] = str(e)
+        return record
+    if kind == 'scene' and shots:
+        record['kind'] = 'master'
+    shotsDir = os.path.join(os.path.dirname(path), SHOTS_DIR)
+    for idx, sh in enumerate(shots):
+        try:
+            shotFile = normPath(shotFileName(shotsDir, os.path.basename(path), sh)) if record['kind'] == 'master' else None
+        except IndexError:
+            shotFile = None
+        record['shots'].append((idx, sh.get('name', ''), int(sh.get('start', 0)), int(sh.get('stop', 0)),
+                                json.dumps(sh.get('color')), shotFile))
+    for frame, data in sorted(markers.items()):
+        record['markers'].append((int(frame), data.get('comment', ''), json.dumps(data.get('colour'))))
+    return record
+
+
+def insideMaya():
+    # maya.exe, or maya.bin on linux, mayapy is fine
+    return os.path.basename(sys.executable).lower().split('.')[0] == 'maya'
+
+
+def iterScenes(root):
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+        for name in filenames:
+            if name.lower().endswith(('.ma', '.mb')) and not name.endswith(('_BACKUP.ma', '_SHOTMASTER.ma')):
+                yield os.path.join(dirpath, name)
+
+
+class HZShotIndex(object):
+    '''
+    SQLite index of the scenes under one or more show roots.
+    '''
+    def __init__(self, dbPath=DEFAULT_DB):
+        self.dbPath = dbPath
+        self.db = sqlite3.connect(dbPath)
+        self.db.executescript(SCHEMA)
+        self.db.execute('PRAGMA user_version = %d' % SCHEMA_VERSION)
+
+    def close(self):
+        self.db.close()
+
+    def update(self, root, workers=1, log=None):
+        '''
+        Index new or changed .ma files under root and forget deleted ones.
+        Returns (parsed, unchanged, removed) counts.
+        '''
+        root = normPath(root)
+        prefix = root.rstrip(os.sep) + os.sep
+        known = dict((path, (mtime, size)) for path, mtime, size in self.db.execute(
+            'SELECT path, mtime, size FROM files WHERE substr(path, 1, ?) = ?', (len(prefix), prefix)))
+        changed = []
+        stats = {}
+        for path in iterScenes(root):
+            path = normPath(path)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            stats[path] = (st.st_mtime, st.st_size)
+            if known.pop(path, None) != stats[path]:
+                changed.append(path)
+        if workers > 1 and len(changed) > 1 and not insideMaya():
+            # imported here, lookups do not pay for multiprocessing
+            from multiprocessing import Pool
+            pool = Pool(workers)
+            try:
+                records = pool.imap_unordered(readScene, changed, chunksize=8)
+                self._store(records, stats, log)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            self._store((readScene(path) for path in changed), stats, log)
+        # what is left in known is gone from disk
+        for path in known:
+            self._forget(path)
+        self.db.commit()
+        return len(changed), len(stats) - len(changed), len(known)
+
+    def _forget(self, path):
+        for table, column in (('files', 'path'), ('shots', 'file'), ('markers', 'file')):
+            self.db.execute('DELETE FROM %s WHERE %s = ?' % (table, column), (path, ))
+
+    def _store(self, records, stats, log=None):
+        now = time.time()
+        for record in records:
+            path = record['path']
+            self._forget(path)
+            mtime, size = stats[path]
+            rangeStart, rangeStop = record['range'] or (None, None)
+            self.db.execute('INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                            (path, record['kind'], record['episode'], record['version'], mtime, size, now,
+                             rangeStart, rangeStop, record['error']))
+            self.db.executemany('INSERT INTO shots VALUES (?, ?, ?, ?, ?, ?, ?)',
+                                [(path, ) + sh for sh in record['shots']])
+            self.db.executemany('INSERT INTO markers VALUES (?, ?, ?, ?)',
+                                [(path, ) + mk for mk in record['markers']])
+            if log is not None:
+                log(path, record)
+
+    def shotsAt(self, frame, episode=None):
+        '''
+        Shots of the masters that span the given frame.
+        '''
+        query = ('SELECT f.episode, f.version, s.name, s.start, s.stop, f.path FROM shots s '
+                 'JOIN files f ON f.path = s.file WHERE f.kind = ? AND s.start <= ? AND s.stop >= ?')
+        args = ['master', frame, frame]
+        if episode:
+            query += ' AND f.episode = ?'
+            args.append(episode.upper())
+        return self.db.execute(query + ' ORDER BY f.episode, f.version, s.start', args).fetchall()
+
+    def latestMasters(self):
+        # the highest version of every episode
+        masters = {}
+        for path, episode, version in self.db.execute(
+                'SELECT path, episode, version FROM files WHERE kind = ? AND episode IS NOT NULL', ('master', )):
+            number = int(_versionRegex.search(version).group(1))
+            if episode not in masters or number > masters[episode][2]:
+                masters[episode] = (path, version, number)
+        return dict((episode, master[:2]) for episode, master in masters.items())
+
+    def framesPerEpisode(self):
+        '''
+        (episode, version, shot count, frame count) of the latest master of
+        every episode.
+        '''
+        result = []
+        for episode, (path, version) in sorted(self.latestMasters().items()):
+            count, frames = self.db.execute('SELECT COUNT(*), SUM(stop - start + 1) FROM shots WHERE file = ?',
+                                            (path, )).fetchone()
+            result.append((episode, version, count, frames or 0))
+        return result
+
+    def markers(self, episode=None):
+        '''
+        Timeline markers of the latest master of every episode with the shot
+        they are in. Returns (episode, version, frame, shot name, comment)
+        rows, the shot name is None for markers between shots.
+        '''
+        result = []
+        for ep, (path, version) in sorted(self.latestMasters().items()):
+            if episode and ep != episode.upper():
+                continue
+            rows = self.db.execute(
+                'SELECT m.frame, (SELECT s.name FROM shots s WHERE s.file = m.file AND s.start <= m.frame '
+                'AND s.stop >= m.frame ORDER BY s.idx LIMIT 1), m.comment FROM markers m WHERE m.file = ? '
+                'ORDER BY m.frame', (path, ))
+            result.extend((ep, version) + tuple(row) for row in rows)
+        return result
+
+    def staleShots(self):
+        '''
+        Shot files that are missing or older than the master they come from.
+        Returns (master, shot name, shot file, state) rows.
+        '''
+        shotTimes = dict(self.db.execute('SELECT path, mtime FROM files WHERE kind = ?', ('shot', )))
+        rows = self.db.execute(
+            'SELECT m.path, s.name, s.shotFile, m.mtime FROM shots s JOIN files m ON m.path = s.file '
+            'WHERE m.kind = ? AND s.shotFile IS NOT NULL ORDER BY m.path, s.idx', ('master', )).fetchall()
+        stale = []
+        for master, name, shotFile, masterTime in rows:
+            # shots can be exported as mayaBinary too
+            binary = os.path.splitext(shotFile)[0] + '.mb'
+            shotTime = shotTimes.get(shotFile, shotTimes.get(binary))
+            if shotTime is None:
+                stale.append((master, name, shotFile, 'missing'))
+            elif shotTime < masterTime:
+                stale.append((master, name, shotFile, 'stale'))
+        return stale
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Index of episode masters and shot files.')
+    parser.add_argument('--db', default=DEFAULT_DB, help='index database file')
+    commands = parser.add_subparsers(dest='command')
+    update = commands.add_parser('update', help='index new and changed scenes')
+    update.add_argument('roots', nargs='+')
+    update.add_argument('-j', '--workers', type=int, default=4)
+    update.add_argument('-v', '--verbose', action='store_true')
+    at = commands.add_parser('at', help='shots that span a frame')
+    at.add_argument('frame', type=int)
+    at.add_argument('--episode')
+    commands.add_parser('frames', help='frame count of every episode')
+    commands.add_parser('stale', help='shot files older than their master')
+    markers = commands.add_parser('markers', help='timeline markers of the latest masters')
+    markers.add_argument('--episode')
+    args = parser.parse_args(argv)
+
+    index = HZShotIndex(args.db)
+    try:
+        if args.command == 'update':
+            def log(path, record):
+                sys.stdout.write('%s %s\n' % (path, record['error'] or ''))
+            for root in args.roots:
+                started = time.time()
+                parsed, unchanged, removed = index.update(root, args.workers, log if args.verbose else None)
+                print('%s: %d parsed, %d unchanged, %d removed in %.1fs' % (
+                    root, parsed, unchanged, removed, time.time() - started))
+        elif args.command == 'at':
+            for row in index.shotsAt(args.frame, args.episode):
+                print('%s %s %-12s %6d - %-6d %s' % row)
+        elif args.command == 'frames':
+            for row in index.framesPerEpisode():
+                print('%s %s %4d shots %8d frames' % row)
+        elif args.command == 'stale':
+            for row in index.staleShots():
+                print('%-8s %-12s %s (%s)' % (row[3], row[1], row[2], row[0]))
+        elif args.command == 'markers':
+            for episode, version, frame, shot, comment in index.markers(args.episode):
+                print('%s %s %6d %-12s %s' % (episode, version, frame, shot or '-', comment))
+        else:
+            parser.print_help()
+            return 1
+    finally:
+        index.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -10,15 +10,25 @@
 # How To use :
 #    copy python file into maya script folder then run these lines:
 # from HZShotManager import HZShotManager as hzsm
-# reload(hzsm)
 # hzsm.HZShotManager().showUI()
 # 
 
 import traceback
 
 from maya import cmds as MC, mel as MM, utils as UT
-from itertools import cycle, islice, chain
-import re, json, os, subprocess, sys
+from itertools import chain
+import os, subprocess, sys, time
+
+try:
+    from . import HZShotCore as CO, HZMayaAscii as MA, HZJobRunner as JOB, HZShotData as SD, HZProgress as PG, HZBulkEdit as BE
+except (ImportError, ValueError):
+    import HZShotCore as CO, HZMayaAscii as MA, HZJobRunner as JOB, HZShotData as SD, HZProgress as PG, HZBulkEdit as BE
+
+# export, index, cache and timeline layers are imported the first time they are used,
+# opening the window does not load them
+MB, JR, IX, BM, TS, EQ, KR, VA, CC, RV, TM = [CO.lazyImport(name, __package__) for name in (
+    'HZMayaBinary', 'HZExportJournal', 'HZShotIndex', 'HZBookmarks', 'HZThinShots', 'HZExportQueue',
+    'HZKeyReduce', 'HZShotValidator', 'HZCameraCache', 'HZShotRecover', 'HZTimelineMarker')]
 
 class HZShotManager:
 
@@ -27,7 +37,8 @@ class HZShotManager:
     def __init__(self, *args):
         self.__WINDOW_NAME = "HZShotManagerWindow"
         self.__shotsInfoKey = 'HZShotsInfoJson'
-        self.__bookmarkColors = ["ff4000","ffbf00","40ff00","00bfff","0040ff","4000ff","bf00ff","ff0040"] 
+        # the old fileInfo is mirrored once per save, not with every shot edit
+        SD.registerLegacySync(self.__shotsInfoKey)
     
     @staticmethod
     def loadPlugin(plugin):
@@ -39,15 +50,7 @@ class HZShotManager:
 
     @staticmethod
     def hex2rgb(hex = str):
-        if not hex: return [0,0,0]
-        hex = hex.upper().split("#")[-1]
-        lh = len(hex)
-        if lh==3:  hex = iter(''.join([str(x) * 2 for x in hex]))
-        elif lh<3: 
-            from itertools import cycle, islice
-            hex = iter(''.join(list(islice(cycle(hex), 6))))
-        else: hex = iter(hex.ljust(6,'F')[:6])
-        return [round(float(int("%s%s"%(a,b),16))/255, 2) for a,b in zip(hex,hex)]   
+        return CO.hex2rgb(hex)
 
     @staticmethod
     def getImagePath(imageName, ext="png", imageFolder="."):
@@ -78,22 +81,13 @@ class HZShotManager:
             MC.setParent( u=1 ) 
 
     def saveData(self, dataDic):
-        encoded = json.dumps(dataDic, ensure_ascii=True)
-        MC.fileInfo(self.__shotsInfoKey, encoded)
+        # shots live on the HZShotsData node, old fileInfo json is migrated
+        SD.writeShots(dataDic, self.__shotsInfoKey)
 
     def loadData(self):
-        data = MC.fileInfo(self.__shotsInfoKey, query=True)
-        return json.loads(data[0].replace('\\"', '"')) if data else {}
-
-    def checkProgressEscape(self):
-        # check if dialog has been cancelled
-        cancelled = MC.progressWindow(query=True, isCancelled=True)
-        if cancelled:
-            MC.progressWindow(endProgress=1)
-        return cancelled 
-
-    def setKeyShots(self,animCurves = None, shotsInfo =None, tit="Set Keyframe"):
-        MC.progressWindow(title=tit , progress=0, status='proceed: 0%', isInterruptable=True)        
+        return SD.readShots(self.__shotsInfoKey)
+
+    def setKeyShots(self,animCurves = None, shotsInfo =None, tit="Set Keyframe", progress=None):
         if not shotsInfo: shotsInfo =  self.loadData()
         if not animCurves:
             animCurves = MC.ls(sl=1, type=['animCurveTL','animCurveTA','animCurveTU']) \
@@ -101,20 +95,38 @@ class HZShotManager:
         if not animCurves: 
             MC.warning("NO Animation Key Found!")
             return
-        shotCount = len(shotsInfo)
-        for idx, sh in enumerate(shotsInfo): # HOLD POSes ON SHOTS CHANGE
-            if self.checkProgressEscape(): return
-            MC.setKeyframe(t=[sh['start'], sh['stop']], shape=0, ott='linear', itt='linear', *animCurves) 
-            amount = 100 / shotCount * float(idx)
-            MC.progressWindow(edit=True, progress=amount, status='proceed: %d%%' % amount)                
-            UT.processIdleEvents()  
-        MC.progressWindow(endProgress=1)
-
-    def getNestedRefs(self):
+        if progress is None:
+            # on its own, a cancel undoes the keys set so far
+            with BE.HZBulkEdit(undo='chunk'), PG.HZProgress(tit) as progress:
+                self.setKeyShots(animCurves, shotsInfo, tit, progress)
+            if progress.cancelled: MC.undo()
+            return
+        with progress.current().stage(tit, total=len(shotsInfo)) as st:
+            for idx, sh in enumerate(shotsInfo): # HOLD POSes ON SHOTS CHANGE
+                progress.check()
+                MC.setKeyframe(t=[sh['start'], sh['stop']], shape=0, ott='linear', itt='linear', *animCurves) 
+                st.step()
+
+    def reduceKeys(self, animCurves=None, shotsInfo=None, progress=None):
+        if not shotsInfo: shotsInfo = self.loadData()
+        if not animCurves:
+            animCurves = MC.ls(sl=1, type=KR.ANIMCURVE_TYPES) or MC.ls(type=KR.ANIMCURVE_TYPES) or []
+        report = KR.reduceKeys(animCurves, shotsInfo, progress=progress)
+        if report:
+            print('%d redundant key(s) removed from %d curve(s), %d key(s) before.' % (
+                report['removed'], report['curves'], report['before']))
+        return report
+
+    def getNestedRefs(self, sceneFile=None):
+        # saved mayaAscii scenes have the whole reference tree in their header
+        if sceneFile and sceneFile.lower().endswith('.ma') and os.path.isfile(sceneFile):
+            try:
+                return ','.join(MA.readReferenceGraph(sceneFile).nestedRefNodes())
+            except Exception: pass
+        nested_refs = list()
         try:
             all_reference_nodes = MC.ls(rf=True)
             all_reference_nodes.sort(key=len, reverse=False)
-            nested_refs = list()
             for reference_node in all_reference_nodes:
                 children = MC.referenceQuery(reference_node, referenceNode=True, child=True)
                 # print (reference_node, "--->", children)
@@ -144,9 +156,9 @@ class HZShotManager:
         finally:
             user32.CloseClipboard()
 
-    def extractNumbers(self, tex):
-        tex = tex.replace('.0 ', ' ')
-        return [int(f) for f in re.findall("\s\d\d\d?\s", tex)]
+    @staticmethod
+    def extractNumbers(tex):
+        return CO.extractNumbers(tex)
 
     def generateTimeMarks(self, shotsInfo=None):
         if not shotsInfo:
@@ -155,18 +167,12 @@ class HZShotManager:
             MC.warning("no shots info found!")
             return False
         if int(MC.about(version=True))>=2020:
-            if MC.ls(typ='timeSliderBookmark'):
-                MC.delete(MC.ls(typ='timeSliderBookmark'))
             if self.loadPlugin('timeSliderBookmark'):
-                from maya.plugin.timeSliderBookmark.timeSliderBookmark import createBookmark # type: ignore 
-                for sh in shotsInfo: createBookmark(**sh)
+                BM.syncBookmarks(shotsInfo)
         else:
-            sys.path.append(".")
             from PySide2 import QtWidgets
-            import HZTimelineMarker as tm
-            reload(tm) # type: ignore
 
-            parent = tm.get_timeline()
+            parent = TM.get_timeline()
             layout = parent.layout()
             # create layout if non exists
             if layout is None:
@@ -174,11 +180,11 @@ class HZShotManager:
                 layout.setContentsMargins(0, 0, 0, 0)
                 parent.setLayout(layout)
             # create timeline marker
-            tm.HZTimelineMarker.instance = tm.HZTimelineMarker(parent)
+            TM.HZTimelineMarker.instance = TM.HZTimelineMarker(parent)
             if layout.count() < 1:
-                layout.addWidget(tm.HZTimelineMarker.instance)
+                layout.addWidget(TM.HZTimelineMarker.instance)
 
-            tm.HZTimelineMarker.clear()
+            TM.HZTimelineMarker.clear()
             frames = []
             cols = []
             coments = []
@@ -187,7 +193,7 @@ class HZShotManager:
                 lenght = abs(sh['stop'] - sh['start']) 
                 cols.extend([tuple([255*x for x in sh['color']])] * lenght)
                 coments.extend([sh['name']] * lenght)
-            tm.HZTimelineMarker.set(frames, cols, coments)
+            TM.HZTimelineMarker.set(frames, cols, coments)
 
     def setupAnimCam(self, cam=None):
         if not cam:
@@ -265,9 +271,7 @@ class HZShotManager:
                                                     , h=200,w=430)
 
     def createShots(self, *args):
-        try:
-            MC.undoInfo(openChunk=True)
-            MC.refresh(su=True)
+        with BE.HZBulkEdit(undo='chunk'):
             MC.currentUnit(time='pal')
             animCam = MC.nameField(self.objsName, q=1, object=1)
             if not animCam: 
@@ -281,17 +285,14 @@ class HZShotManager:
                 return
             startOffset = MC.intField(self.frmOfset, q=1, value=1) or 0
             startShotNum = MC.intField(self.shotNum, q=1, value=1) or 1
-            frames = [(startOffset+1, startOffset+frameLens[0])]
-            for i in range(1,len(frameLens)):
-                frames.append((frames[i-1][1]+1, frames[i-1][1]+frameLens[i]))
+            frames = CO.shotFrames(frameLens, startOffset)
             extendedFrames = list(chain.from_iterable(frames))
             # print (extendedFrames)
             MC.setKeyframe(animCam, t=extendedFrames, at=['translate','rotate','HZTickColor','FL'], shape=0, ott='linear', itt='linear')
-            colors = list(islice(cycle(self.__bookmarkColors), len(frames)))
             shotsInfo = list()
             for idx,se in enumerate(frames):
-                nm = "SH0T_%03d" % ((idx+startShotNum)*10,)
-                col = self.hex2rgb(colors[idx])
+                nm = CO.shotName(idx, startShotNum)
+                col = CO.shotColor(idx)
                 shotsInfo.append({'name':nm, 'start':se[0], 'stop':se[1], 'color':col})
 
             self.saveData(shotsInfo)
@@ -307,133 +308,432 @@ class HZShotManager:
 
             if MC.window(self.__WINDOW_NAME, exists = True): MC.deleteUI(self.__WINDOW_NAME)       
 
-        except Exception as e:
-            raise e
-        finally:
-            MC.refresh(su=False)
-            MC.undoInfo(closeChunk=True)   
+    @staticmethod
+    def shotTimeShifts(shotsInfo, startOffset):
+        return CO.shotTimeShifts(shotsInfo, startOffset)
+
+    @staticmethod
+    def shotFileName(shotsDir, scene_name, sh, shotExt='ma'):
+        return CO.shotFileName(shotsDir, scene_name, sh, shotExt)
 
     def exportShots(self, *args):
+        runner = None
         try:
             MC.select(cl=1)
             currentFileName = MC.file(query=True, l=True)[0]
-            nestedRefTxt = self.getNestedRefs()
+            backupFileName = currentFileName.replace(".ma", "_BACKUP.ma")
+            journalFile = JR.journalPath(currentFileName)
+            journal = JR.HZExportJournal.load(journalFile)
+            resume = False
+            queued = 0
+            if journal and not journal.complete and journal.settings.get('queue'):
+                # shots exported by queue workers since the export was queued
+                queued = EQ.syncJournal(journal)
+                if journal.firstIncomplete(journal.finalState()) is None: journal.finish()
+            if journal and not journal.complete and os.path.isfile(journal.data['backup']):
+                conf = MC.confirmDialog(t='Unfinished Export', m='An unfinished export of this scene has been found.\n%s'
+                                        'Resume it from the first incomplete shot?' % (
+                                            '%d shot(s) are still queued or running.\n' % queued if queued else ''),
+                                        button=['Resume', 'Start Over', 'Cancel'], defaultButton='Resume',
+                                        cancelButton='Cancel', dismissString='Cancel')
+                if conf == 'Cancel': return
+                resume = conf == 'Resume'
+            if resume:
+                # the backup is the scene as it was before any key has been shifted
+                MC.file(journal.data['backup'], open=True, force=True, options='v=0;', ignoreVersion=1, prompt=False)
+                MC.file(rename= currentFileName)
+            else:
+                MC.file( rename=backupFileName )
+                MC.file(force=True, save=True, options="v=0;", type="mayaAscii") 
+                MC.file(rename= currentFileName)
+                MC.file(force=True, save=True, options="v=0;", type="mayaAscii") 
+            nestedRefTxt = self.getNestedRefs(currentFileName)
             # print(nestedRefTxt)
-            MC.file( rename=currentFileName.replace(".ma", "_BACKUP.ma") )
-            MC.file(force=True, save=True, options="v=0;", type="mayaAscii") 
-            MC.file(rename= currentFileName)
-            MC.file(force=True, save=True, options="v=0;", type="mayaAscii") 
             UT.processIdleEvents()
-            MC.refresh(su=True)
-            mayaPath = os.path.join(os.path.split(sys.executable)[0], 'mayapy.exe')
+            mayaPath = JOB.mayapyPath()
             current_project = MC.workspace(q=True, rootDirectory=True)
             scene_path, scene_name = os.path.split(currentFileName) 
             batchScriptPath = os.path.join(os.path.dirname(__file__), 'HZShotExporterCleanFilesBatch.py')    
 
-            startOffset = MC.intField(self.expoOfset, q=1, value=1) or 0
-            if not MC.fileInfo(self.__shotsInfoKey, q=1):
-                MC.warning("Current scene seems has not correct config for exporting shots. no camera shots info found!")
+            if not self.loadData():
+                MC.warning("Current scene seems has not correct config for exporting shots. no camera shots info found! "
+                           "(Extras > Recover Shots From Camera rebuilds it from the camera keys)")
                 return
             
             shotsInfo =  self.loadData()
             allanimCurvesinScene = MC.ls(type=['animCurveTL','animCurveTA','animCurveTU'])
-            setkeys, makeshotfiles, makeclean = MC.checkBoxGrp(self.chk_steps, q=1, va3=1) or [False]*3
-
-            if setkeys:
-                self.setKeyShots(allanimCurvesinScene , shotsInfo, 'Set Keyframes...')
-
-            if makeshotfiles:
-                MC.progressWindow(title='Make Shot Files' , progress=0, status='proceed: 0%', isInterruptable=True)
-                shotFiles = list()
-                shotsDir = os.path.join(scene_path, "SHOTS")
-                if not os.path.isdir(shotsDir): os.mkdir(shotsDir)        
-                shotCount = len(shotsInfo)
-                dooffset = MC.intField(self.expoOfset, q=1, en=1)
-                
-                for idx, sh in enumerate(shotsInfo):
-                    if self.checkProgressEscape(): return
-                    flShInfo = []
-                    if dooffset:
-                        timechng = 0
-                        if idx==0: timechng = startOffset+1-sh['start']
-                        else: timechng = (shotsInfo[idx-1]['start']-shotsInfo[idx-1]['stop'])-1 #startOffset+1-sh['start']
-                        MC.keyframe(e=1, time=(), relative=1, timeChange=timechng, *allanimCurvesinScene)
-                        newStop = startOffset+1+(sh['stop']-sh['start'])
-                        MM.eval('playbackOptions -min {0} -max {1} -ast {0} -aet {1}'.format(startOffset+1,newStop) )
-                        flShInfo = [{'name':sh['name'], 'color':sh['color'], 'start':startOffset+1, 'stop':newStop}]
-                    else:
-                        MM.eval('playbackOptions -min {0} -max {1} -ast {0} -aet {1}'.format(sh['start'],sh['stop']) )
-                        flShInfo = [{'name':sh['name'], 'color':sh['color'], 'start':sh['start'], 'stop':sh['stop']}]
-                    name_matches = re.search(r"^(EP\d+)\D.*(_v\d+)\D*.*$", scene_name)
-                    epName, verName =  name_matches.groups() if name_matches else ("EP000","v001") # "EP" + (scene_name.split('_')[1])
-                    shName = "SH" + (str(sh['name']).split('_')[1])
-                    sceneFile = os.path.join(shotsDir, "%s_%s_ANI_%s.ma"%(epName, shName, verName) )
-                    # MC.file( rename=os.path.join(shotsDir ,'%s_SHOT_%s.ma'%(scene_name.replace('.ma',''), sh['name'].replace('SH0T_','') ) ))
-                    MC.file( rename=sceneFile )
-                    self.generateTimeMarks(flShInfo)
-                    self.saveData(flShInfo)
-                    shotf = os.path.abspath(MC.file( save=True, type='mayaAscii' ))
-                    shotFiles.append(shotf)
-
-                    amount = 100 / shotCount * float(idx)
-                    MC.progressWindow(edit=True, progress=amount, status='proceed: %d%%' % amount)
-                    UT.processIdleEvents()
-                
-                MC.progressWindow(endProgress=1)
-                MC.file( force=True, new=True )
-                # flname = os.path.join(scene_path, scene_name)
-                # MC.file(flname, open=True, force=True, options='v=0;', ignoreVersion=1, prompt=False, loadReferenceDepth='none', reserveNamespaces=1, typ='mayaAscii')
-
-            if makeclean:
-                tittle = 'Clean shot files'
-                MC.progressWindow(title=tittle, progress=0, status='proceed: 0%', isInterruptable=True)
-                shotFilesCount = len(shotFiles)
-                print ('HZ Shot Exporter => Begin...')
-                for idx, fl in enumerate(shotFiles):
-                    if self.checkProgressEscape(): return
-                    cmand = "%s \"%s\" \"%s\" \"%s\""%(mayaPath,batchScriptPath,fl,nestedRefTxt)
-                    # print (cmand)
-                    CREATE_NO_WINDOW = 0x08000000
-                    maya = subprocess.Popen(cmand,stdout=subprocess.PIPE,stderr=subprocess.PIPE, creationflags=CREATE_NO_WINDOW)
-                    out,err = maya.communicate()
-                    exitcode = maya.returncode
-                    if str(exitcode) != '0':
-                        #print(err)
-                        print ("%s <<< file: %s" % (err, fl))
-                        # pass
+            if resume:
+                settings = journal.settings
+            else:
+                setkeys, makeshotfiles, makeclean = MC.checkBoxGrp(self.chk_steps, q=1, va3=1) or [False]*3
+                settings = {'setkeys': setkeys, 'make': makeshotfiles, 'clean': makeclean,
+                            'prune': MC.checkBox(self.chk_prune, q=1, v=1) and makeshotfiles,
+                            'reduce': MC.checkBox(self.chk_reduce, q=1, v=1),
+                            'cameras': MC.checkBox(self.chk_cameras, q=1, v=1),
+                            'binary': MC.checkBox(self.chk_binary, q=1, v=1),
+                            'thin': MC.checkBox(self.chk_thin, q=1, v=1) and makeshotfiles,
+                            'queue': MC.textField(self.queueDir, q=1, text=1).strip() if MC.checkBox(self.chk_queue, q=1, v=1) else '',
+                            'offset': MC.intField(self.expoOfset, q=1, value=1) or 0,
+                            'dooffset': MC.intField(self.expoOfset, q=1, en=1),
+                            'workers': MC.intField(self.cleanWorkers, q=1, value=1)}
+                if settings['thin']:
+                    # thin files only reference the shot master, there is nothing to clean in them
+                    settings.update(clean=False, prune=False, binary=False)
+            setkeys, makeshotfiles, makeclean, prune = [settings[k] for k in ('setkeys', 'make', 'clean', 'prune')]
+            startOffset, dooffset = settings['offset'], settings['dooffset']
+            shotType, shotExt = ('mayaBinary', 'mb') if settings['binary'] else ('mayaAscii', 'ma')
+            shotsDir = os.path.join(scene_path, "SHOTS")
+            if resume:
+                journal.verify()
+            else:
+                shotFiles = [self.shotFileName(shotsDir, scene_name, sh, shotExt) for sh in shotsInfo]
+                journal = JR.HZExportJournal.create(journalFile, currentFileName, backupFileName, settings, shotsInfo, shotFiles)
+            shotFiles = [shot['file'] for shot in journal.shots]
+
+            flags = ([] if makeclean else ['--no-clean']) + (['--prune'] if prune else [])
+            cleanCommand, cleanArgs = [mayaPath, batchScriptPath], [nestedRefTxt] + flags
+            shifts = self.shotTimeShifts(shotsInfo, startOffset)
+            reducekeys = settings.get('reduce')
+            progress = PG.HZProgress('Export Shots', total=(1 if setkeys else 0) + (1 if reducekeys else 0) + (4 if makeshotfiles else 0))
+            # files are saved and reopened, there is nothing to undo in an export
+            with BE.HZBulkEdit(undo='off'), progress:
+                # a cancelled export gives back the scene as it was, the journal keeps the saved shots
+                progress.onCancel(self.reopenScene, backupFileName, currentFileName)
+                if setkeys and journal.firstIncomplete('saved') is not None:
+                    self.setKeyShots(allanimCurvesinScene , shotsInfo, 'Set Keyframes', progress)
+                if reducekeys and journal.firstIncomplete('saved') is not None:
+                    # hold keys that change nothing would be copied in every shot file
+                    self.reduceKeys(allanimCurvesinScene, shotsInfo, progress)
+                if settings.get('cameras') and 'cameras' not in journal.data:
+                    # camera keys are hashed on the keyed master, before they are shifted for shot files
+                    journal.data['cameras'] = CC.prepareJobs(currentFileName, shotsInfo, shifts if dooffset else None,
+                                                             MC.nameField(self.objsName, q=1, object=1) or None)
+                    journal.save()
+
+                if makeshotfiles and settings.get('queue') and not settings.get('thin'):
+                    self.queueShotFiles(journal, shotsInfo, startOffset if dooffset else None, currentFileName,
+                                        [nestedRefTxt] + flags if makeclean or prune else None)
+                    progress.commit()
+                    if journal.data.get('cameras'):
+                        self.cacheCameras(journal.data['cameras'], settings['workers'])
+                    return
+
+                if makeshotfiles:
+                    if not os.path.isdir(shotsDir): os.mkdir(shotsDir)
+                    if settings.get('thin'):
+                        self.makeThinShotFiles(journal, shotsInfo, shifts if dooffset else None, startOffset, currentFileName, progress)
                     else:
-                        print ('%s DONE' % (out))
-                    with open(fl) as f:
-                        newText=f.read()
-                    regex = r"^(file\s-rdi.*)(-dr\s1\s)(-rfn\s)"
-                    subst = "\\1\\3"
-                    newText = re.sub(regex, subst, newText, 0, re.MULTILINE)
-                    with open(fl, "w") as f:
-                        f.write(newText)
-                    amount = 100 / shotFilesCount * float(idx)
-                    MC.progressWindow(edit=True, progress=amount, status='proceed: %d%%' % amount)
-                    UT.processIdleEvents()
-
-                print ('HZ Shot Exporter => Finish.')
-                MC.progressWindow(endProgress=1)
-
-            conf = MC.layoutDialog(ui=self.checkboxPrompt, t='process is DONE')
-            if conf == 'open':
-                FILEBROWSER_PATH = os.path.join(os.getenv('WINDIR'), 'explorer.exe')
-                #print(shotsDir)
-                path = os.path.abspath(shotsDir)
-                if os.path.isdir(path):
-                    subprocess.call([FILEBROWSER_PATH, path])
-                elif os.path.isfile(path):
-                    subprocess.call([FILEBROWSER_PATH, '/select,', os.path.normpath(path)])
-            if conf!='continue':
-                if MC.window(self.__WINDOW_NAME, exists = True): MC.deleteUI(self.__WINDOW_NAME)                    
+                        onSaved = None
+                        if makeclean or prune:
+                            # shot files are cleaned by workers while the next ones are saved
+                            runner = self.cleanRunner(journal, shotFiles, cleanCommand, cleanArgs, progress.check)
+                            onSaved = lambda idx: self.submitClean(runner, journal, idx, shotFiles[idx], cleanCommand, cleanArgs)
+                        self.makeShotFiles(journal, shotsInfo, shifts if dooffset else None, startOffset, allanimCurvesinScene, shotType, progress, onSaved)
+                    progress.commit()
+                    MC.file( force=True, new=True )
+                    # flname = os.path.join(scene_path, scene_name)
+                    # MC.file(flname, open=True, force=True, options='v=0;', ignoreVersion=1, prompt=False, loadReferenceDepth='none', reserveNamespaces=1, typ='mayaAscii')
+            if progress.cancelled:
+                if runner is not None: runner.cancel()
+                return
+
+            if runner is not None:
+                # the progress is over, the panel cancels from here on
+                runner.check = None
+                runner.close()
+                self.runJobs(runner, 'Clean shot files', lambda runner: self.exportFinished(journal, shotsDir))
+            elif makeclean or prune:
+                self.cleanShotFiles(journal, shotFiles, cleanCommand, cleanArgs,
+                                    lambda runner: self.exportFinished(journal, shotsDir))
+            else:
+                self.exportFinished(journal, shotsDir)
 
         except Exception as e:
             # print(traceback.format_exc())
+            if runner is not None: runner.cancel()
             raise e
-        finally:
-            MC.refresh(su=False)
+
+    def reopenScene(self, sceneFile, currentFileName):
+        MC.file(sceneFile, open=True, force=True, options='v=0;', ignoreVersion=1, prompt=False)
+        MC.file(rename=currentFileName)
+
+    def makeShotFiles(self, journal, shotsInfo, shifts, startOffset, animCurves, shotType, progress, onSaved=None):
+        '''
+        Save every shot as a full copy of the scene, keys are shifted by the
+        shot offset when shifts are given. onSaved(idx) is called as soon as
+        a shot file is on disk.
+        '''
+        applied = 0
+        with progress.current().stage('Make Shot Files', weight=4, total=len(shotsInfo)) as st:
+            for idx, sh in enumerate(shotsInfo):
+                if journal.reached(idx, 'saved'):
+                    st.step()
+                    continue
+                progress.check()
+                if shifts is not None:
+                    MC.keyframe(e=1, time=(), relative=1, timeChange=shifts[idx] - applied, *animCurves)
+                    applied = shifts[idx]
+                flShInfo = [CO.shotFileInfo(sh, startOffset if shifts is not None else None)]
+                MM.eval('playbackOptions -min {0} -max {1} -ast {0} -aet {1}'.format(flShInfo[0]['start'], flShInfo[0]['stop']))
+                MC.file( rename=journal.shots[idx]['file'] )
+                self.generateTimeMarks(flShInfo)
+                self.saveData(flShInfo)
+                MC.file( save=True, type=shotType )
+                journal.mark(idx, 'saved')
+                if onSaved is not None: onSaved(idx)
+                st.step(status=sh['name'])
+
+    def makeThinShotFiles(self, journal, shotsInfo, shifts, startOffset, currentFileName, progress):
+        '''
+        Save the keyed scene once as the shot master, then write every shot
+        file as a small scene that references it with a time warp.
+        '''
+        master = TS.shotMasterPath(currentFileName)
+        MC.file(rename=master)
+        MC.file(force=True, save=True, options="v=0;", type="mayaAscii")
+        MC.file(rename=currentFileName)
+        header = TS.masterHeader(master)
+        with progress.current().stage('Write Thin Shot Files', weight=4, total=len(shotsInfo)) as st:
+            for idx, sh in enumerate(shotsInfo):
+                if journal.reached(idx, 'saved'):
+                    st.step()
+                    continue
+                progress.check()
+                shift = shifts[idx] if shifts is not None else 0
+                flShInfo = CO.shotFileInfo(sh, startOffset if shifts is not None else None)
+                TS.writeShotFile(journal.shots[idx]['file'], master, flShInfo, shift, header)
+                journal.mark(idx, 'saved', master=master)
+                st.step(status=sh['name'])
+
+    def queueShotFiles(self, journal, shotsInfo, startOffset, currentFileName, cleanArgs):
+        '''
+        Save the keyed scene as the shot master and queue one job per shot,
+        the shot files are made by queue workers on any machine.
+        startOffset is None when shots keep their own frames.
+        '''
+        queue = EQ.HZExportQueue(journal.settings['queue'])
+        master = TS.shotMasterPath(currentFileName)
+        if not os.path.isdir(os.path.dirname(master)): os.mkdir(os.path.dirname(master))
+        MC.file(rename=master)
+        MC.file(force=True, save=True, options="v=0;", type="mayaAscii")
+        MC.file(rename=currentFileName)
+        journal.data.setdefault('batch', '%s-%d' % (os.path.basename(currentFileName), journal.data['created']))
+        journal.save()
+        active = EQ.activeShots(queue, journal.data['batch'])
+        shifts = self.shotTimeShifts(shotsInfo, startOffset or 0)
+        count = 0
+        for idx, sh in enumerate(shotsInfo):
+            if journal.reached(idx, journal.finalState()) or idx in active: continue
+            shift = shifts[idx] if startOffset is not None else 0
+            flShInfo = CO.shotFileInfo(sh, startOffset)
+            fl = journal.shots[idx]['file']
+            queue.enqueue(os.path.basename(fl), EQ.shotSteps(master, fl, flShInfo, shift, cleanArgs),
+                          journal.data['batch'], {'idx': idx, 'file': fl, 'journal': journal.path})
+            count += 1
+        print ('HZ Shot Exporter => %d shot(s) queued in %s' % (count, queue.root))
+        MC.confirmDialog(t='Shots Queued', m='%d shot(s) have been queued in\n%s\n\nStart workers on any machine with:\n'
+                         'python HZExportQueue.py work "%s" --workers 4\n\nExport again to collect the results.'
+                         % (count, queue.root, queue.root), button=['OK'])
+
+    def runJobs(self, runner, title, onFinish):
+        # background jobs report to a non modal panel, batch mode has no UI so it just waits
+        JP = None
+        if not MC.about(batch=True):
+            try:
+                try:
+                    from . import HZJobPanel as JP
+                except (ImportError, ValueError):
+                    import HZJobPanel as JP
+            except ImportError as e:
+                # the panel is polled by a Qt timer, without PySide2 the jobs are waited for
+                MC.warning('HZ Shot Manager => no job panel (%s), waiting for the jobs' % e)
+        if JP is None:
+            # Esc cancels the jobs, onFinish still gets the runner like with the panel
+            with PG.HZProgress(title) as progress:
+                runner.wait(progress=progress)
+            return onFinish(runner)
+        JP.HZJobPanel(runner, title, onFinish).show()
+
+    def cleanShotFiles(self, journal, shotFiles, command, args, onFinish):
+        runner = JOB.HZJobRunner(journal.settings.get('workers', 1))
+        for idx, fl in enumerate(shotFiles):
+            self.submitClean(runner, journal, idx, fl, command, args)
+        print ('HZ Shot Exporter => Begin...')
+        self.runJobs(runner, 'Clean shot files', onFinish)
+
+    def cleanRunner(self, journal, shotFiles, command, args, check=None):
+        '''
+        Running clean workers that take shot files as they are saved, the
+        shots saved by an earlier run are submitted first. At most one shot
+        per worker waits in the queue, saving waits for a free worker and
+        calls `check` (Esc) while it waits.
+        '''
+        workers = journal.settings.get('workers', 1)
+        runner = JOB.HZJobRunner(workers, maxPending=workers, check=check).stream()
+        print ('HZ Shot Exporter => Begin...')
+        for idx, fl in enumerate(shotFiles):
+            self.submitClean(runner, journal, idx, fl, command, args)
+        return runner
+
+    def submitClean(self, runner, journal, idx, fl, command, args):
+        if journal.reached(idx, 'rewritten') or not journal.reached(idx, 'saved'): return
+        if journal.reached(idx, 'cleaned'):
+            self.rewriteShotFile(fl)
+            journal.mark(idx, 'rewritten')
+            return
+        runner.submit(os.path.basename(fl), command + [fl] + args, data=(idx, fl),
+                      postprocess=lambda job: self.rewriteShotFile(job.data[1]),
+                      onDone=lambda job: self.shotFileCleaned(journal, job, runner))
+
+    @staticmethod
+    def rewriteShotFile(fl):
+        (MB if fl.lower().endswith('.mb') else MA).fixDeferredReferences(fl)
+
+    def shotFileCleaned(self, journal, job, runner):
+        idx, fl = job.data
+        if job.state == 'done':
+            journal.mark(idx, 'rewritten')
+        else:
+            journal.fail(idx, job.error or job.state)
+        # shots end in any order, they are reported in shot order
+        for done in runner.inOrder():
+            if done.state == 'done':
+                print ('%s DONE' % os.path.basename(done.data[1]))
+            else:
+                print ("%s <<< file: %s" % (done.error or done.state, done.data[1]))
+
+    def validateShotFiles(self, journal, onFinish):
+        # shot files are streamed without Maya by mayapy, a Maya session would take minutes to open them
+        reportFile = VA.reportPath(journal.path)
+        script = os.path.join(os.path.dirname(__file__), 'HZShotValidator.py')
+        runner = JOB.HZJobRunner(1)
+        runner.submit('Validate shot files', [JOB.mayapyPath(), script, '--journal', journal.path,
+                                              '-j', str(journal.settings.get('workers', 1)), '--report', reportFile])
+        self.runJobs(runner, 'Validate shot files', lambda runner: onFinish(VA.loadReport(reportFile)))
+
+    def exportFinished(self, journal, shotsDir, *args):
+        validate = lambda *args: self.validateShotFiles(journal, lambda report: self.exportValidated(journal, shotsDir, report))
+        if not any(journal.reached(idx, 'saved') for idx in range(len(journal.shots))):
+            # no shot file has been made or found, there is nothing to validate
+            validate = lambda *args: self.exportValidated(journal, shotsDir, {'files': []})
+        if journal.data.get('cameras'):
+            self.cacheCameras(journal.data['cameras'], journal.settings.get('workers', 1), validate)
+        else:
+            validate()
+
+    def cacheCameras(self, prepared, workers=1, onFinish=None):
+        runner = JOB.HZJobRunner(workers)
+        if not CC.submitJobs(runner, prepared):
+            if onFinish is not None: onFinish(runner)
+            return
+        print ('HZ Shot Exporter => Camera caches...')
+        self.runJobs(runner, 'Camera caches', onFinish or (lambda runner: None))
+
+    def archiveShotFiles(self, *args):
+        # shot files of every version go in SHOTS/ARCHIVE, stored once per distinct chunk,
+        # only the latest version of every shot stays in SHOTS
+        shotsDir = os.path.join(os.path.dirname(MC.file(query=True, l=True)[0]), "SHOTS")
+        if not os.path.isdir(shotsDir):
+            MC.warning("no SHOTS folder found!")
+            return
+        script = os.path.join(os.path.dirname(__file__), 'HZShotArchive.py')
+        runner = JOB.HZJobRunner(1)
+        runner.submit('Archive shot files', [JOB.mayapyPath(), script, 'add', '--remove', '--keep-latest', shotsDir])
+        self.runJobs(runner, 'Archive shot files', lambda runner: sys.stdout.write('\n'.join(runner.jobs[0].output[-2:]) + '\n'))
+
+    def exportCameraCaches(self, *args):
+        currentFileName = MC.file(query=True, l=True)[0]
+        shotsInfo = self.loadData()
+        if not shotsInfo:
+            MC.warning("no shots info found!")
+            return
+        shifts = None
+        if MC.intField(self.expoOfset, q=1, en=1):
+            shifts = self.shotTimeShifts(shotsInfo, MC.intField(self.expoOfset, q=1, value=1) or 0)
+        prepared = CC.prepareJobs(currentFileName, shotsInfo, shifts, MC.nameField(self.objsName, q=1, object=1) or None)
+        if prepared is None:
+            print ('HZ Shot Exporter => Camera caches are up to date.')
+            return
+        self.cacheCameras(prepared, MC.intField(self.cleanWorkers, q=1, value=1))
+
+    def recoverShots(self, *args):
+        camera = MC.nameField(self.objsName, q=1, object=1)
+        if not camera or not MC.attributeQuery('HZTickColor', ex=True, n=camera):
+            camera = CC.findCamera()
+        if not camera:
+            MC.warning('no animation camera found, set it up with Setup Animation Camera first')
+            return
+        started = time.time()
+        shots = RV.recoverShots(camera, MC.intField(self.shotNum, q=1, value=1) or 1)
+        print ('HZ Shot Manager => %d shot(s) found on %s in %.3fs' % (len(shots), camera, time.time() - started))
+        if not shots:
+            MC.warning('no shot boundary keys found on %s' % camera)
+            return
+        existing = len(self.loadData() or [])
+        if MC.layoutDialog(ui=lambda: self.recoverPrompt(shots, camera, existing), t='Recover Shots') != 'write':
+            return
+        with BE.HZBulkEdit(undo='chunk'):
+            self.saveData(shots)
+            self.generateTimeMarks(shots)
+        if getattr(self, 'shotTable', None) is not None:
+            self.shotTable.model.reload()
+
+    def recoverPrompt(self, shots, camera, existing):
+        form = MC.setParent(q=True)
+        MC.formLayout(form, e=True, width=320)
+        t = MC.text(l='%d shot(s) found on %s' % (len(shots), camera), font='boldLabelFont', al='left')
+        t2 = MC.text(al='left', l='The %d shot(s) of the scene data will be replaced.' % existing if existing
+                     else 'The scene has no shot data.')
+        lst = MC.textScrollList(h=300, append=['%s    %d - %d    (%d)' % (sh['name'], sh['start'], sh['stop'], sh['stop'] - sh['start'] + 1)
+                                              for sh in shots])
+        b1 = MC.button(l='Write Shots', c='maya.cmds.layoutDialog( dismiss="write" )')
+        b2 = MC.button(l='Cancel', c='maya.cmds.layoutDialog( dismiss="cancel" )')
+        spacer = top = edge = 5
+        MC.formLayout(form, edit=True,
+                        attachForm=[(t, 'top', top), (t, 'left', edge), (t, 'right', edge), (t2, 'left', edge), (t2, 'right', edge),
+                                    (lst, 'left', edge), (lst, 'right', edge), (b1, 'left', edge), (b2, 'right', edge), (b1, 'bottom', edge), (b2, 'bottom', edge)],
+                        attachControl=[(t2, 'top', spacer, t), (lst, 'top', spacer, t2), (lst, 'bottom', spacer*2, b1)],
+                        attachNone=[(t, 'bottom'), (t2, 'bottom'), (b1, 'top'), (b2, 'top')],
+                        attachPosition=[(b1, 'right', spacer, 50), (b2, 'left', spacer, 50)])
+
+    def exportValidated(self, journal, shotsDir, report):
+        print ('HZ Shot Exporter => Finish.')
+        failed = 0
+        skipped = 0
+        if report is None:
+            MC.warning('Shot files could not be validated, see %s' % VA.reportPath(journal.path))
+        else:
+            # a file that was not checked keeps the export unfinished, it is checked again on resume
+            skipped = len([result for result in report['files'] if result['status'] == 'skipped'])
+            if skipped:
+                MC.warning('%d shot file(s) could not be validated, see %s' % (skipped, VA.reportPath(journal.path)))
+            unchecked = sorted(set(check for result in report['files'] for check in result.get('unchecked', ())))
+            if unchecked:
+                MC.warning('mayaBinary shot files are not checked for: %s' % ', '.join(unchecked))
+            indices = dict((os.path.normcase(shot['file']), idx) for idx, shot in enumerate(journal.shots))
+            for result in report['files']:
+                if result['status'] != 'fail': continue
+                failed += 1
+                print ('%s INVALID: %s' % (os.path.basename(result['file']), '; '.join(result['errors'])))
+                idx = indices.get(os.path.normcase(result['file']))
+                # a resumed export makes invalid shots again
+                if idx is not None: journal.mark(idx, 'pending', error='; '.join(result['errors']))
+            if failed:
+                MC.warning('%d shot file(s) failed validation, see %s' % (failed, VA.reportPath(journal.path)))
+        if not failed and not skipped and report is not None and journal.firstIncomplete(journal.finalState()) is None:
+            journal.finish()
+
+        conf = MC.layoutDialog(ui=self.checkboxPrompt, t='process is DONE')
+        if conf == 'open':
+            FILEBROWSER_PATH = os.path.join(os.getenv('WINDIR'), 'explorer.exe')
+            #print(shotsDir)
+            path = os.path.abspath(shotsDir)
+            if os.path.isdir(path):
+                subprocess.call([FILEBROWSER_PATH, path])
+            elif os.path.isfile(path):
+                subprocess.call([FILEBROWSER_PATH, '/select,', os.path.normpath(path)])
+        if conf!='continue':
+            if MC.window(self.__WINDOW_NAME, exists = True): MC.deleteUI(self.__WINDOW_NAME)                    
 
     def getCurrentCamera(self, ):
         '''
@@ -536,16 +836,19 @@ class HZShotManager:
             self.TU_audioOffsetSec = str((rFrom - audioOffset)/-fps)
 
         shotsInfo =  self.loadData()
-        for sh in shotsInfo:
-            if self.checkProgressEscape(): return
-            rFrom = sh['start']
-            rTo   = sh['stop']
-            epName = "EP" + (scene_name.split('_')[1])
-            shName = "SH" + (str(sh['name']).split('_')[1])
-            movieFile = os.path.abspath( os.path.join(current_project, "movies/%s_%s_ANI_v001.mov"%(epName, shName) ))
-            movieName = MC.playblast( filename = movieFile , startTime=rFrom ,endTime=rTo , format="qt",
-                                forceOverwrite=True, viewer=0, showOrnaments=0, offScreen=True, fp=4, percent=100, 
-                                compression="H.264", quality=100, widthHeight=[1280,720], clearCache=True)
+        movieName = None
+        with PG.HZProgress('Sequence Blast', total=len(shotsInfo)) as progress:
+            for sh in shotsInfo:
+                progress.check()
+                rFrom = sh['start']
+                rTo   = sh['stop']
+                epName = "EP" + (scene_name.split('_')[1])
+                shName = "SH" + (str(sh['name']).split('_')[1])
+                movieFile = os.path.abspath( os.path.join(current_project, "movies/%s_%s_ANI_v001.mov"%(epName, shName) ))
+                movieName = MC.playblast( filename = movieFile , startTime=rFrom ,endTime=rTo , format="qt",
+                                    forceOverwrite=True, viewer=0, showOrnaments=0, offScreen=True, fp=4, percent=100, 
+                                    compression="H.264", quality=100, widthHeight=[1280,720], clearCache=True)
+                progress.step(status=sh['name'])
         print("%s"%movieName,'i')
         # if movieName: 
         #     self.TU_movie = "%s.%s-%s#.mov"%(movieName.split(".")[0], int(rFrom), int(rTo))
@@ -558,22 +861,22 @@ class HZShotManager:
         # save = aToolsMod.getUserPref("saveAfterPlayblasting", default=True)
         # if save and not rangeVisible: MC.file(save=True)   
 
-    def loadTextdata(self, *args):
-        jsonText = json.dumps(self.loadData(), sort_keys=True, indent=2, separators=(',', ': '))
-        MC.scrollField(self.txt_alldata, e=1, text=jsonText)
+    def toggleShotFileSteps(self, state):
+        if state:
+            MC.checkBoxGrp(self.chk_steps, e=1, en3=1)
+            MC.checkBox(self.chk_prune, e=1, en=1)
+            MC.checkBox(self.chk_thin, e=1, en=1)
+        else:
+            MC.checkBoxGrp(self.chk_steps, e=1, en3=0, v3=0)
+            MC.checkBox(self.chk_prune, e=1, en=0, v=0)
+            MC.checkBox(self.chk_thin, e=1, en=0, v=0)
+        self.toggleThinShots(MC.checkBox(self.chk_thin, q=1, v=1))
 
-    def saveTextdata(self, *args):
-        newData = MC.scrollField(self.txt_alldata, q=1, text=1)
-        newData = ("".join(newData.strip()).encode('ascii', 'ignore').decode("utf-8")).replace("\\","")
-        if not newData: 
-            return MC.warning('No new Data Saved!')
-        try:
-            newdt = json.loads(newData)
-            self.saveData(newdt)
-            self.loadTextdata()
-            print("New Data replaced successfuly."),
-        except ValueError as e:
-            return MC.error('Data Has Error in reading. No new Data Saved!')
+    def toggleThinShots(self, state):
+        # thin shot files are plain mayaAscii with nothing to clean
+        MC.checkBoxGrp(self.chk_steps, e=1, en3=not state and MC.checkBoxGrp(self.chk_steps, q=1, v2=1))
+        MC.checkBox(self.chk_prune, e=1, en=not state and MC.checkBoxGrp(self.chk_steps, q=1, v2=1))
+        MC.checkBox(self.chk_binary, e=1, en=not state)
 
     def checkboxPrompt(self):
         form = MC.setParent(q=True)
@@ -676,8 +979,31 @@ class HZShotManager:
                                                 'Create every shots and make unique file for each', 
                                                 'Clean any keyframes out of own time range.'],
                                     valueArray3=[True]*3 , cl3=['left']*3, 
-                                    of2=lambda *args: MC.checkBoxGrp(self.chk_steps, e=1, en3=0, v3=0), 
-                                    on2=lambda *args: MC.checkBoxGrp(self.chk_steps, e=1, en3=1), )
+                                    of2=lambda *args: self.toggleShotFileSteps(False), 
+                                    on2=lambda *args: self.toggleShotFileSteps(True), )
+        self.chk_reduce = MC.checkBox(l='Reduce redundant keys after Set Keyframes', v=0, al='left',
+                                    ann='Remove keys that do not change the animation, shot boundary holds are kept.')
+        self.chk_prune = MC.checkBox(l='Prune curves without animation in shot range', v=0, al='left',
+                                    ann='Delete or bake to static values curves that do not change in the shot range, '
+                                        'a report is written next to each shot file.')
+        self.chk_binary = MC.checkBox(l='Save shot files as mayaBinary (.mb)', v=0, al='left')
+        self.chk_cameras = MC.checkBox(l='Camera caches (Alembic) for every shot', v=0, al='left',
+                                       ann='CAMERAS/<shot>_CAM_<version>.abc with the export offset, '
+                                           'shots whose camera has not changed are skipped.')
+        with self.HZCRow(exporterTabForm, 3, [160,75,10], adjustableColumn=2):
+            self.chk_queue = MC.checkBox(l='Export with queue folder:', v=0,
+                                         ann='Shot files are made by HZExportQueue workers, on this or other machines',
+                                         cc=lambda state: MC.textField(self.queueDir, e=1, en=state))
+            self.queueDir = MC.textField(en=0, text=os.environ.get('HZ_EXPORT_QUEUE', ''))
+            MC.text(l='')
+        self.chk_thin = MC.checkBox(l='Thin shot files (reference a shot master)', v=0, al='left',
+                                    ann='Every shot file only references SHOTS/<scene>_SHOTMASTER.ma with a time warp, '
+                                        'fixes in the master show up in every shot.',
+                                    cc=lambda state: self.toggleThinShots(state))
+        with self.HZCRow(exporterTabForm, 3, [160,75,10], adjustableColumn=3):
+            MC.text(l='Parallel clean workers:', ann='Shot files are cleaned in background by this many mayapy processes')
+            self.cleanWorkers = MC.intField(v=2, min=1, max=16)
+            MC.text(l='')
         MC.button(c=self.exportShots, l="EXPORT Shots", backgroundColor= self.hex2rgb('ff0040') , w=120, h=50)
         MC.text(l="", h=1)
         MC.setParent( u=1 )
@@ -691,16 +1017,29 @@ class HZShotManager:
                     "HZShotManager makes timeline marker using that."
                 , c=self.generateTimeMarks )
         MC.button(l="Set Keyframes for Shots", ann='Set keyframe everytings at start and end of shot.', h=40, c=self.setKeyShots, bgc=self.hex2rgb('003311'))
+        MC.button(l="Reduce Redundant Keys", ann='Remove keys that do not change the animation of selected or all curves.', h=40, c=self.reduceKeys, bgc=self.hex2rgb('003311'))
+        MC.button(l="Export Camera Caches", ann='Alembic camera of every shot in CAMERAS folder, with the export offset.', h=40, c=self.exportCameraCaches, bgc=self.hex2rgb('003311'))
+        MC.button(l="Recover Shots From Camera", ann='Rebuild lost shot data from the shot boundary keys of the animation camera.', h=40, c=self.recoverShots, bgc=self.hex2rgb('003311'))
+        MC.button(l="Archive Shot Files", ann='Store every shot file version in SHOTS/ARCHIVE, identical parts are stored once.', h=40, c=self.archiveShotFiles, bgc=self.hex2rgb('003311'))
         MC.button(l="Create Sequence Blasts", ann='Select Camera first...', h=40, c=self.squenceBlast, bgc=self.hex2rgb('330011'))
         MC.setParent( u=1 )
 
         editTab = MC.columnLayout(adj=1,columnWidth=windowWidth,columnAttach=('both', 5), rowSpacing=10)
-        MC.text(l="", h=5)
-        self.txt_alldata = MC.scrollField( editable=True, wordWrap=False, font='smallFixedWidthFont' )
-        with self.HZCRow(editTab, 3, [100,75,100], adjustableColumn=3):
-            MC.button(c=self.loadTextdata, l="Load Data", backgroundColor= self.hex2rgb('00bfff') , w=120, h=20)
-            MC.text(l='')
-            MC.button(c=self.saveTextdata, l="Save Data", backgroundColor= self.hex2rgb('ff0040') , w=120, h=20)
+        # the Qt table needs a live window, it is imported only when the UI is built
+        self.shotTable = None
+        try:
+            try:
+                from . import HZShotTable as ST
+            except (ImportError, ValueError):
+                import HZShotTable as ST
+        except ImportError as e:
+            # no PySide2/shiboken2 in this Maya, the other tabs still work
+            MC.text(l='The shot table is not available in this Maya:\n%s' % e, al='left', ww=True)
+            MC.columnLayout(editTab, e=True, enable=False)
+            MC.warning('HZ Shot Manager => Data tab disabled, %s' % e)
+        else:
+            self.shotTable = ST.HZShotTable(self.__shotsInfoKey).embed(editTab)
+            self.shotTable.model.reload()
         MC.setParent( u=1 )
 
         MC.tabLayout( tabs, edit=True, tabLabel=((creatorTab,'Create Shots'), (exporterTabForm,'Export Shots'),
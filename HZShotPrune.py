@@ -0,0 +1,136 @@
+# creation date : 19 October, 2026
+#
+# Description :
+#    Prune animation that is irrelevant to a shot file.
+#    Curves without keys in the shot range are deleted, curves that hold one
+#    value over the whole range are baked to that value, then the nodes left
+#    behind without inputs or outputs are removed. Runs from the batch cleaner
+#    after (or instead of) the out of range clean.
+#
+
+import json, os
+from maya import cmds
+
+ANIMCURVE_TYPES = ['animCurveTL', 'animCurveTA', 'animCurveTU']
+# intermediate nodes that are useless once their curves are gone
+DANGLING_TYPES = ['unitConversion', 'pairBlend', 'blendWeighted']
+# tangents that stay flat between keys of the same value whatever the other keys are,
+# other tangents (spline, auto...) follow the next keys and must have zero angles
+FLAT_TANGENTS = ('linear', 'flat', 'step')
+
+
+def _destinations(curve):
+    # final attributes driven by the curve, following unit conversions
+    plugs = []
+    pending = cmds.listConnections('%s.output' % curve, plugs=True, source=False, destination=True, skipConversionNodes=True) or []
+    for plug in pending:
+        node = plug.split('.', 1)[0]
+        if cmds.nodeType(node) in ('reference', ) or cmds.nodeType(node).startswith('animBlendNode'):
+            return None
+        plugs.append(plug)
+    return plugs
+
+
+def constantValue(curve, start, stop, tolerance=1e-5):
+    '''
+    Value of the curve if it does not change between start and stop, else None.
+    Keys in the range and the closest key on each side must share one value
+    and have tangents that stay flat between them: flat tangent types, or
+    tangent angles of 0.
+    '''
+    times = cmds.keyframe(curve, q=True, tc=True) or []
+    if not times:
+        return None
+    values = cmds.keyframe(curve, q=True, vc=True)
+    inTangents = cmds.keyTangent(curve, q=True, itt=True)
+    outTangents = cmds.keyTangent(curve, q=True, ott=True)
+    before = [i for i, t in enumerate(times) if t < start]
+    after = [i for i, t in enumerate(times) if t > stop]
+    used = [i for i, t in enumerate(times) if start <= t <= stop]
+    if before: used.insert(0, before[-1])
+    if after: used.append(after[0])
+    first = values[used[0]]
+    inAngles = outAngles = None
+    for i in used:
+        if abs(values[i] - first) > tolerance:
+            return None
+        if inTangents[i] not in FLAT_TANGENTS or outTangents[i] not in FLAT_TANGENTS:
+            if inAngles is None:
+                inAngles = cmds.keyTangent(curve, q=True, ia=True)
+                outAngles = cmds.keyTangent(curve, q=True, oa=True)
+            if abs(inAngles[i]) > tolerance or abs(outAngles[i]) > tolerance:
+                return None
+    # infinity only matters when the range goes past the keys
+    if not before and cmds.getAttr('%s.preInfinity' % curve) != 0 and times[0] > start:
+        return None
+    if not after and cmds.getAttr('%s.postInfinity' % curve) != 0 and times[-1] < stop:
+        return None
+    return first
+
+
+def pruneAnimation(start, stop, curves=None, bake=True, tolerance=1e-5):
+    '''
+    Remove curves that are irrelevant to the start/stop range of the shot.
+    Returns a report dict of what has been removed.
+    '''
+    report = {'range': [start, stop], 'deleted': [], 'baked': {}, 'dangling': [], 'kept': 0}
+    if curves is None:
+        curves = cmds.ls(type=ANIMCURVE_TYPES) or []
+    toDelete = []
+    for curve in curves:
+        if cmds.referenceQuery(curve, isNodeReferenced=True):
+            report['kept'] += 1
+            continue
+        times = cmds.keyframe(curve, q=True, tc=True) or []
+        if not times:
+            toDelete.append(curve)
+            report['deleted'].append(curve)
+            continue
+        value = constantValue(curve, start, stop, tolerance) if bake else None
+        plugs = _destinations(curve) if value is not None else None
+        if value is None or plugs is None:
+            report['kept'] += 1
+            continue
+        if any(cmds.getAttr(plug, lock=True) for plug in plugs):
+            report['kept'] += 1
+            continue
+        for plug in plugs:
+            # the plug can be driven through a unit conversion
+            for source in cmds.listConnections(plug, source=True, destination=False, plugs=True) or []:
+                cmds.disconnectAttr(source, plug)
+            cmds.setAttr(plug, value)
+        toDelete.append(curve)
+        report['baked'][curve] = {'value': value, 'plugs': plugs}
+    if toDelete:
+        cmds.delete(toDelete)
+    report['dangling'] = deleteDanglingNodes()
+    return report
+
+
+def deleteDanglingNodes(nodeTypes=DANGLING_TYPES):
+    '''
+    Delete intermediate nodes without inputs or without outputs, repeated
+    until nothing more is left behind.
+    '''
+    deleted = []
+    while True:
+        dangling = []
+        for node in cmds.ls(type=nodeTypes) or []:
+            if cmds.referenceQuery(node, isNodeReferenced=True):
+                continue
+            inputs = cmds.listConnections(node, source=True, destination=False)
+            outputs = cmds.listConnections(node, source=False, destination=True)
+            if not inputs or not outputs:
+                dangling.append(node)
+        if not dangling:
+            return deleted
+        cmds.delete(dangling)
+        deleted.extend(dangling)
+
+
+def writeReport(filename, report):
+    reportFile = os.path.splitext(filename)[0] + '_prune.json'
+    report = dict(report, file=os.path.basename(filename))
+    with open(reportFile, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    return reportFile
@@ -0,0 +1,112 @@
+# creation date : 19 October, 2026
+#
+# Description :
+#    Rebuild the shot data from the animation camera when it has been lost.
+#    createShots keys translate, rotate, HZTickColor and FL of the camera at
+#    the first and last frame of every shot. The key times of those curves
+#    are read once, the times keyed on all of them are the shot boundaries
+#    (the HZTickColor curve alone when it has them) and they are paired in
+#    order, start and stop. Single frame shots have one key only, they are
+#    found by keeping shots next to each other (a shot starting one frame
+#    after the previous key) wherever the keys allow it, so shots with gaps
+#    between them are recovered too.
+#    Names and colors are given the way createShots does.
+#
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    from maya import cmds as MC
+except ImportError:
+    MC = None
+
+try:
+    from . import HZShotCore as CO
+except (ImportError, ValueError):
+    import HZShotCore as CO
+
+BOUNDARY_ATTRS = ('translateX', 'translateY', 'translateZ', 'rotateX', 'rotateY', 'rotateZ', 'HZTickColor', 'FL')
+MARKER_ATTR = 'HZTickColor'
+# setupAnimCam keys HZTickColor far before any shot so the curve exists
+SENTINEL_TIME = -50000
+
+
+def boundaryTimes(curveTimes, marker=None):
+    '''
+    Sorted frames keyed on every curve of {attr: times}. The marker curve is
+    used alone when it has at least one shot on it, other curves may have
+    lost boundary keys to key reduction.
+    '''
+    if marker is not None:
+        times = [t for t in curveTimes.get(marker) or [] if t > SENTINEL_TIME]
+        if len(times) >= 2:
+            curveTimes = {marker: times}
+    keyed = [times for times in curveTimes.values() if times]
+    if not keyed:
+        return []
+    if numpy is not None:
+        common = numpy.round(numpy.asarray(keyed[0], dtype=float))
+        for times in keyed[1:]:
+            common = numpy.intersect1d(common, numpy.round(numpy.asarray(times, dtype=float)))
+        return [int(t) for t in common if t > SENTINEL_TIME]
+    common = set(int(round(t)) for t in keyed[0])
+    for times in keyed[1:]:
+        common.intersection_update(int(round(t)) for t in times)
+    return sorted(t for t in common if t > SENTINEL_TIME)
+
+
+def shotRanges(times):
+    '''
+    (start, stop) of the shots whose boundaries are the sorted key `times`.
+    Keys are paired in order, a key is a single frame shot when that gives
+    fewer gaps between shots (then fewer single frame shots).
+    '''
+    times = [int(t) for t in times]
+    count = len(times)
+    # best[i] is (gaps, single frame shots, take a pair) for the keys from i on
+    best = [(0, 0, False)] * (count + 2)
+    for i in range(count - 1, -1, -1):
+        gap = 1 if i and times[i] - times[i - 1] != 1 else 0
+        single = (gap + best[i + 1][0], best[i + 1][1] + 1, False)
+        pair = (gap + best[i + 2][0], best[i + 2][1], True) if i + 1 < count else None
+        best[i] = pair if pair is not None and pair[:2] <= single[:2] else single
+    ranges = []
+    i = 0
+    while i < count:
+        if best[i][2]:
+            ranges.append((times[i], times[i + 1]))
+            i += 2
+        else:
+            ranges.append((times[i], times[i]))
+            i += 1
+    return ranges
+
+
+def shotsFromRanges(ranges, startShotNum=1):
+    return [{'name': CO.shotName(idx, startShotNum), 'start': start, 'stop': stop, 'color': CO.shotColor(idx)}
+            for idx, (start, stop) in enumerate(ranges)]
+
+
+def readKeyTimes(camera):
+    '''
+    {attr: key times} of the boundary attributes of the camera.
+    '''
+    curveTimes = {}
+    for attr in BOUNDARY_ATTRS:
+        if not MC.attributeQuery(attr, exists=True, node=camera):
+            continue
+        curves = MC.listConnections('%s.%s' % (camera, attr), source=True, destination=False, type='animCurve')
+        if curves:
+            curveTimes[attr] = MC.keyframe(curves[0], q=True, tc=True) or []
+    return curveTimes
+
+
+def recoverShots(camera, startShotNum=1):
+    '''
+    Shot list rebuilt from the camera keys, nothing is written to the scene.
+    '''
+    ranges = shotRanges(boundaryTimes(readKeyTimes(camera), MARKER_ATTR))
+    return shotsFromRanges(ranges, startShotNum)
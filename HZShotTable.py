@@ -0,0 +1,281 @@
+# creation date : 19 October, 2026
+#
+# Description :
+#    Shot table editor of the Data tab. The shots of the HZShotsData node are
+#    shown in a Qt table: rows are read in batches while the view scrolls,
+#    columns can be sorted and names filtered. The ranges of all shots are
+#    read at once, shots that overlap or leave a gap after the previous shot
+#    in time are highlighted even before their rows are read, cells are checked
+#    when they are edited and only edited rows are written back to the node
+#    on save, in one undo chunk.
+#
+
+from maya import cmds as MC
+from maya import OpenMayaUI as OMUI
+from PySide2 import QtCore, QtGui, QtWidgets
+from shiboken2 import wrapInstance
+
+try:
+    from . import HZShotData as SD, HZBulkEdit as BE, HZShotCore as CO
+except (ImportError, ValueError):
+    import HZShotData as SD, HZBulkEdit as BE, HZShotCore as CO
+
+# shot dict key, header
+COLUMNS = (('name', 'Name'), ('start', 'Start'), ('stop', 'Stop'), ('length', 'Length'), ('color', 'Color'))
+COLOR_COLUMN = 4
+# rows read from the node each time the view needs more
+BATCH = 200
+ISSUE_COLORS = {'error': '#7a2020', 'warning': '#6b5a12'}
+
+
+class HZShotTableModel(QtCore.QAbstractTableModel):
+    editsChanged = QtCore.Signal(int)
+
+    def __init__(self, legacyKey=SD.LEGACY_KEY, parent=None):
+        QtCore.QAbstractTableModel.__init__(self, parent)
+        self.legacyKey = legacyKey
+        self.node = None
+        self.indices = []
+        self.shots = []
+        # name, start and stop of every shot, loaded or not, for the range checks
+        self.ranges = []
+        self.edits = {}
+        self.issues = {}
+        self._legacy = None
+
+    def reload(self):
+        self.beginResetModel()
+        self.node = SD.findNode()
+        if self.node is None:
+            # old scenes keep all shots in one fileInfo json, it is read at once anyway
+            self._legacy = SD.readShots(self.legacyKey)
+            self.indices = list(range(len(self._legacy)))
+            self.ranges = [dict((key, sh[key]) for key in ('name', 'start', 'stop')) for sh in self._legacy]
+        else:
+            self._legacy = None
+            self.indices = MC.getAttr('%s.shots' % self.node, multiIndices=True) or []
+            self.ranges = SD.readRanges(self.indices, self.node)
+        self.shots = []
+        self.edits = {}
+        self.issues = {}
+        self.endResetModel()
+        self.editsChanged.emit(0)
+        self.fetchMore(QtCore.QModelIndex())
+        self.validate()
+
+    def _readShot(self, idx):
+        if self._legacy is not None:
+            return dict(self._legacy[idx])
+        return SD.readShot(idx, self.node)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.shots)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and len(self.shots) < len(self.indices)
+
+    def fetchMore(self, parent):
+        if not self.canFetchMore(parent):
+            return
+        first = len(self.shots)
+        last = min(len(self.indices), first + BATCH)
+        self.beginInsertRows(QtCore.QModelIndex(), first, last - 1)
+        self.shots.extend(self._readShot(idx) for idx in self.indices[first:last])
+        self.endInsertRows()
+
+    def fetchAll(self):
+        # sorting and filtering have to see every shot
+        while self.canFetchMore(QtCore.QModelIndex()):
+            self.fetchMore(QtCore.QModelIndex())
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role != QtCore.Qt.DisplayRole:
+            return None
+        if orientation == QtCore.Qt.Horizontal:
+            return COLUMNS[section][1]
+        return section + 1
+
+    def flags(self, index):
+        flags = QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
+        # colors are picked with a color dialog, length follows start and stop
+        if COLUMNS[index.column()][0] not in ('length', 'color'):
+            flags |= QtCore.Qt.ItemIsEditable
+        return flags
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, key = index.row(), COLUMNS[index.column()][0]
+        sh = self.shots[row]
+        if role in (QtCore.Qt.DisplayRole, QtCore.Qt.EditRole):
+            if key == 'length':
+                return sh['stop'] - sh['start'] + 1
+            if key == 'color':
+                return None if role == QtCore.Qt.DisplayRole else sh['color']
+            return sh[key]
+        if role == QtCore.Qt.DecorationRole and key == 'color':
+            return QtGui.QColor.fromRgbF(*[min(1.0, max(0.0, c)) for c in sh['color']])
+        if role == QtCore.Qt.BackgroundRole and row in self.issues:
+            return QtGui.QColor(ISSUE_COLORS[self.issues[row][0]])
+        if role == QtCore.Qt.ToolTipRole and row in self.issues:
+            return self.issues[row][1]
+        if role == QtCore.Qt.FontRole and key in self.edits.get(row, ()):
+            font = QtGui.QFont()
+            font.setBold(True)
+            return font
+        return None
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        if not index.isValid() or role != QtCore.Qt.EditRole:
+            return False
+        row, key = index.row(), COLUMNS[index.column()][0]
+        sh = self.shots[row]
+        try:
+            value = self.checkValue(sh, key, value)
+        except ValueError as e:
+            MC.warning('%s: %s' % (sh['name'], e))
+            return False
+        if value == sh[key]:
+            return False
+        sh[key] = value
+        if key in self.ranges[row]:
+            self.ranges[row][key] = value
+        self.edits.setdefault(row, {})[key] = value
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(COLUMNS) - 1))
+        self.editsChanged.emit(len(self.edits))
+        if key in ('start', 'stop'):
+            self.validate()
+        return True
+
+    def checkValue(self, sh, key, value):
+        if key == 'name':
+            value = str(value).strip()
+            if not value:
+                raise ValueError('shot name can not be empty')
+            return value
+        if key == 'color':
+            if isinstance(value, QtGui.QColor):
+                value = value.getRgbF()[:3]
+            return [round(float(c), 4) for c in value]
+        value = int(value)
+        start, stop = (value, sh['stop']) if key == 'start' else (sh['start'], value)
+        if stop < start:
+            raise ValueError('stop frame %d would be before start frame %d' % (stop, start))
+        return value
+
+    def validate(self):
+        # every shot is checked, rows that are not read yet show their issue once they are
+        issues = CO.shotIssues(self.ranges)
+        changed = [row for row in set(issues) | set(self.issues) if issues.get(row) != self.issues.get(row)]
+        self.issues = issues
+        for row in changed:
+            if row >= len(self.shots):
+                continue
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(COLUMNS) - 1))
+
+    def save(self):
+        '''
+        Write the edited rows back to the node, returns how many were saved.
+        '''
+        count = len(self.edits)
+        if not count:
+            return 0
+        with BE.HZBulkEdit(undo='chunk'):
+            if self.node is None:
+                # the first save moves the old json data to the node
+                self.fetchAll()
+                SD.writeShots(self.shots, self.legacyKey)
+            else:
+                for row, fields in sorted(self.edits.items()):
+                    SD.updateShot(self.indices[row], self.node, **fields)
+        if self.node is None:
+            self.reload()
+            return count
+        self.edits = {}
+        self.editsChanged.emit(0)
+        if self.shots:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.shots) - 1, len(COLUMNS) - 1))
+        return count
+
+
+class HZShotTable(QtWidgets.QWidget):
+    def __init__(self, legacyKey=SD.LEGACY_KEY, parent=None):
+        QtWidgets.QWidget.__init__(self, parent)
+        self.model = HZShotTableModel(legacyKey, self)
+        self.proxy = QtCore.QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.setFilterKeyColumn(0)
+        self.proxy.setFilterCaseSensitivity(QtCore.Qt.CaseInsensitive)
+
+        self.txt_filter = QtWidgets.QLineEdit()
+        self.txt_filter.setPlaceholderText('Filter shot names...')
+        self.txt_filter.textChanged.connect(self.setFilter)
+        self.view = QtWidgets.QTableView()
+        self.view.setModel(self.proxy)
+        self.view.setSortingEnabled(True)
+        self.view.sortByColumn(-1, QtCore.Qt.AscendingOrder)
+        self.view.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.view.verticalHeader().setDefaultSectionSize(20)
+        self.view.horizontalHeader().setStretchLastSection(True)
+        self.view.horizontalHeader().sortIndicatorChanged.connect(lambda *args: self.model.fetchAll())
+        self.view.doubleClicked.connect(self.pickColor)
+        self.view.setMinimumHeight(300)
+
+        btn_reload = QtWidgets.QPushButton('Reload')
+        btn_reload.clicked.connect(self.reload)
+        self.btn_save = QtWidgets.QPushButton('Save')
+        self.btn_save.clicked.connect(self.save)
+        self.model.editsChanged.connect(self.editsChanged)
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.txt_filter)
+        layout.addWidget(self.view)
+        buttons = QtWidgets.QHBoxLayout()
+        buttons.addWidget(btn_reload)
+        buttons.addStretch()
+        buttons.addWidget(self.btn_save)
+        layout.addLayout(buttons)
+        self.editsChanged(0)
+
+    def reload(self, *args):
+        if self.model.edits:
+            conf = MC.confirmDialog(t='Reload Shots', m='%d edited shot(s) are not saved, discard them?' % len(self.model.edits),
+                                    button=['Discard', 'Cancel'], defaultButton='Cancel',
+                                    cancelButton='Cancel', dismissString='Cancel')
+            if conf != 'Discard': return
+        self.model.reload()
+
+    def save(self, *args):
+        count = self.model.save()
+        if count:
+            print('%d edited shot(s) saved.' % count)
+
+    def setFilter(self, text):
+        self.model.fetchAll()
+        self.proxy.setFilterWildcard(text)
+
+    def editsChanged(self, count):
+        self.btn_save.setText('Save (%d edited)' % count if count else 'Save')
+        self.btn_save.setEnabled(bool(count))
+
+    def pickColor(self, proxyIndex):
+        if proxyIndex.column() != COLOR_COLUMN:
+            return
+        index = self.proxy.mapToSource(proxyIndex)
+        current = self.model.data(index, QtCore.Qt.DecorationRole)
+        color = QtWidgets.QColorDialog.getColor(current, self, 'Shot Color')
+        if color.isValid():
+            self.model.setData(index, color)
+
+    def embed(self, mayaLayout):
+        '''
+        Put the table in a Maya layout made with cmds.
+        '''
+        ptr = OMUI.MQtUtil.findLayout(mayaLayout)
+        parent = wrapInstance(int(ptr), QtWidgets.QWidget)
+        parent.layout().addWidget(self)
+        return self
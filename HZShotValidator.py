@@ -0,0 +1,242 @@
+# creation date : 19 October, 2026
+#
+# Description :
+#    Check exported shot files without Maya. Every .ma shot file is streamed
+#    once and checked for:
+#      - shot data, and a playback range equal to the shot range
+#      - keys of anim curves outside the range (the clean step has failed)
+#      - `file -rdi ... -dr 1` lines left (the reference rewrite was missed)
+#      - a truncated file, without the `// End of` line Maya writes last
+#    .mb shot files are checked for truncation, deferred nested references
+#    and the shot data of their fileInfo, the checks that need the scene
+#    data are listed as `unchecked` in their result.
+#    Files are checked in parallel and a json pass/fail report is written.
+#
+#    usage: python HZShotValidator.py P:/show/EP012/SHOTS -j 8
+#           python HZShotValidator.py --journal P:/show/EP012/EP012_v003_EXPORT.json
+#
+
+import argparse, json, os, sys, time
+
+try:
+    from . import HZMayaAscii as MA, HZMayaBinary as MB, HZExportJournal as JR
+except (ImportError, ValueError):
+    import HZMayaAscii as MA, HZMayaBinary as MB, HZExportJournal as JR
+
+# at most this many errors of one kind are listed per file
+MAX_LISTED = 5
+
+
+def reportPath(journalPath):
+    return os.path.splitext(journalPath)[0] + '_VALIDATION.json'
+
+
+def _keyTimes(statement):
+    words = MA.splitStatement(statement)
+    for idx, word in enumerate(words):
+        if word.startswith('.ktv'):
+            return [float(t) for t in words[idx + 1::2]]
+    return []
+
+
+def _deferredWords(words):
+    # `-dr 1` of a reference record
+    return '-dr' in words[:-1] and words[words.index('-dr') + 1] == '1'
+
+
+def validateBinaryShotFile(path, result, keys=True, deferred=True):
+    '''
+    Checks of a .mb shot file that can be done without Maya, the others are
+    listed in result['unchecked'].
+    '''
+    errors = result['errors']
+    try:
+        complete = MB.isComplete(path)
+        shots = MB.readShotsInfo(path)
+        _, _, chunks = MB.readChunks(path)
+    except Exception as e:
+        errors.append('not a readable mayaBinary file: %s' % e)
+        return result
+    if not complete:
+        errors.append('file is truncated')
+    result['unchecked'] = ['playback range'] + (['keys outside the range'] if keys else [])
+    if shots is None:
+        result['unchecked'].insert(0, 'shot data')
+    elif not shots:
+        errors.append('no shot data')
+    else:
+        result['range'] = [shots[0]['start'], shots[0]['stop']]
+        if len(shots) > 1:
+            errors.append('%d shots in the shot data' % len(shots))
+    for chunk in MB.referenceChunks(chunks):
+        words = chunk.words()
+        if deferred and '-rdi' in words and _deferredWords(words):
+            errors.append('deferred nested reference %s' % (words[words.index('-rfn') + 1] if '-rfn' in words[:-1] else words[-1]))
+    return result
+
+
+def validateShotFile(path, keys=True, deferred=True):
+    '''
+    Check one shot file, returns a dict with its status ('pass', 'fail' or
+    'skipped') and the errors found. `keys` and `deferred` switch the checks
+    of the clean and rewrite steps.
+    '''
+    started = time.time()
+    result = {'file': path, 'status': 'pass', 'errors': [], 'range': None, 'keys': 0}
+    errors = result['errors']
+    if not path.lower().endswith(('.ma', '.mb')):
+        result['status'] = 'skipped'
+        errors.append('only mayaAscii and mayaBinary files can be checked')
+        return result
+    if not os.path.isfile(path):
+        result['status'] = 'fail'
+        errors.append('file is missing')
+        return result
+    if path.lower().endswith('.mb'):
+        validateBinaryShotFile(path, result, keys, deferred)
+        result['status'] = 'fail' if errors else 'pass'
+        result['seconds'] = round(time.time() - started, 3)
+        return result
+    shots = MA.readShotsInfo(path)
+    if not shots:
+        errors.append('no shot data')
+        start = stop = None
+    else:
+        start, stop = shots[0]['start'], shots[0]['stop']
+        result['range'] = [start, stop]
+        if len(shots) > 1:
+            errors.append('%d shots in the shot data' % len(shots))
+        playback = MA.readPlaybackRange(path)
+        if playback is None:
+            errors.append('no playbackOptions')
+        elif playback != (float(start), float(stop)):
+            errors.append('playback range %g-%g is not the shot range %d-%d' % (playback + (start, stop)))
+    outside = []
+    curve = None
+    last = ''
+    for _, st in MA.iterStatements(path):
+        last = st
+        if st.startswith('//'):
+            continue
+        if st.startswith('file -rdi') and deferred and ' -dr 1' in st:
+            flags = MA.parseFileCommand(st) or {}
+            errors.append('deferred nested reference %s' % flags.get('-rfn', flags.get('path')))
+        elif st.startswith('createNode'):
+            words = MA.splitStatement(st)
+            curve = None
+            if len(words) > 1 and words[1] in MA.ANIMCURVE_TYPES and '-n' in words:
+                curve = words[words.index('-n') + 1]
+        elif curve is not None and '.ktv' in st and st.lstrip().startswith('setAttr'):
+            times = _keyTimes(st)
+            result['keys'] += len(times)
+            # the clean step cuts keys at start-1 and stop+1 or further
+            if keys and start is not None and times and (times[0] <= start - 1 or times[-1] >= stop + 1):
+                outside.append('%s (%g-%g)' % (curve, times[0], times[-1]))
+    if outside:
+        errors.append('%d curve(s) with keys outside %d-%d: %s%s' % (
+            len(outside), start, stop, ', '.join(outside[:MAX_LISTED]), ', ...' if len(outside) > MAX_LISTED else ''))
+    if not last.startswith('// End of'):
+        errors.append('file is truncated, no end line')
+    result['status'] = 'fail' if errors else 'pass'
+    result['seconds'] = round(time.time() - started, 3)
+    return result
+
+
+def _validate(args):
+    return validateShotFile(*args)
+
+
+def validateFiles(files, keys=True, deferred=True, workers=1):
+    '''
+    Check shot files in parallel, returns the report dict.
+    '''
+    started = time.time()
+    jobs = [(fl, keys, deferred) for fl in files]
+    if workers > 1 and len(jobs) > 1:
+        from multiprocessing import Pool
+        pool = Pool(min(workers, len(jobs)))
+        try:
+            results = pool.map(_validate, jobs, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = [_validate(job) for job in jobs]
+    counts = dict((status, len([r for r in results if r['status'] == status])) for status in ('pass', 'fail', 'skipped'))
+    return {'created': time.time(), 'seconds': round(time.time() - started, 3), 'counts': counts, 'files': results}
+
+
+def validateJournal(journal, workers=1):
+    # the clean and rewrite checks only apply when the export had those steps
+    settings = journal.settings
+    # shots never saved have no file to check, set keys only or clean only exports
+    files = [shot['file'] for idx, shot in enumerate(journal.shots) if journal.reached(idx, 'saved')]
+    return validateFiles(files, keys=bool(settings.get('clean')),
+                         deferred=bool(settings.get('clean') or settings.get('prune')), workers=workers)
+
+
+def writeReport(path, report):
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    MA.replaceFile(tmp, path)
+    return path
+
+
+def loadReport(path):
+    if not os.path.isfile(path):
+        return None
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except ValueError:
+        return None
+
+
+def shotFiles(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, fl) for fl in sorted(os.listdir(path))
+                         if fl.lower().endswith(('.ma', '.mb')) and not fl.endswith(('_SHOTMASTER.ma', '_BACKUP.ma')))
+        else:
+            files.append(path)
+    return files
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Check exported shot files without Maya.')
+    parser.add_argument('paths', nargs='*', help='shot files or SHOTS folders')
+    parser.add_argument('--journal', help='check the shot files of an export journal, with the checks of its steps')
+    parser.add_argument('-j', '--workers', type=int, default=4)
+    parser.add_argument('--report', help='json report file')
+    parser.add_argument('--no-keys', dest='keys', action='store_false', help='do not check keys outside the range')
+    parser.add_argument('--no-deferred', dest='deferred', action='store_false', help='do not check deferred nested references')
+    args = parser.parse_args(argv)
+
+    if args.journal:
+        journal = JR.HZExportJournal.load(args.journal)
+        if journal is None:
+            sys.stderr.write('%s is not an export journal\n' % args.journal)
+            return 2
+        report = validateJournal(journal, args.workers)
+        reportFile = args.report or reportPath(args.journal)
+    elif args.paths:
+        report = validateFiles(shotFiles(args.paths), args.keys, args.deferred, args.workers)
+        reportFile = args.report
+    else:
+        parser.print_help()
+        return 2
+    for result in report['files']:
+        if result['status'] != 'pass':
+            sys.stdout.write('%s %s: %s\n' % (result['status'].upper(), os.path.basename(result['file']),
+                                              '; '.join(result['errors'])))
+    counts = report['counts']
+    print('%d passed, %d failed, %d skipped in %.1fs' % (counts['pass'], counts['fail'], counts['skipped'], report['seconds']))
+    if reportFile:
+        writeReport(reportFile, report)
+    return 1 if counts['fail'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,94 @@
+# creation date : 19 October, 2026
+#
+# Description :
+#    Thin shot files, an alternative to full copies of the episode scene.
+#    The master is saved once with the shot keys (the SHOTMASTER scene), then
+#    every shot file is a small mayaAscii scene written directly as text:
+#    a reference to the shot master, a scene time warp that brings the shot
+#    to its exported range, its own playbackOptions and shot data. No Maya
+#    session is needed to write them, so 150 shots take a few seconds.
+#
+
+import io, json, os
+
+try:
+    from . import HZMayaAscii as MA
+except (ImportError, ValueError):
+    import HZMayaAscii as MA
+
+MASTER_NAMESPACE = 'MASTER'
+TIMEWARP_NODE = 'HZShotTimewarp'
+SHOTS_INFO_KEY = 'HZShotsInfoJson'
+
+
+def shotMasterPath(sceneFile):
+    scene_path, scene_name = os.path.split(sceneFile)
+    return os.path.join(scene_path, 'SHOTS', '%s_SHOTMASTER.ma' % os.path.splitext(scene_name)[0])
+
+
+def masterHeader(master):
+    '''
+    The `//Maya ASCII` line, `requires maya` and `currentUnit` statements of
+    the master: shot files are opened as a scene of the same Maya version
+    and need the same time unit for the warp to line up.
+    '''
+    lines = []
+    for _, st in MA.iterHeader(master):
+        st = st.strip()
+        if st.startswith('//Maya ASCII') or st.startswith('requires maya') or st.startswith('currentUnit'):
+            lines.append(st)
+    return lines
+
+
+def shotFileText(shotFile, master, sh, shift, header=None):
+    '''
+    mayaAscii text of one thin shot file. `sh` is the shot as stored in the
+    shot file (exported range), `shift` is what has been added to the master
+    frames to get it, so master frame = shot frame - shift.
+    '''
+    ref = MA.escape(master.replace('\\', '/'))
+    rfn = MASTER_NAMESPACE + 'RN'
+    start, stop = sh['start'], sh['stop']
+    data = MA.escape(json.dumps([sh], ensure_ascii=True))
+    header = header if header is not None else masterHeader(master)
+    # comment lines go first, like in a file saved by Maya
+    comments = [line for line in header if line.startswith('//')]
+    lines = [comments[0] if comments else '//Maya ASCII scene',
+             '//Name: %s' % os.path.basename(shotFile),
+             '//Codeset: UTF-8',
+             'file -rdi 1 -ns "%s" -rfn "%s" -typ "mayaAscii" "%s";' % (MASTER_NAMESPACE, rfn, ref),
+             'file -r -ns "%s" -rfn "%s" -typ "mayaAscii" "%s";' % (MASTER_NAMESPACE, rfn, ref)]
+    lines += [line for line in header if not line.startswith('//')]
+    lines += ['fileInfo "%s" "%s";' % (SHOTS_INFO_KEY, data),
+              'createNode reference -n "%s";' % rfn,
+              '\tsetAttr ".ed" -type "dataReferenceEdits" "%s";' % rfn]
+    if shift:
+        # a scene time warp evaluates all the animation, referenced one too, at master time.
+        # linear tangents (2) keep the mapping a straight line, inside and outside the range
+        lines += ['createNode animCurveTT -n "%s";' % TIMEWARP_NODE,
+                  '\tsetAttr ".tan" 2;',
+                  '\tsetAttr ".wgt" no;',
+                  '\tsetAttr -s 2 ".ktv[0:1]"  %s %s %s %s;' % (start, start - shift, stop, stop - shift),
+                  '\tsetAttr -s 2 ".kit[0:1]"  2 2;',
+                  '\tsetAttr -s 2 ".kot[0:1]"  2 2;',
+                  '\tsetAttr ".pre" 1;',
+                  '\tsetAttr ".pst" 1;']
+    lines += ['createNode script -n "sceneConfigurationScriptNode";',
+              '\tsetAttr ".b" -type "string" "playbackOptions -min %s -max %s -ast %s -aet %s ";' % (start, stop, start, stop),
+              '\tsetAttr ".st" 6;',
+              'select -ne :time1;',
+              '\tsetAttr ".o" %s;' % start]
+    if shift:
+        lines += ['\tsetAttr ".enableTimewarp" yes;',
+                  'connectAttr "%s.output" ":time1.timewarpIn_Raw";' % TIMEWARP_NODE]
+    lines += ['// End of %s' % os.path.basename(shotFile), '']
+    return '\n'.join(lines)
+
+
+def writeShotFile(shotFile, master, sh, shift, header=None):
+    text = shotFileText(shotFile, master, sh, shift, header)
+    tmp = shotFile + '.tmp'
+    with io.open(tmp, 'wb') as f:
+        f.write(text.encode('utf-8') if not isinstance(text, bytes) else text)
+    MA.replaceFile(tmp, shotFile)
+    return shotFile
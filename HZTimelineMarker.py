@@ -404,13 +404,15 @@ class HZTimelineMarker(QtWidgets.QWidget):
 
     @staticmethod
     def masterReload():
+        """
+        Kept for the shelf scripts that still call it, the shot manager
+        imports this module lazily and does not need it anymore. Forgets the
+        module so the next import reads it again.
+        """
         import sys
-        #packages = ['package.to.reload','another.package.to.reload']
-        for i in sys.modules.keys()[:]:
-            #print(i)
-            #for pkg in packages:
-            if i.startswith('HZTimelineMarker'):
-                del(sys.modules[i])
+        for name in list(sys.modules):
+            if name == 'HZTimelineMarker' or name.endswith('.HZTimelineMarker'):
+                del sys.modules[name]
 
 
 # global HZTimelineMarkerGlobal
@@ -0,0 +1,71 @@
+import io, os, shutil, sys, tempfile, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import HZExportJournal as JR
+
+SHOTS = [{'name': 'SH0T_010'}, {'name': 'SH0T_020'}, {'name': 'SH0T_030'}]
+
+
+class TestExportJournal(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.files = [os.path.join(self.dir, 'EP012_SH%03d_ANI_v001.ma' % (10 * (i + 1))) for i in range(3)]
+        self.hashed = []
+        self._fileHash = JR.fileHash
+        JR.fileHash = lambda path: self.hashed.append(path) or self._fileHash(path)
+
+    def tearDown(self):
+        JR.fileHash = self._fileHash
+        shutil.rmtree(self.dir)
+
+    def write(self, path, data, mtime=1000):
+        with io.open(path, 'wb') as f:
+            f.write(data)
+        os.utime(path, (mtime, mtime))
+
+    def create(self, **settings):
+        return JR.HZExportJournal.create(os.path.join(self.dir, 'EP012_v001_EXPORT.json'), 'master.ma', 'backup.ma',
+                                         settings, SHOTS, self.files)
+
+    def test_hashFinalOnly(self):
+        journal = self.create(make=True, clean=True)
+        self.assertEqual(journal.finalState(), 'rewritten')
+        for idx, path in enumerate(self.files):
+            self.write(path, b'shot %d' % idx)
+            journal.mark(idx, 'saved')
+        self.assertEqual(self.hashed, [])
+        self.assertEqual([shot['hash'] for shot in journal.shots], [None] * 3)
+        self.assertEqual(journal.shots[0]['stamp'], [1000, len(b'shot 0')])
+        journal.mark(0, 'rewritten')
+        journal.mark(1, 'rewritten', hash='from the worker')
+        self.assertEqual(self.hashed, [self.files[0]])
+        self.assertEqual(journal.shots[0]['hash'], self._fileHash(self.files[0]))
+        self.assertEqual(journal.shots[1]['hash'], 'from the worker')
+
+        loaded = JR.HZExportJournal.load(journal.path)
+        self.assertEqual(loaded.verify(), 1)
+        # same size and mtime, finished shots are still checked by content
+        self.write(self.files[0], b'SHOT 0')
+        # unfinished shots are checked by mtime and size only
+        self.write(self.files[2], b'shot 2', mtime=2000)
+        loaded = JR.HZExportJournal.load(journal.path)
+        self.assertEqual(loaded.verify(), 0)
+        self.assertEqual([shot['state'] for shot in loaded.shots], ['pending', 'pending', 'pending'])
+
+    def test_existing(self):
+        self.write(self.files[0], b'shot 0')
+        self.write(self.files[2], b'shot 2')
+        journal = self.create(make=False, clean=True)
+        self.assertEqual([shot['state'] for shot in journal.shots], ['saved', 'pending', 'saved'])
+        self.assertEqual([shot.get('missing') for shot in journal.shots], [False, True, False])
+        self.assertEqual(self.hashed, [])
+        self.assertEqual(journal.verify(), 0)
+        journal.mark(0, 'rewritten')
+        self.assertEqual(journal.verify(), 2)
+        self.write(self.files[2], b'shot 2 edited', mtime=3000)
+        journal.mark(2, 'rewritten')
+        self.assertEqual(journal.verify(), None)
+
+
+if __name__ == '__main__':
+    unittest.main()
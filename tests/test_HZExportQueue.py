@@ -0,0 +1,138 @@
+import io, os, shutil, subprocess, sys, tempfile, time, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import HZExportQueue as EQ
+
+# claims jobs until the queue is empty, prints their ids
+CLAIM_LOOP = '''
+import os, sys, time
+sys.path.insert(0, %r)
+import HZExportQueue as EQ
+root, worker = sys.argv[1:3]
+while not os.path.exists(os.path.join(root, 'go')):
+    time.sleep(0.001)
+queue = EQ.HZExportQueue(root)
+while True:
+    job = queue.claim(worker)
+    if job is None:
+        break
+    sys.stdout.write(job['id'] + '\\n')
+'''
+
+
+class TestExportQueue(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def ids(self, queue, state):
+        return [job['id'] for job in queue.jobs(state)]
+
+    def test_claim(self):
+        queue = EQ.HZExportQueue(self.root)
+        first = queue.enqueue('SH010', [], batch='b1')
+        time.sleep(0.01)
+        second = queue.enqueue('SH020', [], batch='b1')
+        job = queue.claim('w1')
+        self.assertEqual(job['id'], first['id'])
+        self.assertEqual((job['attempts'], job['worker']), (1, 'w1'))
+        self.assertTrue(queue.owns(job, 'w1'))
+        self.assertFalse(queue.owns(job, 'w2'))
+        self.assertEqual(queue.claim('w2')['id'], second['id'])
+        self.assertIsNone(queue.claim('w3'))
+        self.assertTrue(queue.complete(job, 'w1', {'worker': 'w1'}))
+        self.assertFalse(os.path.exists(os.path.join(self.root, 'claimed', job['id'] + '.lease')))
+        self.assertEqual(queue.status('b1'), {'pending': 0, 'claimed': 1, 'done': 1, 'failed': 0})
+
+    def test_concurrent_claims(self):
+        queue = EQ.HZExportQueue(self.root)
+        jobIds = set(queue.enqueue('SH%03d' % idx, [])['id'] for idx in range(60))
+        code = CLAIM_LOOP % os.path.dirname(os.path.abspath(EQ.__file__))
+        workers = [subprocess.Popen([sys.executable, '-c', code, self.root, 'w%d' % idx], stdout=subprocess.PIPE)
+                   for idx in range(2)]
+        # both processes start claiming at the same time
+        open(os.path.join(self.root, 'go'), 'w').close()
+        claimed = [out.decode('ascii').split() for out, _ in (proc.communicate() for proc in workers)]
+        self.assertEqual([proc.returncode for proc in workers], [0, 0])
+        self.assertEqual(set(claimed[0]) & set(claimed[1]), set())
+        self.assertEqual(sorted(claimed[0] + claimed[1]), sorted(jobIds))
+        self.assertEqual(queue.status(), {'pending': 0, 'claimed': 60, 'done': 0, 'failed': 0})
+
+    def test_lease_expiry(self):
+        queue = EQ.HZExportQueue(self.root, lease=0.2, retryDelay=0)
+        queue.enqueue('SH010', [])
+        job = queue.claim('w1')
+        queue.reap()
+        self.assertEqual(self.ids(queue, 'claimed'), [job['id']])
+        self.assertTrue(queue.heartbeat(job, 'w1'))
+        time.sleep(0.3)
+        queue.reap()
+        self.assertEqual(self.ids(queue, 'pending'), [job['id']])
+        self.assertEqual(queue.jobs('pending')[0]['errors'][-1]['error'], 'lease of w1 expired')
+        # the lost worker can not report on the job anymore
+        self.assertFalse(queue.heartbeat(job, 'w1'))
+        self.assertFalse(queue.complete(job, 'w1'))
+        again = queue.claim('w2')
+        self.assertEqual((again['id'], again['attempts']), (job['id'], 2))
+
+    def test_claim_without_lease(self):
+        queue = EQ.HZExportQueue(self.root, lease=0.2, retryDelay=0)
+        queue.enqueue('SH010', [])
+        job = queue.claim('w1')
+        os.remove(os.path.join(self.root, 'claimed', job['id'] + '.lease'))
+        # a claim between its rename and its lease is given a whole lease
+        queue.reap()
+        self.assertEqual(self.ids(queue, 'claimed'), [job['id']])
+        time.sleep(0.3)
+        queue.reap()
+        self.assertEqual(self.ids(queue, 'pending'), [job['id']])
+
+    def test_retry(self):
+        queue = EQ.HZExportQueue(self.root, retryDelay=60)
+        queue.enqueue('SH010', [], maxAttempts=2)
+        job = queue.claim('w1')
+        self.assertTrue(queue.fail(job, 'w1', 'first'))
+        # the retry waits for its delay
+        self.assertIsNone(queue.claim('w1'))
+        pending = queue.jobs('pending')[0]
+        self.assertGreater(pending['notBefore'], time.time() + 50)
+        queue = EQ.HZExportQueue(self.root, retryDelay=0)
+        pending['notBefore'] = 0
+        queue._write(queue._path('pending', job['id']), pending)
+        job = queue.claim('w2')
+        self.assertEqual(job['attempts'], 2)
+        self.assertTrue(queue.fail(job, 'w2', 'second'))
+        self.assertEqual(self.ids(queue, 'failed'), [job['id']])
+        self.assertEqual([e['error'] for e in queue.jobs('failed')[0]['errors']], ['first', 'second'])
+        self.assertEqual(queue.retryFailed(), 1)
+        job = queue.claim('w3')
+        self.assertEqual(job['attempts'], 1)
+
+    def test_worker_resumes_steps(self):
+        queue = EQ.HZExportQueue(self.root)
+        shotFile = os.path.join(self.root, 'EP101_SH010_ANI_v001.ma')
+        with io.open(shotFile, 'w', newline='\n') as f:
+            f.write(u'//Maya ASCII 2020 scene\n'
+                    u'file -rdi 1 -ns "set" -rfn "setRN" -typ "mayaAscii" "P:/set.ma";\n'
+                    u'file -rdi 2 -ns "prop" -dr 1 -rfn "propRN" -typ "mayaAscii" "P:/prop.ma";\n'
+                    u'file -r -ns "set" -dr 1 -rfn "setRN" -typ "mayaAscii" "P:/set.ma";\n'
+                    u'requires maya "2020";\n')
+        steps = EQ.shotSteps('master.ma', shotFile, {'name': 'SH0T_010'}, 0)
+        queue.enqueue('SH010', steps, data={'idx': 0, 'file': shotFile})
+        job = queue.claim('w1')
+        # make has run on an earlier attempt, only the rewrite is left
+        job['completed'].append('make')
+        worker = EQ.HZQueueWorker(queue, 'w1', mayapy='missing-mayapy', poll=0)
+        self.assertTrue(worker.runJob(job))
+        done = queue.jobs('done')[0]
+        self.assertEqual(done['completed'], ['make', 'rewrite'])
+        self.assertEqual([step['name'] for step in done['result']['steps']], ['rewrite'])
+        self.assertTrue(done['result']['hash'])
+        with io.open(shotFile) as f:
+            self.assertNotIn('-dr 1 -rfn "propRN"', f.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import os, sys, time, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import HZJobRunner as JOB
+import HZProgress as PG
+
+
+def script(code):
+    return [sys.executable, '-c', code]
+
+
+def sleeper(seconds, text='ok'):
+    return script('import time, sys; time.sleep(%r); sys.stdout.write(%r)' % (seconds, text))
+
+
+class TestJobRunner(unittest.TestCase):
+    def test_run(self):
+        runner = JOB.HZJobRunner(2)
+        finished = []
+        event = 'import json, sys; sys.stdout.write("\\n%s" + json.dumps({"stage": "half", "progress": 0.5}) + "\\nhello\\n")' % JOB.PROGRESS_PREFIX
+        ok = runner.submit('ok', script(event), onDone=finished.append)
+        bad = runner.submit('bad', script('import sys; sys.stdout.write("broken"); sys.exit(3)'), onDone=finished.append)
+        post = runner.submit('post', sleeper(0), postprocess=lambda job: job.output.append('post'))
+        runner.wait(0.01)
+        self.assertEqual((ok.state, ok.output, ok.progress), ('done', ['hello'], 1.0))
+        self.assertEqual((bad.state, bad.returncode, bad.error), ('failed', 3, 'broken'))
+        self.assertEqual(post.output, ['ok', 'post'])
+        self.assertEqual(sorted(job.label for job in finished), ['bad', 'ok'])
+        self.assertTrue(runner.done)
+        self.assertEqual(runner.progress(), 1.0)
+
+    def test_stream_in_order(self):
+        runner = JOB.HZJobRunner(3).stream()
+        for idx, seconds in enumerate((0.4, 0.0, 0.2)):
+            runner.submit('job%d' % idx, sleeper(seconds))
+        self.assertFalse(runner.done)
+        runner.close()
+        reported = []
+        while not runner.done:
+            runner.poll()
+            reported.extend(job.label for job in runner.inOrder())
+            time.sleep(0.01)
+        runner.poll()
+        reported.extend(job.label for job in runner.inOrder())
+        # the slow first job holds back the others
+        self.assertEqual(reported, ['job0', 'job1', 'job2'])
+        self.assertLess(runner.jobs[1].finished, runner.jobs[0].finished)
+
+    def test_max_pending(self):
+        checks = []
+        runner = JOB.HZJobRunner(1, maxPending=1, check=lambda: checks.append(runner._pending.qsize())).stream()
+        started = time.time()
+        for idx in range(3):
+            runner.submit('job%d' % idx, sleeper(0.3), interval=0.01)
+        # the third job waits for the first one to end
+        self.assertGreater(time.time() - started, 0.2)
+        self.assertTrue(checks)
+        self.assertTrue(all(count >= 1 for count in checks))
+        runner.close()
+        runner.wait(0.01)
+        self.assertEqual([job.state for job in runner.jobs], ['done'] * 3)
+
+    def test_check_stops_wait(self):
+        def check():
+            raise RuntimeError('cancelled')
+        runner = JOB.HZJobRunner(1, maxPending=1, check=check).stream()
+        first = runner.submit('job0', sleeper(0.5))
+        while first.process is None:
+            time.sleep(0.01)
+        runner.submit('job1', sleeper(0.5))
+        self.assertRaises(RuntimeError, runner.submit, 'job2', sleeper(0.5))
+        self.assertEqual(len(runner.jobs), 2)
+        runner.cancel()
+        runner.wait(0.01)
+        self.assertIn('cancelled', [job.state for job in runner.jobs])
+
+    def test_wait_progress(self):
+        progress = PG.HZProgress('Jobs', headless=True)
+        seen = []
+        check = progress.check
+        def cancelWhenStarted():
+            seen.append(progress.done)
+            if runner.jobs[0].process is not None:
+                progress.token.cancel()
+            check()
+        progress.check = cancelWhenStarted
+        runner = JOB.HZJobRunner(1)
+        slow = runner.submit('slow', sleeper(5))
+        started = time.time()
+        with progress:
+            runner.wait(0.01, progress=progress)
+        # the cancel stops the jobs and the wait returns once they are finished
+        self.assertTrue(progress.cancelled)
+        self.assertLess(time.time() - started, 4)
+        self.assertEqual(slow.state, 'cancelled')
+        self.assertTrue(runner.done)
+        self.assertTrue(seen)
+        done = PG.HZProgress('Jobs', headless=True)
+        runner = JOB.HZJobRunner(1)
+        runner.submit('quick', sleeper(0))
+        with done:
+            runner.wait(0.01, progress=done)
+        self.assertEqual(done.done, 1.0)
+
+    def test_cancel(self):
+        runner = JOB.HZJobRunner(1).stream()
+        running = runner.submit('running', sleeper(5))
+        queued = runner.submit('queued', sleeper(0))
+        while running.process is None:
+            time.sleep(0.01)
+        runner.cancel()
+        runner.wait(0.01)
+        self.assertEqual((running.state, queued.state), ('cancelled', 'cancelled'))
+        self.assertIsNone(queued.process)
+        self.assertEqual(runner.submit('late', sleeper(0)).finished is not None, True)
+
+    def test_no_start_after_cancel(self):
+        # a worker that took a job before the cancel does not start it
+        runner = JOB.HZJobRunner(1)
+        job = JOB.HZJob(0, 'taken', sleeper(0))
+        runner.jobs.append(job)
+        runner.cancel()
+        runner._run(job)
+        runner.poll()
+        self.assertEqual(job.state, 'cancelled')
+        self.assertIsNone(job.process)
+
+
+if __name__ == '__main__':
+    unittest.main()
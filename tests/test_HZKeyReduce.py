@@ -0,0 +1,71 @@
+import os, sys, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import HZKeyReduce as KR
+
+
+def linear(count):
+    return ['linear'] * count
+
+
+class RedundantKeysTests(object):
+    '''
+    Run with the module's numpy, set by the test cases below.
+    '''
+    numpy = None
+
+    def setUp(self):
+        self._numpy = KR.numpy
+        KR.numpy = self.numpy
+
+    def tearDown(self):
+        KR.numpy = self._numpy
+
+    def test_short(self):
+        self.assertEqual(KR.redundantKeys([0, 1], [0.0, 5.0], linear(2), linear(2)), [])
+
+    def test_constant(self):
+        times = [0, 10, 20, 30]
+        self.assertEqual(KR.redundantKeys(times, [2.0] * 4, linear(4), linear(4)), [1, 2])
+        # smooth tangents can overshoot between keys of one value
+        self.assertEqual(KR.redundantKeys(times, [2.0] * 4, ['auto'] * 4, ['auto'] * 4), [])
+        self.assertEqual(KR.redundantKeys(times, [2.0] * 4, ['step'] * 4, ['step'] * 4), [1, 2])
+
+    def test_collinear(self):
+        times = [0, 5, 10, 20]
+        values = [0.0, 1.0, 2.0, 4.0]
+        self.assertEqual(KR.redundantKeys(times, values, linear(4), linear(4)), [1, 2])
+        # a flat tangent bends the curve at the key
+        self.assertEqual(KR.redundantKeys(times, values, linear(4), ['flat', 'linear', 'linear', 'linear']), [2])
+        self.assertEqual(KR.redundantKeys(times, [0.0, 1.0, 3.0, 4.0], linear(4), linear(4)), [])
+
+    def test_driftingRun(self):
+        # every key is on the line of its neighbours within the tolerance, the
+        # run as a whole is not, so every other key is kept
+        times = list(range(12))
+        values = [0.6 * KR.TOLERANCE * t * t for t in times]
+        self.assertEqual(KR.redundantKeys(times, values, linear(12), linear(12)), [1, 3, 5, 7, 9])
+        straight = [0.5 * t for t in times]
+        self.assertEqual(KR.redundantKeys(times, straight, linear(12), linear(12)), list(range(1, 11)))
+
+    def test_shotBoundaries(self):
+        times = [0, 10, 20, 30, 40]
+        values = [0.0, 1.0, 2.0, 3.0, 4.0]
+        # the boundary of a moving shot stays
+        self.assertEqual(KR.redundantKeys(times, values, linear(5), linear(5), shots=[(10, 30)]), [2])
+        # a shot holding one value keeps one of its keys
+        held = [1.0, 1.0, 1.0, 1.0, 1.0]
+        self.assertEqual(KR.redundantKeys(times, held, linear(5), linear(5), shots=[(10, 30)]), [2, 3])
+
+
+class TestRedundantKeysPython(RedundantKeysTests, unittest.TestCase):
+    numpy = None
+
+
+@unittest.skipIf(KR.numpy is None, 'numpy is not installed')
+class TestRedundantKeysNumpy(RedundantKeysTests, unittest.TestCase):
+    numpy = KR.numpy
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,188 @@
+import io, json, os, shutil, struct, sys, tempfile, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import HZMayaBinary as MB
+
+NESTED = ['-rdi', '2', '-ns', 'prop', '-dr', '1', '-rfn', 'propRN', '-typ', 'mayaAscii', 'P:/assets/prop.ma']
+TOP = ['-rdi', '1', '-ns', 'set', '-rfn', 'setRN', '-typ', 'mayaAscii', 'P:/assets/set.ma']
+LOAD = ['-r', '-ns', 'set', '-rfn', 'setRN', '-typ', 'mayaAscii', 'P:/assets/set.ma']
+
+
+def words(values):
+    return b''.join(w.encode('latin-1') + b'\0' for w in values)
+
+
+class HZMbWriter(object):
+    '''
+    Synthetic mayaBinary files, chunks are (tag, data) and groups
+    (tag, formType, [children]).
+    '''
+    def __init__(self, root):
+        self.root = root
+        self.fmt = MB.FORMATS[root]
+
+    def chunk(self, item):
+        fmt = self.fmt
+        if len(item) == 3:
+            tag, formType, children = item
+            content = formType + b'\0' * fmt.tagPad + b''.join(self.chunk(child) for child in children)
+        else:
+            tag, content = item
+        return fmt.header(tag, len(content)) + content + b'\0' * (fmt.padded(len(content)) - len(content))
+
+    def write(self, path, children):
+        data = self.chunk((self.root, b'Maya', children))
+        with io.open(path, 'wb') as f:
+            f.write(data)
+        return data
+
+
+def scene(root):
+    group = b'FOR' + root[-1:]
+    return [(b'VERS', b'2020\0'),
+            (group, b'HEAD', [(b'FRDI', words(TOP)),
+                              (group, b'REFS', [(b'FRDI', words(NESTED))])]),
+            (b'FREF', words(LOAD)),
+            (b'DATA', b'\x01\x02\x03')]
+
+
+class MayaBinaryCase(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def checkSizes(self, fmt, chunks, end):
+        # every group size is the sum of its chunks, every chunk ends aligned
+        offset = chunks[0].offset if chunks else end
+        for chunk in chunks:
+            self.assertEqual(chunk.offset, offset)
+            self.assertEqual(chunk.total % fmt.align, 0)
+            if chunk.children is not None:
+                self.assertEqual(chunk.size, 4 + fmt.tagPad + sum(child.total for child in chunk.children))
+                self.checkSizes(fmt, chunk.children, chunk.offset + chunk.total)
+            offset += chunk.total
+        self.assertEqual(offset, end)
+
+
+class TestMayaBinary(MayaBinaryCase):
+    def test_read_nested_references(self):
+        for root in (b'FOR4', b'FOR8'):
+            path = os.path.join(self.dir, 'scene.mb')
+            HZMbWriter(root).write(path, scene(root))
+            fmt, formType, chunks = MB.readChunks(path)
+            self.assertEqual(formType, b'Maya')
+            self.assertEqual([c.tag for c in chunks], [b'VERS', b'FOR' + root[-1:], b'FREF', b'DATA'])
+            self.assertEqual([c.words() for c in MB.referenceChunks(chunks)], [TOP, NESTED, LOAD])
+            graph = MB.readReferenceGraph(path)
+            self.assertEqual([r.refNode for r in graph], ['setRN', 'propRN'])
+            self.assertTrue(graph.get('propRN').deferred)
+            self.assertIs(graph.get('propRN').parent, graph.get('setRN'))
+
+    def test_rewrite_nested_deferred(self):
+        for root in (b'FOR4', b'FOR8'):
+            path = os.path.join(self.dir, 'scene.mb')
+            before = HZMbWriter(root).write(path, scene(root))
+            self.assertTrue(MB.fixDeferredReferences(path))
+            with io.open(path, 'rb') as f:
+                after = f.read()
+            fmt, _, chunks = MB.readChunks(path)
+            # the record is 4 bytes shorter, sizes of both groups and of the root follow
+            self.assertEqual(len(after), len(before) - fmt.padded(len(words(NESTED))) + fmt.padded(len(words(NESTED)) - 4))
+            self.assertEqual(struct.unpack(fmt.sizeFormat, after[4 + fmt.tagPad:fmt.headerSize])[0], len(after) - fmt.headerSize)
+            self.checkSizes(fmt, chunks, len(after))
+            self.assertFalse(MB.readReferenceGraph(path).get('propRN').deferred)
+            nested = MB.referenceChunks(chunks)[1]
+            self.assertEqual(nested.words(), ['-rdi', '2', '-ns', 'prop', '-rfn', 'propRN', '-typ', 'mayaAscii',
+                                              'P:/assets/prop.ma'])
+            # chunks around the change are copied as they are
+            self.assertEqual(after[fmt.headerSize:chunks[1].offset], before[fmt.headerSize:chunks[1].offset])
+            self.assertEqual(after[-chunks[3].total:], before[-chunks[3].total:])
+            # nothing left to fix
+            self.assertFalse(MB.fixDeferredReferences(path))
+
+    def test_padding(self):
+        for root in (b'FOR4', b'FOR8'):
+            path = os.path.join(self.dir, 'scene.mb')
+            HZMbWriter(root).write(path, scene(root))
+            longer = 'P:/assets/a_longer_path_to_pad.ma'
+            MB.rewriteReferences(path, lambda st: st.replace('P:/assets/set.ma', longer))
+            fmt, _, chunks = MB.readChunks(path)
+            size = os.path.getsize(path)
+            self.assertEqual(size % fmt.align, 0)
+            self.checkSizes(fmt, chunks, size)
+            refs = MB.referenceChunks(chunks)
+            self.assertEqual(refs[0].words()[-1], longer)
+            self.assertEqual(refs[2].words()[-1], longer)
+            with io.open(path, 'rb') as f:
+                f.seek(refs[0].offset + fmt.headerSize + refs[0].size)
+                self.assertEqual(f.read(fmt.padded(refs[0].size) - refs[0].size).strip(b'\0'), b'')
+
+    def test_not_mayabinary(self):
+        path = os.path.join(self.dir, 'scene.ma')
+        with io.open(path, 'wb') as f:
+            f.write(b'//Maya ASCII 2020 scene\n')
+        self.assertRaises(ValueError, MB.readChunks, path)
+
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def fixtures():
+    if not os.path.isdir(FIXTURES):
+        return []
+    return sorted(os.path.join(FIXTURES, fl) for fl in os.listdir(FIXTURES) if fl.lower().endswith('.mb'))
+
+
+@unittest.skipIf(not fixtures(), 'no Maya saved .mb in tests/fixtures')
+class TestMayaSavedBinary(MayaBinaryCase):
+    '''
+    The same reader on scenes saved by Maya, see tests/fixtures/README.txt.
+    An optional <scene>.json next to a scene lists its 'refNodes' and
+    'fileInfo' keys.
+    '''
+    def expected(self, path):
+        meta = os.path.splitext(path)[0] + '.json'
+        if not os.path.isfile(meta):
+            return {}
+        with io.open(meta) as f:
+            return json.load(f)
+
+    def test_read(self):
+        for path in fixtures():
+            fmt, formType, chunks = MB.readChunks(path)
+            self.assertEqual(formType, b'Maya')
+            self.assertTrue(MB.isComplete(path))
+            self.checkSizes(fmt, chunks, os.path.getsize(path))
+            graph = MB.readReferenceGraph(path)
+            info = MB.readFileInfo(path)
+            expected = self.expected(path)
+            if 'refNodes' in expected:
+                self.assertEqual([r.refNode for r in graph], expected['refNodes'])
+            for key in expected.get('fileInfo', ()):
+                self.assertIn(key, info)
+
+    def test_round_trip(self):
+        # a reference path changed and changed back gives the file Maya saved, byte for byte
+        for source in fixtures():
+            path = os.path.join(self.dir, os.path.basename(source))
+            shutil.copyfile(source, path)
+            with io.open(source, 'rb') as f:
+                before = f.read()
+            graph = MB.readReferenceGraph(path)
+            if not list(graph):
+                continue
+            original = list(graph)[0].path
+            moved = original + '_moved.ma'
+            self.assertTrue(MB.rewriteReferences(path, lambda st: st.replace(original, moved)))
+            fmt, _, chunks = MB.readChunks(path)
+            self.checkSizes(fmt, chunks, os.path.getsize(path))
+            self.assertEqual(list(MB.readReferenceGraph(path))[0].path, moved)
+            MB.rewriteReferences(path, lambda st: st.replace(moved, original))
+            with io.open(path, 'rb') as f:
+                self.assertEqual(f.read(), before)
+
+
+if __name__ == '__main__':
+    unittest.main()
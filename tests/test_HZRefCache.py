@@ -0,0 +1,117 @@
+import io, os, shutil, sys, tempfile, time, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import HZMayaAscii as MA
+import HZRefCache as RC
+
+
+class TestRefCache(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.share = os.path.join(self.dir, 'share')
+        os.mkdir(self.share)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def source(self, name, data):
+        path = os.path.join(self.share, name)
+        with io.open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_get(self):
+        cache = RC.HZRefCache(os.path.join(self.dir, 'cache'))
+        src = self.source('rig.ma', b'rig v1')
+        cached = cache.get(src)
+        self.assertNotEqual(cached, src)
+        self.assertTrue(cache.contains(cached))
+        self.assertEqual(os.path.basename(cached), 'rig.ma')
+        with io.open(cached, 'rb') as f:
+            self.assertEqual(f.read(), b'rig v1')
+        self.assertEqual(cache.source(cached), os.path.abspath(src))
+        self.assertEqual(cache.source(src), src)
+        copied = cache._readMeta(os.path.dirname(cached))['copied']
+        self.assertEqual(cache.get(src), cached)
+        self.assertEqual(cache._readMeta(os.path.dirname(cached))['copied'], copied)
+        # files that can not be cached are used from where they are
+        missing = os.path.join(self.share, 'missing.ma')
+        self.assertEqual(cache.get(missing), missing)
+
+    def test_stale(self):
+        cache = RC.HZRefCache(os.path.join(self.dir, 'cache'), verify=True)
+        src = self.source('rig.ma', b'rig v1')
+        cached = cache.get(src)
+        self.source('rig.ma', b'rig version 2')
+        stamp = time.time() + 10
+        os.utime(src, (stamp, stamp))
+        self.assertEqual(cache.get(src), cached)
+        with io.open(cached, 'rb') as f:
+            self.assertEqual(f.read(), b'rig version 2')
+        # a corrupted copy is caught by its sha1 when verify is on
+        with io.open(cached, 'wb') as f:
+            f.write(b'rig versiXX 2')
+        cache._verified.clear()
+        cache.get(src)
+        with io.open(cached, 'rb') as f:
+            self.assertEqual(f.read(), b'rig version 2')
+
+    def test_evict(self):
+        cache = RC.HZRefCache(os.path.join(self.dir, 'cache'), maxSize=25)
+        old = cache.get(self.source('old.ma', b'x' * 10))
+        used = cache.get(self.source('used.ma', b'x' * 10))
+        # the meta file time is the last use
+        past = time.time() - 100
+        os.utime(os.path.join(os.path.dirname(old), RC.META_NAME), (past - 50, past - 50))
+        os.utime(os.path.join(os.path.dirname(used), RC.META_NAME), (past, past))
+        new = cache.get(self.source('new.ma', b'x' * 10))
+        self.assertFalse(os.path.exists(old))
+        self.assertTrue(os.path.isfile(used))
+        self.assertTrue(os.path.isfile(new))
+        self.assertEqual(len(cache.entries()), 2)
+        # kept entries are never removed, even over the size
+        cache.maxSize = 0
+        self.assertEqual(cache.evict(keep=(os.path.dirname(new), )), 1)
+        self.assertTrue(os.path.isfile(new))
+        self.assertFalse(os.path.exists(used))
+        # files bigger than the cache are not cached
+        big = self.source('big.ma', b'x' * 10)
+        self.assertEqual(cache.get(big), big)
+
+    def test_set_reference_path(self):
+        st = 'file -rdi 1 -ns "rig" -rfn "rigRN" -typ "mayaAscii" "C:/cache/files/ab12/rig.ma";'
+        self.assertEqual(MA.setReferencePath(st, 'P:/assets/rig.ma'),
+                         'file -rdi 1 -ns "rig" -rfn "rigRN" -typ "mayaAscii" "P:/assets/rig.ma";')
+        st = 'file -r -ns "my rig" -dr 1 -rfn "rigRN" -typ "mayaAscii" "C:/cache/rig.ma" ;'
+        self.assertEqual(MA.setReferencePath(st, 'P:/a b/rig.ma'),
+                         'file -r -ns "my rig" -dr 1 -rfn "rigRN" -typ "mayaAscii" "P:/a b/rig.ma";')
+
+    def test_restore_header(self):
+        # cache paths and load states are put back in one rewrite
+        cache = RC.HZRefCache(os.path.join(self.dir, 'cache'))
+        src = self.source('rig.ma', b'rig')
+        scene = os.path.join(self.dir, 'shot.ma')
+        header = (u'//Maya ASCII 2020 scene\n'
+                  u'file -rdi 1 -ns "rig" -rfn "rigRN" -typ "mayaAscii" "%s";\n'
+                  u'file -r -ns "rig" -dr 1 -rfn "rigRN" -typ "mayaAscii" "%s";\n'
+                  u'requires maya "2020";\n'
+                  u'createNode transform -n "body";\n')
+        with io.open(scene, 'w', newline='\n') as f:
+            f.write(header % (src.replace('\\', '/'), src.replace('\\', '/')))
+        graph = MA.readReferenceGraph(scene)
+        cached = cache.get(src).replace('\\', '/')
+        with io.open(scene, 'w', newline='\n') as f:
+            f.write(header % (cached, cached))
+        fix = MA.chainFixes(cache.pathFix(graph), MA.loadStateFix({'rigRN': False}))
+        self.assertTrue(MA.rewriteHeader(scene, fix))
+        with io.open(scene, newline='') as f:
+            text = f.read()
+        self.assertNotIn(cached, text)
+        self.assertEqual(text.count(src.replace('\\', '/')), 2)
+        self.assertNotIn('-dr 1', text)
+        self.assertTrue(text.endswith('createNode transform -n "body";\n'))
+        self.assertIsNone(fix('createNode transform -n "body";'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import io, os, shutil, sys, tempfile, threading, time, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import HZShotArchive as AR
+
+
+def sceneData(seed, count=12000):
+    lines = [b'//Maya ASCII 2022 scene\n', b'requires maya "2022";\n']
+    for i in range(count):
+        lines.append(('setAttr ".node%d.tx" %d;\n' % (i, (i * 7919 + seed) % 10007)).encode('ascii'))
+    return b''.join(lines)
+
+
+class TestShotArchive(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.shots = os.path.join(self.dir, 'SHOTS')
+        os.mkdir(self.shots)
+        self.archive = AR.HZShotArchive(AR.archiveDir(self.shots))
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def shotFile(self, name, data):
+        path = os.path.join(self.shots, name)
+        with io.open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def read(self, path):
+        with io.open(path, 'rb') as f:
+            return f.read()
+
+    def test_roundTrip(self):
+        v1 = sceneData(0)
+        # one edited line, most chunks are shared with v001
+        v2 = v1.replace(b'setAttr ".node6000.tx"', b'setAttr ".node6000.ty"')
+        for name, data in (('EP012_SH010_ANI_v001.ma', v1), ('EP012_SH010_ANI_v002.ma', v2)):
+            path = self.shotFile(name, data)
+            manifest, added = self.archive.add(path)
+            self.assertEqual(manifest['size'], len(data))
+            self.assertTrue(self.archive.isArchived(path))
+        self.assertLess(added, len(v2) // 2)
+        out = os.path.join(self.dir, 'out')
+        os.mkdir(out)
+        for name, data in (('EP012_SH010_ANI_v001.ma', v1), ('EP012_SH010_ANI_v002.ma', v2)):
+            self.assertEqual(self.read(self.archive.restore(name, out)), data)
+        rep = self.archive.report()
+        self.assertEqual(rep['files'], 2)
+        self.assertEqual(rep['logical'], len(v1) + len(v2))
+        self.assertGreater(rep['dedup'], 1.5)
+        self.assertGreater(rep['compression'], 1.0)
+        self.assertAlmostEqual(rep['ratio'], rep['dedup'] * rep['compression'])
+
+    def test_longLines(self):
+        data = b'x' * (AR.CHUNK_MAX * 2 + 10)
+        chunks = list(AR.iterChunks(self.shotFile('EP012_SH010_ANI_v001.mb', data)))
+        self.assertEqual([len(chunk) for chunk in chunks], [AR.CHUNK_MAX, AR.CHUNK_MAX, 10])
+        self.archive.add(os.path.join(self.shots, 'EP012_SH010_ANI_v001.mb'))
+        out = self.archive.restore('EP012_SH010_ANI_v001.mb', os.path.join(self.dir, 'check.mb'))
+        self.assertEqual(self.read(out), data)
+
+    def test_prune(self):
+        for version in (1, 2, 3):
+            self.archive.add(self.shotFile('EP012_SH010_ANI_v%03d.ma' % version, sceneData(version * 3)))
+        removed, count, size = self.archive.prune(keep=2)
+        self.assertEqual(removed, ['EP012_SH010_ANI_v001.ma'])
+        self.assertGreater(count, 0)
+        self.assertEqual(self.archive.names(), ['EP012_SH010_ANI_v002.ma', 'EP012_SH010_ANI_v003.ma'])
+        out = self.archive.restore('EP012_SH010_ANI_v002.ma', os.path.join(self.dir, 'check.ma'))
+        self.assertEqual(self.read(out), sceneData(6))
+        self.assertEqual(self.archive.collect(), (0, 0))
+
+    def test_lock(self):
+        done = []
+        with self.archive.locked():
+            worker = threading.Thread(target=lambda: done.append(self.archive.collect()))
+            worker.start()
+            time.sleep(0.5)
+            # collect waits for the add or prune holding the store
+            self.assertEqual(done, [])
+        worker.join(5)
+        self.assertEqual(done, [(0, 0)])
+        self.assertFalse(os.path.exists(os.path.join(self.archive.root, 'lock')))
+
+    def test_removeKeepLatest(self):
+        for version in (1, 2):
+            self.shotFile('EP012_SH010_ANI_v%03d.ma' % version, sceneData(version))
+        self.shotFile('EP012_SH020_ANI_v001.ma', sceneData(5))
+        self.assertEqual(AR.main(['add', '--remove', '--keep-latest', self.shots]), 0)
+        self.assertEqual(sorted(fl for fl in os.listdir(self.shots) if fl.endswith('.ma')),
+                         ['EP012_SH010_ANI_v002.ma', 'EP012_SH020_ANI_v001.ma'])
+        self.assertEqual(len(self.archive.names()), 3)
+        self.assertEqual(self.read(self.archive.restore('EP012_SH010_ANI_v001.ma')), sceneData(1))
+
+
+if __name__ == '__main__':
+    unittest.main()
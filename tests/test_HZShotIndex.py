@@ -0,0 +1,92 @@
+import io, json, os, shutil, sys, tempfile, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import HZMayaAscii as MA
+import HZShotIndex as IX
+
+SHOTS = [{'name': 'SH0T_010', 'start': 101, 'stop': 180, 'color': [1, 0, 0]},
+         {'name': 'SH0T_020', 'start': 181, 'stop': 250, 'color': [0, 1, 0]}]
+MARKERS = {'150': {'colour': [0, 255, 0], 'comment': 'fix hand'}, '300': {'colour': [255, 0, 0], 'comment': 'end'}}
+
+
+def masterText(shots=SHOTS, markers=MARKERS, playback=(101, 250)):
+    lines = ['//Maya ASCII 2022 scene',
+             'requires maya "2022";',
+             'fileInfo "%s" "%s";' % (MA.SHOTS_LEGACY_KEY, MA.escape(json.dumps(shots))),
+             'fileInfo "%s" "%s";' % (IX.TIMELINE_MARKER, MA.escape(json.dumps(markers))),
+             'createNode transform -n "persp";',
+             'createNode script -n "sceneConfigurationScriptNode";',
+             '\tsetAttr ".b" -type "string" "playbackOptions -min %d -max %d -ast 1 -aet 300 ";' % playback,
+             '\tsetAttr ".st" 6;',
+             '// End of scene']
+    return '\n'.join(lines) + '\n'
+
+
+class TestShotIndex(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.show = os.path.join(self.dir, 'show')
+        os.makedirs(os.path.join(self.show, 'EP012', 'SHOTS'))
+        self.index = IX.HZShotIndex(os.path.join(self.dir, 'index.db'))
+
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.dir)
+
+    def write(self, relPath, text, mtime=None):
+        path = os.path.join(self.show, relPath)
+        with io.open(path, 'wb') as f:
+            f.write(text.encode('latin-1'))
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+        return path
+
+    def test_readScene(self):
+        path = self.write(os.path.join('EP012', 'EP012_layout_v003.ma'), masterText())
+        record = IX.readScene(path)
+        self.assertEqual((record['kind'], record['episode'], record['version']), ('master', 'EP012', 'v003'))
+        self.assertEqual(record['range'], (101.0, 250.0))
+        self.assertEqual([sh[1:4] for sh in record['shots']], [('SH0T_010', 101, 180), ('SH0T_020', 181, 250)])
+        self.assertEqual(os.path.basename(record['shots'][0][5]), os.path.normcase('EP012_SH010_ANI__v003.ma'))
+        self.assertEqual([mk[:2] for mk in record['markers']], [(150, 'fix hand'), (300, 'end')])
+        broken = self.write(os.path.join('EP012', 'EP012_broken_v001.ma'),
+                            'fileInfo "%s" "{not json";\n' % IX.TIMELINE_MARKER)
+        self.assertTrue(IX.readScene(broken)['error'])
+
+    def test_update(self):
+        self.write(os.path.join('EP012', 'EP012_layout_v002.ma'), masterText(shots=SHOTS[:1]), 1000)
+        self.write(os.path.join('EP012', 'EP012_layout_v003.ma'), masterText(), 2000)
+        self.write(os.path.join('EP012', 'SHOTS', 'EP012_SH010_ANI__v003.ma'), '//Maya ASCII 2022 scene\n', 3000)
+        self.write(os.path.join('EP012', 'SHOTS', 'EP012_SH020_ANI__v003.ma'), '//Maya ASCII 2022 scene\n', 1500)
+        # parsed in worker processes
+        self.assertEqual(self.index.update(self.show, workers=2), (4, 0, 0))
+        self.assertEqual(self.index.update(self.show), (0, 4, 0))
+
+        self.assertEqual([row[:5] for row in self.index.shotsAt(150)],
+                         [('EP012', 'v002', 'SH0T_010', 101, 180), ('EP012', 'v003', 'SH0T_010', 101, 180)])
+        self.assertEqual(self.index.framesPerEpisode(), [('EP012', 'v003', 2, 150)])
+        self.assertEqual(self.index.markers(), [('EP012', 'v003', 150, 'SH0T_010', 'fix hand'),
+                                                ('EP012', 'v003', 300, None, 'end')])
+        self.assertEqual(self.index.markers('EP013'), [])
+        stale = [(os.path.basename(master), name, state) for master, name, shotFile, state in self.index.staleShots()]
+        self.assertIn(('EP012_layout_v003.ma', 'SH0T_020', 'stale'), stale)
+        self.assertNotIn(('EP012_layout_v003.ma', 'SH0T_010', 'stale'), stale)
+
+        os.remove(os.path.join(self.show, 'EP012', 'EP012_layout_v002.ma'))
+        self.write(os.path.join('EP012', 'EP012_layout_v003.ma'), masterText(shots=SHOTS[1:]), 2500)
+        self.assertEqual(self.index.update(self.show), (1, 2, 1))
+        self.assertEqual(self.index.shotsAt(150), [])
+        self.assertEqual(self.index.markers()[0][3], None)
+
+    def test_insideMaya(self):
+        executable = sys.executable
+        try:
+            for name, inside in (('maya.exe', True), ('maya.bin', True), ('mayapy.exe', False), ('python', False)):
+                sys.executable = os.path.join('bin', name)
+                self.assertEqual(IX.insideMaya(), inside)
+        finally:
+            sys.executable = executable
+
+
+if __name__ == '__main__':
+    unittest.main()
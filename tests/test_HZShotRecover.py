@@ -0,0 +1,49 @@
+import os, sys, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import HZShotRecover as RV
+
+
+class TestShotRanges(unittest.TestCase):
+    def test_consecutive(self):
+        self.assertEqual(RV.shotRanges([1, 10, 11, 30, 31, 40]), [(1, 10), (11, 30), (31, 40)])
+
+    def test_gaps(self):
+        self.assertEqual(RV.shotRanges([1, 10, 15, 20]), [(1, 10), (15, 20)])
+        self.assertEqual(RV.shotRanges([1, 10, 11, 20, 40, 50]), [(1, 10), (11, 20), (40, 50)])
+
+    def test_single_frame(self):
+        # 11 is a shot of its own, the next one starts right after it
+        self.assertEqual(RV.shotRanges([1, 10, 11, 12, 20]), [(1, 10), (11, 11), (12, 20)])
+        self.assertEqual(RV.shotRanges([1, 10, 11, 20, 21]), [(1, 10), (11, 20), (21, 21)])
+        self.assertEqual(RV.shotRanges([5]), [(5, 5)])
+
+    def test_empty(self):
+        self.assertEqual(RV.shotRanges([]), [])
+
+
+class TestBoundaryTimes(unittest.TestCase):
+    def test_common_keys(self):
+        curveTimes = {'translateX': [1.0, 5.0, 10.0, 11.0, 20.0], 'FL': [1.0, 10.0, 11.0, 15.0, 20.0],
+                      'rotateY': []}
+        self.assertEqual(RV.boundaryTimes(curveTimes), [1, 10, 11, 20])
+
+    def test_marker(self):
+        curveTimes = {RV.MARKER_ATTR: [RV.SENTINEL_TIME, 1.0, 10.0, 11.0, 20.0], 'translateX': [1.0, 20.0]}
+        self.assertEqual(RV.boundaryTimes(curveTimes, RV.MARKER_ATTR), [1, 10, 11, 20])
+        # a marker curve without shots is only one more curve
+        curveTimes = {RV.MARKER_ATTR: [RV.SENTINEL_TIME, 1.0], 'translateX': [1.0, 20.0]}
+        self.assertEqual(RV.boundaryTimes(curveTimes, RV.MARKER_ATTR), [1])
+
+    def test_no_keys(self):
+        self.assertEqual(RV.boundaryTimes({}), [])
+        self.assertEqual(RV.boundaryTimes({'FL': []}), [])
+
+    def test_shots(self):
+        shots = RV.shotsFromRanges(RV.shotRanges(RV.boundaryTimes({'FL': [1, 10, 15, 20]})), 1)
+        self.assertEqual([(sh['name'], sh['start'], sh['stop']) for sh in shots],
+                         [('SH0T_010', 1, 10), ('SH0T_020', 15, 20)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import io, json, os, shutil, sys, tempfile, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import HZMayaBinary as MB
+import HZShotValidator as VA
+from test_HZMayaBinary import HZMbWriter, words
+
+SHOT = [{'name': 'SH0T_010', 'start': 101, 'stop': 124, 'color': [1, 0, 0]}]
+
+
+def maScene(keys='101 0 124 1', deferred=False, end=True):
+    return (u'//Maya ASCII 2020 scene\n'
+            u'file -rdi 1 -ns "set" -rfn "setRN" -typ "mayaAscii" "P:/set.ma";\n'
+            u'file -rdi 2 -ns "prop"%s -rfn "propRN" -typ "mayaAscii" "P:/prop.ma";\n'
+            u'file -r -ns "set" -dr 1 -rfn "setRN" -typ "mayaAscii" "P:/set.ma";\n'
+            u'requires maya "2020";\n'
+            u'fileInfo "HZShotsInfoJson" "%s";\n'
+            u'createNode animCurveTL -n "cam_translateX";\n'
+            u'\tsetAttr -s 2 ".ktv[0:1]"  %s;\n'
+            u'createNode script -n "sceneConfigurationScriptNode";\n'
+            u'\tsetAttr ".b" -type "string" "playbackOptions -min 101 -max 124 -ast 101 -aet 124 ";\n'
+            u'%s' % (' -dr 1' if deferred else '', json.dumps(SHOT).replace('"', '\\"'), keys,
+                     '// End of shot.ma\n' if end else ''))
+
+
+class TestValidator(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write(self, name, text):
+        path = os.path.join(self.dir, name)
+        with io.open(path, 'w', newline='\n') as f:
+            f.write(text)
+        return path
+
+    def test_ma(self):
+        result = VA.validateShotFile(self.write('ok.ma', maScene()))
+        self.assertEqual((result['status'], result['range'], result['keys']), ('pass', [101, 124], 2))
+        result = VA.validateShotFile(self.write('bad.ma', maScene('90 0 124 1', True, False)))
+        self.assertEqual(result['status'], 'fail')
+        self.assertEqual(len(result['errors']), 3)
+        # checks of steps the export did not have are off
+        self.assertEqual(VA.validateShotFile(self.write('raw.ma', maScene('90 0 124 1', True)), keys=False,
+                                             deferred=False)['status'], 'pass')
+
+    def test_mb(self):
+        path = os.path.join(self.dir, 'shot.mb')
+        info = [(b'FINF', words(['HZShotsInfoJson', json.dumps(SHOT)]))]
+        nested = ['-rdi', '2', '-ns', 'prop', '-dr', '1', '-rfn', 'propRN', 'P:/prop.ma']
+        data = HZMbWriter(b'FOR8').write(path, [(b'FOR8', b'HEAD', info + [(b'FRDI', words(nested))])])
+        self.assertEqual(MB.readShotsInfo(path), SHOT)
+        result = VA.validateShotFile(path)
+        self.assertEqual(result['status'], 'fail')
+        self.assertEqual(result['errors'], ['deferred nested reference propRN'])
+        self.assertEqual(result['range'], [101, 124])
+        self.assertIn('playback range', result['unchecked'])
+        MB.fixDeferredReferences(path)
+        self.assertEqual(VA.validateShotFile(path)['status'], 'pass')
+        # a save cut short
+        with io.open(path, 'wb') as f:
+            f.write(data[:-8])
+        self.assertIn('file is truncated', VA.validateShotFile(path)['errors'])
+
+    def test_mb_without_shot_data(self):
+        path = os.path.join(self.dir, 'shot.mb')
+        HZMbWriter(b'FOR4').write(path, [(b'VERS', b'2020\0')])
+        result = VA.validateShotFile(path)
+        self.assertEqual(result['status'], 'pass')
+        self.assertEqual(result['unchecked'][0], 'shot data')
+
+    def test_report(self):
+        files = [self.write('ok.ma', maScene()), self.write('notes.txt', u'x'), os.path.join(self.dir, 'missing.ma')]
+        report = VA.validateFiles(files)
+        self.assertEqual(report['counts'], {'pass': 1, 'fail': 1, 'skipped': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
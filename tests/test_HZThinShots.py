@@ -0,0 +1,113 @@
+import io, os, shutil, sys, tempfile, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import HZMayaAscii as MA
+import HZThinShots as TS
+
+SHOT = {'name': 'SH0T_010', 'color': [1, 0, 0], 'start': 101, 'stop': 180}
+MASTER = (u'//Maya ASCII 2022 scene\n'
+          u'//Name: EP001_v001_SHOTMASTER.ma\n'
+          u'//Codeset: 1252\n'
+          u'requires maya "2022";\n'
+          u'requires "mtoa" "4.2.1";\n'
+          u'currentUnit -l centimeter -a degree -t film;\n'
+          u'fileInfo "application" "maya";\n'
+          u'createNode transform -s -n "persp";\n')
+
+
+def statements(path):
+    return [st.strip() for _, st in MA.iterStatements(path)]
+
+
+def nodeStatements(path, name):
+    '''
+    Words of the statements of the node `name`, up to the next node.
+    '''
+    result = None
+    for st in statements(path):
+        words = MA.splitStatement(st)
+        if words[0] == 'createNode':
+            if result is not None:
+                break
+            if '-n' in words and words[words.index('-n') + 1] == name:
+                result = [words]
+        elif result is not None:
+            result.append(words)
+    return result
+
+
+def warpCurve(path):
+    '''
+    (keys, in tangents, out tangents, pre, post) of the time warp curve.
+    '''
+    attrs = {}
+    for words in nodeStatements(path, TS.TIMEWARP_NODE)[1:]:
+        if words[0] == 'setAttr':
+            words = [w for i, w in enumerate(words) if w != '-s' and (i == 0 or words[i - 1] != '-s')]
+            attrs[words[1].split('[')[0]] = words[2:]
+    values = lambda attr: [float(w) for w in attrs[attr]]
+    ktv = values('.ktv')
+    return (list(zip(ktv[0::2], ktv[1::2])), values('.kit'), values('.kot'),
+            int(attrs['.pre'][0]), int(attrs['.pst'][0]))
+
+
+def evaluate(keys, frame):
+    # linear keys with linear extrapolation
+    (t0, v0), (t1, v1) = keys
+    return v0 + (frame - t0) * (v1 - v0) / (t1 - t0)
+
+
+class TestThinShots(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.master = os.path.join(self.dir, 'EP001_v001_SHOTMASTER.ma')
+        with io.open(self.master, 'w', newline='\n') as f:
+            f.write(MASTER)
+        self.shotFile = os.path.join(self.dir, 'EP001_SH010_ANI_v001.ma')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_header(self):
+        TS.writeShotFile(self.shotFile, self.master, SHOT, -1399)
+        with io.open(self.shotFile, 'rb') as f:
+            self.assertTrue(f.readline().startswith(b'//Maya ASCII 2022 scene'))
+        self.assertEqual(MA.headerCodec(self.shotFile), 'utf-8')
+        header = [st for _, st in MA.iterHeader(self.shotFile)]
+        self.assertIn('requires maya "2022";', header)
+        self.assertIn('currentUnit -l centimeter -a degree -t film;', header)
+        # the plugins of the master come with the reference
+        self.assertFalse([st for st in header if st.startswith('requires "mtoa"')])
+        self.assertEqual(MA.readShotsInfo(self.shotFile), [SHOT])
+        self.assertEqual(MA.readPlaybackRange(self.shotFile), (101.0, 180.0))
+
+    def test_reference(self):
+        TS.writeShotFile(self.shotFile, self.master, SHOT, -1399)
+        graph = MA.readReferenceGraph(self.shotFile)
+        self.assertEqual(len(graph), 1)
+        ref = list(graph)[0]
+        self.assertEqual(ref.refNode, TS.MASTER_NAMESPACE + 'RN')
+        self.assertEqual(os.path.normcase(os.path.abspath(ref.path)), os.path.normcase(self.master))
+        self.assertTrue(nodeStatements(self.shotFile, ref.refNode))
+
+    def test_linear_mapping(self):
+        shift = -1399
+        TS.writeShotFile(self.shotFile, self.master, SHOT, shift)
+        keys, inTangents, outTangents, pre, post = warpCurve(self.shotFile)
+        # 2 is the linear tangent type, anything else eases the warp in and out
+        self.assertEqual(inTangents, [2, 2])
+        self.assertEqual(outTangents, [2, 2])
+        self.assertEqual((pre, post), (1, 1))
+        for n in (-5, 0, 1, 39, 40, 79, 85):
+            self.assertEqual(evaluate(keys, SHOT['start'] + n), SHOT['start'] - shift + n)
+        connections = [MA.splitStatement(st)[1:] for st in statements(self.shotFile) if st.startswith('connectAttr')]
+        self.assertIn(['%s.output' % TS.TIMEWARP_NODE, ':time1.timewarpIn_Raw'], connections)
+
+    def test_no_warp_without_shift(self):
+        TS.writeShotFile(self.shotFile, self.master, SHOT, 0)
+        self.assertIsNone(nodeStatements(self.shotFile, TS.TIMEWARP_NODE))
+        self.assertFalse([st for st in statements(self.shotFile) if 'timewarpIn_Raw' in st])
+
+
+if __name__ == '__main__':
+    unittest.main()